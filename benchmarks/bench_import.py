@@ -0,0 +1,57 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Usage, from the repository root:
+#   python -m benchmarks.bench_import --repeat 20
+# Times `import sim_to_excel.SIMtoExcel` in fresh interpreters, which is what every worker process
+# of `sim-to-excel convert --jobs N` pays, and fails if the import drags in the GUI or the workbook
+# writer or writes the window icon.
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import sim_to_excel.SIMtoExcel
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(sorted(name for name in ("tkinter", "xlsxwriter", "sim_to_excel.add_logo") if name in sys.modules)))
+"""
+
+
+def time_import():
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True)
+    elapsed, loaded = result.stdout.splitlines()
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import time of sim_to_excel.SIMtoExcel.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    timings = []
+    loaded = []
+    for _ in range(args.repeat):
+        elapsed, loaded = time_import()
+        timings.append(elapsed)
+
+    result = {"median_ms": statistics.median(timings) * 1000, "min_ms": min(timings) * 1000,
+              "max_ms": max(timings) * 1000, "eager_modules": loaded}
+    print(f"import sim_to_excel.SIMtoExcel: median {result['median_ms']:.1f} ms, "
+          f"min {result['min_ms']:.1f} ms, max {result['max_ms']:.1f} ms over {args.repeat} runs")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if loaded:
+        print(f"import is not side-effect free, it loaded: {', '.join(loaded)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
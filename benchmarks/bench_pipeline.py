@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import tempfile
+
+from benchmarks.bench_scaling import measure
+from benchmarks.sim_generator import SIMGenerator
+from sim_to_excel.SIMtoExcel import SIMFileReader
+
+# Usage, from the repository root:
+#   python -m benchmarks.bench_pipeline --systems 64 256
+#   python -m benchmarks.bench_pipeline --sim-file big.SIM
+# Times a whole conversion (best of --repeat) in each mode on the same file and measures the peak
+# Python heap of each on a separate pass under tracemalloc:
+#   sequential  read_file, parse_contents, then write_excel
+#   streaming   stream_to_excel: one thread, sheets written as each section completes
+#   pipeline    pipeline_to_excel: reading, parsing and writing on three threads
+
+
+def convert(sim_file_path, out_dir, mode):
+    reader = SIMFileReader(sim_file_path, out_dir=out_dir)
+    if mode == "sequential":
+        reader.read_file()
+        reader.parse_contents()
+        reader.write_excel()
+    elif mode == "streaming":
+        reader.stream_to_excel()
+    else:
+        reader.pipeline_to_excel()
+
+
+def bench_file(sim_file_path, repeat):
+    file_size = os.path.getsize(sim_file_path)
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for mode in ("sequential", "streaming", "pipeline"):
+            seconds, peak = measure(lambda: convert(sim_file_path, out_dir, mode), repeat)
+            results.append({"mode": mode, "seconds": seconds, "mb_per_s": file_size / 1e6 / seconds,
+                            "peak_mb": peak / 1e6})
+    return results
+
+
+def print_results(title, results):
+    print(title)
+    print(f"  {'mode':<12}{'seconds':>10}{'MB/s':>10}{'peak MB':>10}{'vs seq.':>10}")
+    sequential = results[0]["seconds"]
+    for result in results:
+        print(f"  {result['mode']:<12}{result['seconds']:>10.3f}{result['mb_per_s']:>10.2f}"
+              f"{result['peak_mb']:>10.1f}{sequential / result['seconds']:>9.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the sequential, streaming and pipelined conversions "
+                                                 "on the same SIM files.")
+    parser.add_argument("--sim-file", nargs="+", default=[], help="existing SIM files to convert")
+    parser.add_argument("--systems", type=int, nargs="+", default=[16, 64],
+                        help="sizes of synthetic files to generate when no --sim-file is given")
+    parser.add_argument("--zones", type=int, default=5, help="zones per system")
+    parser.add_argument("--doe-version", default="DOE-2.2", choices=["DOE-2.2", "DOE-2.3"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    all_results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sim_files = args.sim_file or [
+            SIMGenerator(systems, args.zones, doe_version=args.doe_version).write(
+                os.path.join(tmp_dir, f"bench-{args.doe_version}-{systems}.SIM"))
+            for systems in args.systems]
+        for sim_file_path in sim_files:
+            results = bench_file(sim_file_path, args.repeat)
+            size_mb = os.path.getsize(sim_file_path) / 1e6
+            print_results(f"{os.path.basename(sim_file_path)} ({size_mb:.1f} MB)", results)
+            all_results.append({"sim_file": sim_file_path, "size_mb": size_mb, "modes": results})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.sim_generator import SIMGenerator
+from sim_to_excel.SIMtoExcel import SIMFileReader
+
+# Usage, from the repository root:
+#   python -m benchmarks.bench_scaling --systems 4 16 64 --doe-version DOE-2.2 DOE-2.3
+# Each stage is timed on its own pass (best of --repeat) and measured for peak Python heap on a
+# separate pass under tracemalloc, so the memory tracing does not distort the timings.
+
+
+def measure(stage, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        stage()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def report_size(lines):
+    # report_contents holds plain lines for some reports and (entity, line) pairs for others
+    size = 0
+    for line in lines:
+        size += len(line[1] if isinstance(line, tuple) else line) + 2
+    return size
+
+
+def row(stage, seconds, peak, size, line_count):
+    return {
+        "stage": stage,
+        "seconds": seconds,
+        "mb_per_s": size / 1e6 / seconds if seconds else 0.0,
+        "lines_per_s": line_count / seconds if seconds else 0.0,
+        "peak_mb": peak / 1e6,
+        "size_mb": size / 1e6,
+        "lines": line_count,
+    }
+
+
+def bench_file(sim_file_path, repeat):
+    file_size = os.path.getsize(sim_file_path)
+    with open(sim_file_path, encoding="iso-8859-1") as f:
+        file_lines = sum(1 for _ in f)
+
+    def new_reader():
+        return SIMFileReader(sim_file_path, keep_contents=True)
+
+    results = []
+    seconds, peak = measure(lambda: new_reader().read_file(), repeat)
+    results.append(row("read_file", seconds, peak, file_size, file_lines))
+
+    reader = new_reader()
+    reader.read_file()
+    for report, method_name in reader.parsing_methods.items():
+        if report not in reader.report_contents:  # parse_contents skips reports the file does not contain
+            continue
+        lines = reader.report_contents[report]
+        attribute = reader.data_attribute(report)
+
+        def parse(method=getattr(reader, method_name), attribute=attribute):
+            setattr(reader, attribute, None)
+            method()
+
+        seconds, peak = measure(parse, repeat)
+        results.append(row(method_name, seconds, peak, report_size(lines), len(lines)))
+
+    seconds, peak = measure(reader.write_excel, repeat)
+    results.append(row("write_excel", seconds, peak, file_size, file_lines))
+    os.remove(reader.wb_name)
+    return results
+
+
+def print_results(title, results):
+    print(title)
+    print(f"  {'stage':<14}{'seconds':>10}{'MB/s':>10}{'lines/s':>12}{'peak MB':>10}")
+    for result in results:
+        print(f"  {result['stage']:<14}{result['seconds']:>10.4f}{result['mb_per_s']:>10.1f}"
+              f"{result['lines_per_s']:>12.0f}{result['peak_mb']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure SIMFileReader throughput and peak memory on "
+                                                 "synthetic SIM files of increasing size.")
+    parser.add_argument("--systems", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--zones", type=int, default=5, help="zones per system")
+    parser.add_argument("--spaces-per-zone", type=int, default=1)
+    parser.add_argument("--pages", type=int, default=1, help="pages the LV-D surface listing is spread over")
+    parser.add_argument("--doe-version", nargs="+", default=["DOE-2.2", "DOE-2.3"],
+                        choices=["DOE-2.2", "DOE-2.3"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    all_results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for doe_version in args.doe_version:
+            for systems in args.systems:
+                generator = SIMGenerator(systems, args.zones, systems * args.zones * args.spaces_per_zone,
+                                         doe_version, pages=args.pages)
+                sim_file_path = generator.write(os.path.join(tmp_dir, f"bench-{doe_version}-{systems}.SIM"))
+                results = bench_file(sim_file_path, args.repeat)
+                size_mb = os.path.getsize(sim_file_path) / 1e6
+                print_results(f"{doe_version}, {systems} systems ({size_mb:.1f} MB)", results)
+                all_results.append({"doe_version": doe_version, "systems": systems, "zones": args.zones,
+                                    "size_mb": size_mb, "stages": results})
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,524 @@
+import argparse
+import random
+
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+DAYS_IN_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+# (heading, second heading, units) of the variables an hourly report cycles through
+HOURLY_VARIABLES = [("GLOBAL", "DRY-BULB", "TEMP", "F"), ("GLOBAL", "WET-BULB", "TEMP", "F"),
+                    ("SYS-1", "COOLING", "LOAD", "KBTU"), ("SYS-1", "HEATING", "LOAD", "KBTU"),
+                    ("ZN-1-1", "ZONE", "TEMP", "F"), ("EM1", "SITE", "DEMAND", "KW")]
+DASHES = "-" * 131
+
+
+def place(spans, values, width=132):
+    # Right-align each value inside its fixed-width span
+    line = [" "] * width
+    for (start, end), value in zip(spans, values):
+        text = str(value)[:end - start].rjust(end - start)
+        line[start:end] = text
+    return "".join(line).rstrip()
+
+
+def left(text, width):
+    return str(text)[:width].ljust(width)
+
+
+class SIMGenerator:
+    # Deterministic eQUEST .SIM text laid out the way DOE-2.2 / DOE-2.3 print it. Entity reports get one
+    # page per space, system or zone; the LV-D surface listing is continued over `pages` pages, the way
+    # DOE-2 breaks long tables in large models. With hourly_variables, an HOURLY REPORT block of that many
+    # variables follows the SYSTEMS reports, one page per day of the year. With plant_meters, the PS-E, PS-F
+    # and PS-H pages (per meter type, meter and piece of plant equipment) follow PS-C.
+    def __init__(self, systems=4, zones_per_system=5, spaces=None, doe_version="DOE-2.2", seed=0,
+                 project="Synthetic Project", pages=1, hourly_variables=0, plant_meters=False):
+        self.systems = systems
+        self.zones_per_system = zones_per_system
+        self.spaces = spaces if spaces is not None else systems * zones_per_system
+        self.pages = max(1, pages)
+        self.hourly_variables = hourly_variables
+        self.plant_meters = plant_meters
+        self.doe_version = doe_version
+        self.project = project
+        self.rng = random.Random(seed)
+        self.page_no = 0
+
+    def num(self, lo, hi, digits=1):
+        return f"{self.rng.uniform(lo, hi):.{digits}f}"
+
+    def page(self, code, title, entity=None, prefix=""):
+        self.page_no += 1
+        header = left(f"1{self.project}", 81) + f"{self.doe_version}-48r   1/01/2026  12:00:00  BDL RUN  1"
+        report = f"{prefix}REPORT- {code} {title}".strip()
+        if entity is not None:
+            report += f" for  {entity}"
+        report = left(report, 84) + "  WEATHER FILE- SYNTHETIC TMY3"
+        return [header, "", report, DASHES, ""]
+
+    def system_names(self):
+        return [f"SYS-{s + 1} (PSZ)" for s in range(self.systems)]
+
+    def zone_names(self, system_index):
+        return [f"ZN-{system_index + 1}-{z + 1}" for z in range(self.zones_per_system)]
+
+    def space_names(self):
+        return [f"SPC-{s + 1}" for s in range(self.spaces)]
+
+    def lv_b(self):
+        lines = self.page("LV-B", "Summary of Spaces Occurring in the Project")
+        lines += [
+            "                                                SPACE*FLOOR",
+            "SPACE                                MULTIPLIER  TYPE   AZIM   LIGHTS  PEOPLE   EQUIP  INFILTRATION   ACH   AREA   VOLUME",
+            "",
+        ]
+        segments = [(0, 37), (37, 43), (43, 47), (47, 54), (54, 62), (62, 69), (69, 77), (77, 91), (91, 97),
+                    (97, 109), (109, 121)]
+        spaces = self.space_names()
+        for floor in range(max(1, len(spaces) // 10)):
+            lines.append(f"Spaces on floor: FLOOR-{floor + 1}")
+            for space in spaces[floor::max(1, len(spaces) // 10)]:
+                lines.append(place(segments, [space, "1.0", "INT", "0.0", self.num(0.5, 1.2, 2), self.num(1, 20),
+                                              self.num(0.5, 3, 2), "AIR-CHANGE", self.num(0, 1, 2),
+                                              self.num(200, 3000), self.num(2000, 30000)]))
+        lines.append("")
+        lines.append(place(segments, ["BUILDING TOTALS", "", "", "", "", self.num(100, 900), "", "", "",
+                                      self.num(10000, 90000), self.num(100000, 900000)]))
+        summary_segments = [(0, 32), (35, 48), (48, 52)]
+        lines.append(place(summary_segments, ["CONDITIONED FLOOR AREA", self.num(10000, 90000), "SQFT"]))
+        lines.append(place(summary_segments, ["TOTAL INSTALLED LIGHTING POWER", self.num(10, 90), "KW"]))
+        lines.append(place(summary_segments, ["TOTAL INSTALLED EQUIPMENT POWER", self.num(10, 90), "KW"]))
+        return lines
+
+    def lv_d(self):
+        lines = []
+        segments = [(0, 41), (41, 48), (48, 62), (62, 75), (75, 89), (89, 100), (100, 118), (118, 128)]
+        spaces = self.space_names()
+        per_page = -(-len(spaces) // self.pages)
+        for i, space in enumerate(spaces):
+            if i % per_page == 0:
+                lines += self.page("LV-D", "Details of Exterior Surfaces in the Project")
+                lines += [
+                    "                                                NUMBER OF EXTERIOR SURFACES",
+                    "                                                U-VALUE INCLUDES OUTSIDE FILM",
+                    "                                           - - - W I N D O W S - - -",
+                    "SURFACE                                U-VALUE       AREA",
+                    "                                      (BTU/HR-SQFT-F)     (SQFT)  (BTU/HR-SQFT-F)",
+                    "",
+                ]
+            for wall in ("NORTH", "SOUTH"):
+                lines.append(place(segments, [f"{space}-{wall}-WALL", self.num(0.3, 0.6, 3), self.num(10, 200),
+                                              self.num(0.05, 0.1, 3), self.num(100, 900), self.num(0.1, 0.2, 3),
+                                              self.num(100, 1000), wall]))
+                lines.append(f"                in space: {space}")
+        lines.append("")
+        lines.append("           AVERAGE             AVERAGE         AVERAGE U-VALUE         WINDOW         WALL           WINDOW+WALL")
+        lines.append("                        U-VALUE/WINDOWS      U-VALUE/WALLS")
+        lines.append("                        (BTU/HR-SQFT-F)     (BTU/HR-SQFT-F)")
+        summary_segments = [(0, 20), (20, 30), (30, 50), (50, 70), (70, 90), (90, 105), (105, 121)]
+        for orientation in ("NORTH", "SOUTH", "ALL WALLS"):
+            lines.append(place(summary_segments, [orientation, self.num(0.3, 0.6, 3), self.num(0.05, 0.1, 3),
+                                                  self.num(0.1, 0.2, 3), self.num(100, 900),
+                                                  self.num(1000, 9000), self.num(1000, 9000)]))
+        return lines
+
+    def ls_b(self):
+        lines = []
+        categories = ["WALL CONDUCTION", "ROOF CONDUCTION", "WINDOW GLASS+FRM COND", "WINDOW GLASS SOLAR",
+                      "DOOR CONDUCTION", "INTERNAL SURFACE COND", "UNDERGROUND SURF COND", "OCCUPANTS TO SPACE",
+                      "LIGHT TO SPACE", "EQUIPMENT TO SPACE", "PROCESS TO SPACE", "INFILTRATION"]
+        for space in self.space_names():
+            lines += self.page("LS-B", "Space Peak Load Components", space)
+            lines += [
+                "SPACE  " + space,
+                "                              MULTIPLIER   1.0     FLOOR  AREA   1000 SQFT",
+                "                                                   VOLUME        10000 CUFT",
+                "",
+                "                                      COOLING  LOAD                       HEATING  LOAD",
+                "                          ==========================              ==========================",
+                "   TIME                     JUL 21  3 PM                              JAN  1  6 AM",
+                "   DRY-BULB TEMP            95 F    35 C                              10 F   -12 C",
+                "   WET-BULB TEMP            75 F    24 C                               8 F   -13 C",
+                "",
+                "                           SENSIBLE                LATENT                 SENSIBLE",
+                "                           (KBTU/H)    ( KW )  (KBTU/H)  ( KW )           (KBTU/H)    ( KW )",
+                "                           ----------------- -----------------           -----------------",
+            ]
+            for category in categories:
+                row = [" "] * 132
+                row[5:28] = left(category, 23)
+                for (start, end), value in zip([(28, 36), (48, 56), (85, 93)],
+                                               [self.num(-5, 20, 3), self.num(0, 2, 3), self.num(-20, 0, 3)]):
+                    row[start:end] = value.rjust(end - start)
+                lines.append("".join(row).rstrip())
+            lines.append("                           ==========================")
+            row = [" "] * 132
+            row[5:28] = left("TOTAL LOAD", 23)
+            row[28:36] = self.num(10, 50, 3).rjust(8)
+            row[75:83] = self.num(-50, -10, 3).rjust(8)
+            lines.append("".join(row).rstrip())
+        return lines
+
+    def sv_a(self):
+        lines = []
+        sys_segments = [(0, 13), (13, 19), (19, 30), (30, 42), (42, 52), (52, 63), (63, 74),
+                        (74, 85), (85, 96), (96, 107), (107, 118)]
+        fan_segments = [(0, 9), (9, 20), (20, 31), (31, 40), (40, 50), (50, 61), (61, 69),
+                        (69, 77), (77, 89), (89, 99), (99, 109), (109, 118)]
+        zn_segments = [(0, 28), (28, 37), (37, 47), (47, 57), (57, 67), (67, 77), (77, 87),
+                       (87, 97), (97, 107), (107, 117), (117, 127), (127, 131)]
+        for s, system in enumerate(self.system_names()):
+            lines += self.page("SV-A", "System Design Parameters", system)
+            lines += [
+                "                                           FLOOR               OUTSIDE    COOLING",
+                "         SYSTEM   ALTITUDE       AREA       MAX      AIR     CAPACITY",
+                "         TYPE     FACTOR    (SQFT )    PEOPLE    RATIO     (KBTU/HR)",
+                place(sys_segments, ["PSZ", "1.000", self.num(1000, 9000), self.num(5, 90), self.num(0.1, 0.3, 3),
+                                     self.num(-200, -20), self.num(0.6, 0.9, 3), self.num(20, 200),
+                                     self.num(0.2, 0.4, 3), self.num(0.2, 0.4, 3), "0.000"]),
+                "",
+                "                          DIVERSITY    POWER       FAN",
+                "   FAN   CAPACITY     FACTOR",
+                "   TYPE    (CFM )     (FRAC)",
+                place(fan_segments, ["SUPPLY", self.num(1000, 9000), "1.000", self.num(1, 9, 3), "1.50",
+                                     "2.00", "0.53", "0.75", "DRAW-THRU", "CONST VOL", "1.10", "0.30"]),
+                place(fan_segments, ["RETURN", self.num(1000, 9000), "1.000", self.num(1, 9, 3), "0.50",
+                                     "1.00", "0.53", "0.75", "", "CONST VOL", "1.10", "0.30"]),
+                "",
+                "                           SUPPLY   EXHAUST             MINIMUM",
+                "ZONE                       FLOW      FLOW",
+                "NAME                     (CFM )    (CFM )",
+            ]
+            for zone in self.zone_names(s):
+                lines.append(place(zn_segments, [zone, self.num(100, 900), "0.", "0.000", self.num(0.3, 1, 3),
+                                                 self.num(10, 90), self.num(-30, -5, 2), self.num(0.6, 0.9, 3),
+                                                 self.num(-30, -5, 2), self.num(5, 30, 2), "0.00", "1"]))
+        return lines
+
+    def ss_monthly(self, code, title):
+        segments = [(0, 5), (5, 16), (16, 22), (22, 25), (25, 32), (32, 38), (38, 52), (52, 67), (67, 72),
+                    (72, 76), (76, 83), (83, 89), (89, 103), (103, 117), (117, 128)]
+        lines = []
+        for system in self.system_names():
+            lines += self.page(code, title, system)
+            lines += [
+                "                  - - - - - - - - C O O L I N G - - - - - - - -      - - - - - - - - H E A T I N G",
+                "                              MAXIMUM         ELEC-    MAXIMUM",
+                "             COOLING     TIME   DRY-  WET-",
+                "              ENERGY   OF MAX   BULB  BULB",
+                "      MONTH     (MBTU)   DY  HR   TEMP  TEMP",
+                "",
+            ]
+            for month in MONTHS:
+                lines.append(place(segments, [month, self.num(0, 50, 3), str(self.rng.randint(1, 28)),
+                                              str(self.rng.randint(1, 24)), self.num(60, 99, 0) + ".F",
+                                              self.num(50, 80, 0) + ".F", self.num(0, 200, 3),
+                                              self.num(-50, 0, 3), str(self.rng.randint(1, 28)),
+                                              str(self.rng.randint(1, 24)), self.num(0, 40, 0) + ".F",
+                                              self.num(0, 40, 0) + ".F", self.num(-200, 0, 3),
+                                              self.num(0, 9000, 0) + ".", self.num(0, 40, 3)]))
+            lines.append(place(segments, ["", "-------", "", "", "", "", "", "-------"]))
+            lines.append(place(segments, ["TOTAL", self.num(100, 500, 3), "", "", "", "", "",
+                                          self.num(-500, -100, 3), "", "", "", "", "",
+                                          self.num(10000, 90000, 0) + ".", ""]))
+            lines.append(place(segments, ["MAX", "", "", "", "", "", self.num(100, 300, 3), "", "", "", "", "",
+                                          self.num(-300, -100, 3), "", self.num(10, 60, 3)]))
+        return lines
+
+    def ss_f(self):
+        lines = []
+        for s, system in enumerate(self.system_names()):
+            for zone in self.zone_names(s):
+                lines += self.page("SS-F", "Zone Demand Summary", zone)
+                lines += [
+                    "                    HEAT          HEAT",
+                    "                EXTRACTION      ADDITION     BASEBOARD",
+                    "                  ENERGY        ENERGY",
+                    "    MONTH         (MBTU)        (MBTU)",
+                    "    - - - - - - - - - - - - - - - - - -",
+                    "",
+                ]
+                for month in MONTHS:
+                    lines.append(f"    {month}  {self.num(-20, 0, 3):>12}  {self.num(0, 20, 3):>12}  "
+                                 f"{'0.000':>10}  {'0.000':>10}  {self.num(70, 80, 1):>8}  "
+                                 f"{self.num(60, 70, 1):>8}  {self.rng.randint(0, 30):>6}  "
+                                 f"{self.rng.randint(0, 30):>6}")
+        return lines
+
+    def ss_h(self):
+        lines = []
+        for system in self.system_names():
+            lines += self.page("SS-H", "System Utility Energy Use", system)
+            lines += [
+                "                        - -F A N   E L E C- - -    - - - - - - - - - - - - - - - - - - - -",
+                "                       FAN         FAN",
+                "                      ENERGY        LOAD",
+                "                       (KWH)        (KW)",
+                "              MAXIMUM                   MAXIMUM",
+                "",
+            ]
+            for month in MONTHS:
+                values = [self.num(0, 5000, 0) + "."] + [self.num(0, 50, 3) for _ in range(9)]
+                lines.append(f"   {month}  " + "".join(f"{v:>12}" for v in values))
+            lines.append("   TOTAL  " + "".join(f"{self.num(1000, 50000, 0) + '.':>12}" for _ in range(5)))
+            lines.append("   MAX    " + "".join(f"{self.num(0, 50, 3):>12}" for _ in range(5)))
+        return lines
+
+    def ss_l(self):
+        lines = []
+        for system in self.system_names():
+            lines += self.page("SS-L", "Fan Electric Energy", system)
+            lines += [
+                "            FAN ELEC    FAN ELEC    FAN ELEC    FAN ELEC",
+                "            DURING      DURING      DURING      DURING   NUMBER OF HOURS WITHIN EACH PART LOAD RANGE",
+                "   MONTH    HEATING     COOLING    HEAT & COOL  FLOATING   00  10  20  30  40  50  60  70  80  90 100",
+                "",
+            ]
+            for month in MONTHS + ["ANNUAL"]:
+                values = [self.num(0, 900, 1) for _ in range(4)] + [str(self.rng.randint(0, 99)) for _ in range(12)]
+                lines.append(f"   {month:<6}" + "".join(f"{v:>9}" for v in values))
+            lines.append("")
+            lines.append("                BREAKDOWN OF ANNUAL FAN POWER USAGE (KWH)")
+            lines.append("              SUPPLY    HOT DECK      RETURN      RELIEF   PIU TERMS    ZONE EXH       TOTAL")
+            lines.append("          ----------  ----------  ----------  ----------  ----------  ----------  ----------")
+            lines.append("               (KWH)       (KWH)       (KWH)       (KWH)       (KWH)       (KWH)       (KWH)")
+            lines.append("          " + "  ".join(f"{self.num(0, 9000, 1):>10}" for _ in range(7)))
+        return lines
+
+    def ss_r(self):
+        segments = [(18, 26), (27, 35), (36, 44), (45, 53), (59, 63), (65, 69), (71, 75),
+                    (77, 81), (83, 87), (89, 93), (95, 99), (101, 105), (107, 111),
+                    (113, 117), (119, 123), (125, 129)]
+        lines = []
+        for s, system in enumerate(self.system_names()):
+            lines += self.page("SS-R", "Zone Performance Summary", system)
+            lines += [
+                "                   ZONE OF   ZONE OF  ZONE UNDER ZONE UNDER   - - - - - - - -",
+                "                   MAXIMUM   MAXIMUM    HEATED     COOLED",
+                "",
+            ]
+            for zone in self.zone_names(s):
+                lines.append(zone)
+                lines.append(place(segments, [str(self.rng.randint(0, 500)) for _ in range(16)]))
+        return lines
+
+    def pv_a(self):
+        lines = self.page("PV-A", "Plant Design Parameters")
+        loop_segments = [(0, 13), (13, 25), (25, 37), (37, 49), (49, 61), (61, 73), (73, 86),
+                         (86, 97), (97, 109), (109, 120)]
+        pump_segments = [(0, 40), (40, 48), (48, 60), (60, 72), (72, 84), (84, 96), (96, 108), (108, 119)]
+        if self.doe_version == "DOE-2.2":
+            prim_segments = [(0, 19), (19, 53), (53, 65), (65, 77), (77, 89), (89, 101), (101, 112)]
+        else:
+            prim_segments = [(0, 19), (19, 53), (53, 65), (65, 77), (77, 88)]
+
+        lines += [
+            "                                 *** CIRCULATION LOOPS ***",
+            "",
+            "                  HEATING     COOLING      LOOP",
+            "                  DEMAND      DEMAND       FLOW",
+            "                  (MBTU/HR)   (MBTU/HR)     (GPM)",
+            "",
+        ]
+        for loop in ("CHW LOOP", "HW LOOP", "CW LOOP"):
+            lines.append(loop)
+            lines.append(place(loop_segments, ["", self.num(0, 5, 3), self.num(-5, 0, 3), self.num(100, 900),
+                                               self.num(30, 90), "0.", "0.0", "0.", "0.0", self.num(100, 900)]))
+        lines += [
+            "",
+            "                                 *** PUMPS ***",
+            "",
+            "                                  FLOW        HEAD      SETPOINT",
+            "      ATTACHED TO                (GPM)       ( FT)",
+            "",
+        ]
+        for pump in ("CHW PUMP", "HW PUMP", "CW PUMP"):
+            lines.append(pump)
+            lines.append(place(pump_segments, ["CHW LOOP", self.num(100, 900), self.num(30, 90), "0.0",
+                                               "ONE-SPEED", self.num(1, 20, 3), "0.770", "0.900"]))
+        lines += [
+            "",
+            "                                 *** PRIMARY EQUIPMENT ***",
+            "",
+            "                                       CAPACITY      FLOW        HEAD",
+            "                                       (MBTU/HR)     (GPM)       ( FT)",
+            "",
+        ]
+        for loop, equipment in (("CHW LOOP", "CHILLER 1"), ("HW LOOP", "BOILER 1")):
+            lines.append(loop)
+            values = [equipment, "ELEC-HERM-REC", loop, self.num(-5, 5, 3), self.num(100, 900),
+                      self.num(10, 40), self.num(0.1, 0.9, 3)]
+            lines.append(place(prim_segments, values[:len(prim_segments)]))
+        return lines
+
+    def ps_c(self):
+        lines = self.page("PS-C", "Equipment Loads and Energy Use")
+        lines += [
+            "                    COOLING     HEATING     ELEC        FUEL",
+            "                    (MBTU)      (MBTU)      (KWH)       (MBTU)",
+            "                   (KBTU/HR)   (KBTU/HR)    (KW)       (KBTU/HR)",
+            "",
+        ]
+        for equipment in ("CHILLER 1", "BOILER 1", "TOWER 1"):
+            lines.append(equipment)
+            for entry in ("SUM", "PEAK", "MON/DAY"):
+                row = [" "] * 132
+                row[0:10] = left(entry, 10)
+                for (start, end) in ((11, 21), (23, 33), (35, 45), (47, 57)):
+                    row[start:end] = self.num(0, 900, 3).rjust(end - start)
+                row[58:62] = "KWH " if entry == "SUM" else "KW  "
+                for i in range(62, 132, 6):
+                    row[i:i + 6] = str(self.rng.randint(0, 999)).rjust(6)
+                lines.append("".join(row).rstrip())
+        return lines
+
+    def end_use_summary(self, code, entity, rows):
+        # PS-E / PS-F: per month, `rows` (label, digits) across the 13 end-use columns, then the year
+        spans = [(19 + 8 * i, 26 + 8 * i) for i in range(12)] + [(115, 124)]
+        lines = self.page(code, "Energy End-Use Summary", entity)
+        lines += [
+            "",
+            place(spans, ["", "TASK", "MISC", "SPACE", "SPACE", "HEAT", "PUMPS", "VENT", "REFRIG", "HT PUMP",
+                          "DOMEST", "EXT", ""]),
+            place(spans, ["LIGHTS", "LIGHTS", "EQUIP", "HEATING", "COOLING", "REJECT", "& AUX", "FANS", "DISPLAY",
+                          "SUPPLEM", "HOT WTR", "USAGE", "TOTAL"]),
+            place(spans, ["-" * (end - start) for start, end in spans]),
+            "",
+        ]
+        for month in MONTHS + ["YR"]:
+            for index, (label, digits) in enumerate(rows):
+                if label == "DAY/HR":
+                    values = [f"{self.rng.randint(1, 28)}/{self.rng.randint(1, 24):2d}" for _ in spans]
+                else:
+                    values = [self.num(0, 9000, digits) + ("." if not digits else "") for _ in spans]
+                lines.append(left(month if not index else "", 6) + left(label, 12) + place(spans, values)[18:])
+            lines.append("")
+        return lines
+
+    def ps_e(self):
+        rows = [("KWH", 0), ("MAX KW", 1), ("DAY/HR", 0), ("PEAK ENDUSE", 1), ("PEAK PCT", 1)]
+        return (self.end_use_summary("PS-E", "all Electric Meters", rows)
+                + self.end_use_summary("PS-E", "all Fuel Meters", [("MBTU", 1), ("MAX MBTU/HR", 2)]))
+
+    def ps_f(self):
+        return (self.end_use_summary("PS-F", "EM1", [("KWH", 0), ("MAX KW", 1), ("DAY/HR", 0)])
+                + self.end_use_summary("PS-F", "FM1", [("THERM", 0), ("MAX THERM/HR", 2), ("DAY/HR", 0)]))
+
+    def ps_h(self):
+        lines = []
+        spans = [(14, 24), (24, 34), (34, 44), (44, 54), (54, 64), (64, 74)]
+        for equipment in ("CHILLER 1", "BOILER 1"):
+            lines += self.page("PS-H", "Loads and Energy Usage", equipment)
+            lines += [
+                "",
+                place(spans, ["CAPACITY", "FLOW", "LOOP", "", "", ""]),
+                place(spans, ["(MBTU/HR)", "(GAL/MIN)", "", "", "", ""]),
+                place(spans, ["-" * 9, "-" * 9, "-" * 9]),
+                left("PROPERTIES", 14) + place(spans, [self.num(100, 900, 3), self.num(100, 900), "5."])[14:],
+                "",
+                place(spans, ["LOAD", "ELEC", "FUEL", "PEAK", "PEAK", "HOURS"]),
+                place(spans, ["", "USE", "USE", "LOAD", "DAY/HR", "LOADED"]),
+                place(spans, ["(MBTU)", "(KWH)", "(MBTU)", "(KBTU/HR)", "", ""]),
+                place(spans, ["-" * 9] * 6),
+            ]
+            for month in MONTHS + ["TOTAL"]:
+                values = [self.num(0, 900, 3), self.num(0, 9000, 0) + ".", self.num(0, 90, 3),
+                          self.num(0, 900, 3), f"{self.rng.randint(1, 28)}/{self.rng.randint(1, 24):2d}",
+                          str(self.rng.randint(0, 744))]
+                lines.append(left(month, 14) + place(spans, values)[14:])
+            lines.append("")
+        return lines
+
+    def bepu(self):
+        lines = self.page("BEPU", "Building Utility Performance")
+        spans = [(4, 12), (12, 21), (21, 30), (30, 39), (39, 48), (48, 57), (57, 66), (66, 75), (75, 84),
+                 (84, 93), (93, 102), (102, 111), (111, 120), (120, 130)]
+        lines += [
+            "                                   ENERGY TYPE: ALL",
+            "                      TASK     MISC    SPACE    SPACE     HEAT    PUMPS     VENT   REFRIG  HT PUMP  DOMEST",
+            "            LIGHTS   LIGHTS    EQUIP  HEATING  COOLING   REJECT    & AUX     FANS  DISPLAY  SUPPLEM  HOT WTR",
+            "",
+        ]
+        for meter, unit in (("EM1  ELECTRICITY", "KWH"), ("FM1  NATURAL-GAS", "THERM")):
+            lines.append(meter)
+            lines.append(place(spans, [unit] + [self.num(0, 90000, 0) + "." for _ in range(13)]))
+            lines.append("")
+        lines += [
+            "",
+            "               TOTAL ELECTRICITY        123456. KWH        12.345 KWH         /SQFT-YR GROSS-AREA",
+            "               TOTAL NATURAL-GAS          1234. THERM      0.123 THERM       /SQFT-YR GROSS-AREA",
+        ]
+        return lines
+
+    def hourly(self, name="Hourly Report 1"):
+        variables = [HOURLY_VARIABLES[i % len(HOURLY_VARIABLES)] for i in range(self.hourly_variables)]
+        spans = [(7 + 10 * i, 17 + 10 * i) for i in range(len(variables))]
+        heading = [
+            "",
+            place(spans, [variable[0] for variable in variables]),
+            place(spans, ["--------"] * len(variables)),
+            " MMDDHH" + place(spans, [variable[1] for variable in variables])[7:],
+            place(spans, [variable[2] for variable in variables]),
+            place(spans, [f"({variable[3]})" for variable in variables]),
+            place(spans, [f"({i + 4})" for i in range(len(variables))]),
+            "",
+        ]
+        lines = []
+        for month, days in enumerate(DAYS_IN_MONTH, 1):
+            for day in range(1, days + 1):
+                lines += self.page(name, "", prefix="HOURLY ")[:-1] + heading
+                for hour in range(1, 25):
+                    lines.append(f" {month:2d}{day:2d}{hour:2d}"
+                                 + place(spans, [self.num(-20, 120) for _ in variables])[7:])
+        return lines
+
+    def generate(self):
+        lines = []
+        lines += self.lv_b()
+        lines += self.lv_d()
+        lines += self.ls_b()
+        lines += self.sv_a()
+        lines += self.ss_monthly("SS-A", "System Loads Summary")
+        lines += self.ss_f()
+        lines += self.ss_monthly("SS-G", "Zone Loads Summary")
+        lines += self.ss_h()
+        lines += self.ss_l()
+        lines += self.ss_r()
+        if self.hourly_variables:
+            lines += self.hourly()
+        lines += self.pv_a()
+        lines += self.ps_c()
+        if self.plant_meters:
+            lines += self.ps_e()
+            lines += self.ps_f()
+            lines += self.ps_h()
+        lines += self.bepu()
+        lines += self.page("ES-D", "Energy Cost Summary")
+        lines += ["", "  END OF RUN"]
+        return lines
+
+    def write(self, path):
+        with open(path, "w", encoding="iso-8859-1", newline="\r\n") as f:
+            for line in self.generate():
+                f.write(line + "\n")
+        return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic eQUEST .SIM file.")
+    parser.add_argument("output")
+    parser.add_argument("--systems", type=int, default=4)
+    parser.add_argument("--zones", type=int, default=5, help="zones per system")
+    parser.add_argument("--spaces", type=int, default=None)
+    parser.add_argument("--pages", type=int, default=1, help="pages the LV-D surface listing is spread over")
+    parser.add_argument("--doe-version", default="DOE-2.2", choices=["DOE-2.2", "DOE-2.3"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hourly-variables", type=int, default=0,
+                        help="add an HOURLY REPORT block with this many variables for every hour of the year")
+    parser.add_argument("--plant-meters", action="store_true", help="add PS-E, PS-F and PS-H pages after PS-C")
+    args = parser.parse_args(argv)
+    SIMGenerator(args.systems, args.zones, args.spaces, args.doe_version, args.seed,
+                 pages=args.pages, hourly_variables=args.hourly_variables,
+                 plant_meters=args.plant_meters).write(args.output)
+
+
+if __name__ == "__main__":
+    main()
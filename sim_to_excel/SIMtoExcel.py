@@ -1,26 +1,100 @@
 import re
 import os
-import xlsxwriter
-import math
-import tkinter as tk
-from tkinter import filedialog
-
-from sim_to_excel.add_logo import ICON_PATH
+import argparse
+import queue
+import threading
+from itertools import compress, groupby
+from operator import itemgetter, not_
+
+from sim_to_excel.archives import is_plain_file, open_text, sim_location
+from sim_to_excel.columns import (LV_B_SPACE_COLUMNS, LV_B_SUMMARY_COLUMNS, LV_D_SUMMARY_COLUMNS, LV_D_SURFACE_COLUMNS,
+                                  PV_A_EQUIPMENT_COLUMNS, PV_A_LOOP_COLUMNS, PV_A_PUMP_COLUMNS, SS_MONTHLY_COLUMNS,
+                                  SV_A_DOAS_COLUMNS, SV_A_FAN_COLUMNS, SV_A_SYSTEM_COLUMNS, SV_A_ZONE_COLUMNS, END_USES,
+                                  ColumnSpec, is_peak_time, layout_rows, peak_time)
+from sim_to_excel.formats import FormatRegistry
+from sim_to_excel.hourly import HOURLY_REPORT, parse_hourly_lines, write_hourly_sheets
+from sim_to_excel.parse_cache import ParseCache
+from sim_to_excel.report_index import (ENTITY_REPORTS, PLANT_ENTITY_REPORTS, ReportIndex, parse_report_header,
+                                       report_section)
+from sim_to_excel.sheets import SheetSpec, write_table
+from sim_to_excel.stats import ConversionStats, counting_worksheet_class
+from sim_to_excel.table import Table, numbers_or_blank
+
+
+# Sheet layouts for the reports that are read a summary row at a time (SS-A, PS-C, SS-H, SS-L). "hidden"
+# writes every row and hides the monthly ones under a TOTAL / SUM / ANNUAL filter; "summary" writes only
+# the summary rows, as one block, and puts the monthly rows on a "<report> Monthly" sheet next to it.
+LAYOUTS = ("hidden", "summary")
+
+
+class PipelineStopped(Exception):
+    # Raised inside a pipeline stage when another stage has failed
+    pass
 
 
 class SIMFileReader:
-    def __init__(self, sim_file_path):
+    # Lines of these reports come paired with the system / zone / space, meter, equipment (or hourly report)
+    # they belong to
+    entity_reports = ENTITY_REPORTS + PLANT_ENTITY_REPORTS + [HOURLY_REPORT]
+    parsing_methods = {
+        "BEPU": "parse_bepu",
+        "LS-B": "parse_ls_b",
+        "LV-B": "parse_lv_b",
+        "LV-D": "parse_lv_d",
+        "PS-C": "parse_ps_c",
+        "PS-E": "parse_ps_e",
+        "PS-F": "parse_ps_f",
+        "PS-H": "parse_ps_h",
+        "PV-A": "parse_pv_a",
+        "SS-A": "parse_ss_a",
+        "SS-B": "parse_ss_b",
+        "SS-F": "parse_ss_f",
+        "SS-G": "parse_ss_g",
+        "SS-H": "parse_ss_h",
+        "SS-L": "parse_ss_l",
+        "SS-R": "parse_ss_r",
+        "SV-A": "parse_sv_a",
+        HOURLY_REPORT: "parse_hourly",
+    }
+    # Reports whose parsers take each line on its own or start over on every page. scan_reports hands a
+    # long run of their pages over in parts of about chunk_lines lines, split where a page starts, so that
+    # a year of hourly output is never buffered whole. The other parsers keep state from page to page.
+    chunked_reports = {HOURLY_REPORT, "LS-B", "PS-E", "PS-F", "PS-H", "SS-A", "SS-B", "SS-F", "SS-G", "SS-H"}
+    chunk_lines = 4096
+
+    def __init__(self, sim_file_path, keep_contents=False, use_index=False, reports=None, out_dir=None,
+                 layout="hidden"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}. Choose from: {', '.join(LAYOUTS)}")
+        # sim_file_path may also be compressed (run.SIM.gz) or a zip member (runs.zip::run.SIM), see archives.py
         self.file_path = sim_file_path
-        self.file_name = "".join(os.path.basename(self.file_path).split('.')[:-1])
-        self.wb_name = os.path.join(os.path.dirname(self.file_path), f'{self.file_name} - SIM.xlsx')
+        sim_dir, sim_name = sim_location(self.file_path)
+        self.file_name = "".join(sim_name.split('.')[:-1])
+        if out_dir is None:
+            out_dir = sim_dir
+        self.wb_name = os.path.join(out_dir, f'{self.file_name} - SIM.xlsx')
+        # When keep_contents is False, read_file hands each report's lines to its parser as they are read,
+        # drops the lines of reports without a parser and leaves report_contents empty; set it to True to
+        # keep the raw lines of every report
+        self.keep_contents = keep_contents
+        self.layout = layout
+        # When use_index is True, read_file memory-maps the file, indexes the byte offsets of every
+        # report page and decodes only the pages of reports that have a parser
+        self.use_index = use_index
+        self.report_index = None
         self.report_contents = {}
         self.doe_version = None
+        # Timings and counters of this conversion, see sim_to_excel.stats
+        self.stats = ConversionStats()
 
         self.bepu_data = None
         self.ls_b_data = None
         self.lv_b_data = None
         self.lv_d_data = None
         self.ps_c_data = None
+        self.ps_e_data = None
+        self.ps_f_data = None
+        self.ps_h_data = None
         self.pv_a_data = None
         self.ss_a_data = None
         self.ss_b_data = None
@@ -30,101 +104,245 @@ class SIMFileReader:
         self.ss_l_data = None
         self.ss_r_data = None
         self.sv_a_data = None
-
-        self.parsing_methods = {
-            "BEPU": "parse_bepu",
-            "LS-B": "parse_ls_b",
-            "LV-B": "parse_lv_b",
-            "LV-D": "parse_lv_d",
-            "PS-C": "parse_ps_c",
-            "PV-A": "parse_pv_a",
-            "SS-A": "parse_ss_a",
-            "SS-B": "parse_ss_b",
-            "SS-F": "parse_ss_f",
-            "SS-G": "parse_ss_g",
-            "SS-H": "parse_ss_h",
-            "SS-L": "parse_ss_l",
-            "SS-R": "parse_ss_r",
-            "SV-A": "parse_sv_a",
-        }
-
-    @staticmethod
-    def clean(val):
-        try:
-            return float(val)
-        except ValueError:
-            return ""
-
-    def read_file(self):
-        with open(self.file_path, "r", encoding="iso-8859-1") as f:
-            sim_contents = f.read().splitlines()
-
+        # Hourly report name -> HourlyBlock
+        self.hourly_data = None
+
+        # Optional subset of report codes to read, parse and write; None means every report
+        self.reports = None
+        if reports:
+            self.reports = [report.strip().upper() for report in reports]
+            unknown = [report for report in self.reports if report not in self.parsing_methods]
+            if unknown:
+                raise ValueError(f"Unknown report(s): {', '.join(unknown)}. "
+                                 f"Choose from: {', '.join(self.parsing_methods)}")
+
+    # One alternation regex per skip-line (or summary-line) list, compiled once and shared by every reader
+    substring_patterns = {}
+
+    @classmethod
+    def substring_pattern(cls, substrings):
+        key = tuple(substrings)
+        pattern = cls.substring_patterns.get(key)
+        if pattern is None:
+            pattern = cls.substring_patterns[key] = re.compile("|".join(map(re.escape, key)))
+        return pattern
+
+    def read_file(self, jobs=None):
+        # jobs > 1: the reports' lines are collected while reading and then parsed in that many processes
+        # (parse_contents), instead of being handed to the parsers here as they are read
+        parallel = jobs is not None and jobs > 1
+        with self.stats.phase("read_file"):
+            self.read_lines(self.file_lines(), collect=parallel)
+            if parallel and self.report_contents:
+                self.parse_contents(jobs)
+                if not self.keep_contents:
+                    self.report_contents = {}
+
+    def file_lines(self):
+        # Compressed files and zip members are streamed; only a plain file on disk can be memory-mapped
+        if self.use_index and is_plain_file(self.file_path):
+            self.report_index = ReportIndex(self.file_path)
+            self.doe_version = self.report_index.doe_version
+            wanted_reports = self.reports
+            if wanted_reports is None and not self.keep_contents:
+                wanted_reports = self.parsing_methods
+            yield from self.report_index.iter_lines(wanted_reports)
+        else:
+            with open_text(self.file_path) as f:
+                yield from f
+
+    def read_lines(self, lines, collect=False):
+        # collect: keep the lines for parse_contents(jobs) rather than parse them here. Hourly reports are
+        # parsed here all the same, part by part as scan_reports hands them over: their blocks grow a row
+        # at a time, while collecting them would hold a whole year of lines only to ship a copy of the block
+        # back from a worker.
+        for report, report_lines in self.scan_reports(lines, self.reports):
+            if self.keep_contents or collect and report != HOURLY_REPORT:
+                self.report_contents.setdefault(report, []).extend(report_lines)
+            elif report in self.parsing_methods:
+                self.run_parser(report, report_lines)
+
+    def run_parser(self, report, lines=None):
+        # Calls the report's parse method, timing it and counting the lines it was given and the rows it added
+        report_stats = self.stats.report(report)
+        report_stats.lines += len(self.report_contents[report] if lines is None else lines)
+        rows_before = self.table_rows(report)
+        with report_stats.parse.time():
+            getattr(self, self.parsing_methods[report])(lines)
+        report_stats.rows += self.table_rows(report) - rows_before
+
+    def table_rows(self, report):
+        if report == HOURLY_REPORT:
+            return sum(map(len, (self.hourly_data or {}).values()))
+        return sum(len(table) for _, _, table in self.tables([report]))
+
+    def scan_reports(self, lines, reports=None):
+        # Yields (report, lines) for every run of consecutive pages belonging to the same report,
+        # consuming the SIM text one line at a time so the whole file is never held in memory. A run of
+        # chunked_reports longer than chunk_lines comes in several parts, each starting at a page; the
+        # parsers add to what the previous part left. Only reports with a parser (any report with
+        # keep_contents) are buffered. With a reports selection, lines of other reports are ignored and the scan stops
+        # once every selected report's section (LOADS, SYSTEMS, PLANT, ECONOMICS) has been passed.
+        pending_reports = set(reports) if reports else None
         active_report = None
+        buffered = chunked = False
         system_zone_or_space = ""
         active_report_contents = []
-        i = 0
-        while i < len(sim_contents):
-            line = sim_contents[i]
+        skip_lines = 0
+        scanned = 0
+        for scanned, line in enumerate(lines, 1):
+            line = line.rstrip("\n")
+            if skip_lines:
+                skip_lines -= 1
+                continue
+
             if "BDL RUN" in line:
                 if not self.doe_version:
                     self.doe_version = line[81:88]
 
-                i += 2  # skip next line
+                skip_lines = 1  # skip next line
                 continue
 
             if "REPORT- " in line:
-                index = line.index("REPORT- ") + len("REPORT- ")
-                report = line[index:index + 4]
-
-                # These reports occur per system/zone/space, so we need to parse the system/zone/space name
-                if report in ["LS-B", "SS-A", "SS-B", "SS-F", "SS-G", "SS-H", "SS-L", "SS-R", "SV-A"]:
-                    parts: list[str] = re.split(r"\s{2,}", line)
-                    system_zone_or_space = parts[1].strip()
-                if active_report is None:
-                    active_report = report
-                if report != active_report:
-                    if active_report not in self.report_contents:
-                        self.report_contents[active_report] = active_report_contents
-                    else:
-                        self.report_contents[active_report].extend(active_report_contents)
+                report, entity = parse_report_header(line)
+                if entity is not None:
+                    system_zone_or_space = entity
+                if report == active_report:
+                    if chunked and len(active_report_contents) >= self.chunk_lines:
+                        yield active_report, active_report_contents
+                        active_report_contents = []
+                else:
+                    if buffered:
+                        yield active_report, active_report_contents
+
+                    if pending_reports is not None and "HOURLY REPORT" not in line:
+                        section = report_section(report)
+                        if section is not None:
+                            # Hourly reports have no section of their own and keep the scan going
+                            pending_reports = {pending for pending in pending_reports
+                                               if pending == report or report_section(pending) is None
+                                               or report_section(pending) >= section}
+                        if not pending_reports:
+                            self.stats.lines_scanned += scanned
+                            return
 
                     active_report_contents = []
                     active_report = report
+                    buffered = ((reports is None or report in reports)
+                                and (self.keep_contents or report in self.parsing_methods))
+                    chunked = buffered and report in self.chunked_reports
 
-            elif active_report is not None:
+            elif buffered:
                 # These reports need the system/zone parsed from the "REPORT- " line
-                if active_report in ["LS-B", "SS-A", "SS-B", "SS-F", "SS-G", "SS-H", "SS-L", "SS-R", "SV-A"]:
+                if active_report in self.entity_reports:
                     active_report_contents.append((system_zone_or_space, line))
                 else:
                     active_report_contents.append(line)
 
-            i += 1
-
-    def parse_contents(self):
-        for report in self.report_contents:
-            if report in self.parsing_methods:
-                report_parse_method = getattr(self, self.parsing_methods[report])
-                report_parse_method()
+        self.stats.lines_scanned += scanned
+        if buffered:
+            yield active_report, active_report_contents
+
+    def read_and_parse(self, cache=None, jobs=None):
+        # With a ParseCache, a warm run restores the parsed tables and skips reading and parsing. jobs > 1
+        # parses the reports in that many processes, see read_file.
+        key = cache.key(self) if cache is not None else None
+        if key is not None:
+            with self.stats.phase("cache_load"):
+                if cache.load(self, key):
+                    return
+
+        self.read_file(jobs)
+        if jobs is None or jobs <= 1:
+            self.parse_contents()
+        if cache is not None:
+            with self.stats.phase("cache_store"):
+                cache.store(self, key)
+
+    @classmethod
+    def data_attribute(cls, report):
+        # "parse_ls_b" fills "ls_b_data"
+        return cls.parsing_methods[report].removeprefix("parse_") + "_data"
+
+    # Names of the tables of reports that parse into more than one, matching their sheet names
+    table_names = {
+        "LV-D": ("LV-D", "LV-D Summary"),
+        "PS-E": ("PS-E", "PS-E Peaks"),
+        "PS-F": ("PS-F", "PS-F Peaks"),
+        "PV-A": ("PV-A Loops", "PV-A Pumps", "PV-A Equip."),
+        "SV-A": ("SV-A Systems", "SV-A Fans", "SV-A Zones", "SV-A DOAS"),
+    }
+
+    def tables(self, reports=None):
+        # Yields (report, name, table) for every parsed table; hourly blocks are not tables, see hourly_blocks()
+        for report in reports or self.parsing_methods:
+            data = getattr(self, self.data_attribute(report))
+            if data is None or report == HOURLY_REPORT:
+                continue
+            if isinstance(data, Table):
+                yield report, report, data
+            else:
+                for name, table in zip(self.table_names[report], data):
+                    yield report, name, table
+
+    def hourly_blocks(self, reports=None):
+        # The parsed HourlyBlocks, in file order
+        if reports is not None and HOURLY_REPORT not in reports:
+            return []
+        return list((self.hourly_data or {}).values())
+
+    def parse_contents(self, jobs=None):
+        with self.stats.phase("parse_contents"):
+            self._parse_contents(jobs)
+
+    def _parse_contents(self, jobs):
+        reports = [report for report in self.report_contents if report in self.parsing_methods]
+        if jobs is not None and jobs > 1 and not reports and not self.keep_contents:
+            # read_file already parsed every report as it ended; there is nothing left to spread over processes
+            raise ValueError("parse_contents(jobs=...) needs the report lines: pass jobs to read_file() instead, "
+                             "or create the reader with keep_contents=True")
+        if jobs is None or jobs <= 1 or len(reports) <= 1:
+            for report in reports:
+                self.run_parser(report)
+            return
 
-    def parse_bepu(self):
+        # Each report only reads its own lines, so the reports can be parsed in separate processes.
+        # The biggest reports (LS-B, SV-A, ...) are submitted first so they start right away.
+        from concurrent.futures import ProcessPoolExecutor
+
+        reports.sort(key=lambda report: len(self.report_contents[report]), reverse=True)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(reports))) as executor:
+            futures = {report: executor.submit(parse_report, report, self.report_contents[report], self.doe_version)
+                       for report in reports}
+            for report, future in futures.items():
+                setattr(self, self.data_attribute(report), future.result())
+                # The parse time was spent in the worker; only the counters are known here
+                report_stats = self.stats.report(report)
+                report_stats.lines += len(self.report_contents[report])
+                report_stats.rows += self.table_rows(report)
+
+    def parse_bepu(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
         ]
+        skipline = self.substring_pattern(skipline_substrings)
         end_use_spans = [(4, 12), (12, 21), (21, 30), (30, 39), (39, 48), (48, 57), (57, 66), (66, 75), (75, 84),
                          (84, 93), (93, 102), (102, 111), (111, 120), (120, 130)]
 
-        lines = self.report_contents['BEPU']
+        if lines is None:
+            lines = self.report_contents['BEPU']
 
         summary_section = False
-        data = [
-            ["Meter", "Units", "Lights", "Task Lights", "Misc. Equip.", "Heating", "Cooling", "Heat Rejection", "Pumps & Aux.", "Fans", "Rerig. Display", "Ht. Pump Supplemental", "Domestic Hot Water", "Exterior", "Total"]
-        ]
+        data = self.bepu_data or Table(
+            [("Meter", "str"), ("Units", "str")]
+            + [(name, "float_or_blank") for name in ["Lights", "Task Lights", "Misc. Equip.", "Heating", "Cooling", "Heat Rejection", "Pumps & Aux.", "Fans", "Rerig. Display", "Ht. Pump Supplemental", "Domestic Hot Water", "Exterior", "Total"]]
+        )
         row = []
         meter_data_lines_ctr = 0
         for line in lines[6:]:
 
-            if len(line.strip()) == 0 or any(substring in line for substring in skipline_substrings):
+            if len(line.strip()) == 0 or skipline.search(line):
                 continue
 
             if "TOTAL ELECTRICITY" in line:
@@ -134,12 +352,9 @@ class SIMFileReader:
                 if meter_data_lines_ctr % 2 == 0:
                     row.append(line.strip())
                 else:
-                    # Parse and clean the data using the spans then append to row
-                    for i, (start, end) in enumerate(end_use_spans):
-                        if i == 0:
-                            row.append(line[start:end].strip())
-                        else:
-                            row.append(self.clean(line[start:end].strip()))
+                    # Split the data using the spans then append to row; the table converts the numbers
+                    for start, end in end_use_spans:
+                        row.append(line[start:end].strip())
                     data.append(row)
                     row = []
 
@@ -147,7 +362,7 @@ class SIMFileReader:
 
         self.bepu_data = data
 
-    def parse_ls_b(self):
+    def parse_ls_b(self, lines=None):
         skipline_substrings = [
             "------",
             "======",
@@ -166,29 +381,31 @@ class SIMFileReader:
             "SENSIBLE",
             "(KBTU/H)    ( KW )  (KBTU/H)  ( KW )",
         ]
-        skipline_start_substrings = [
+        skipline = self.substring_pattern(skipline_substrings)
+        skipline_start_substrings = (
             "SPACE",
-        ]
-        headers = [
-            "SPACE NAME",
-            "LOAD CATEGORY",
-            "COOLING SENSIBLE (KBTU/H)",
-            "COOLING LATENT (KBTU/H)",
-            "HEATING SENSIBLE (KBTU/H)",
-            "TOTAL COOLING INTENSITY (BTU/H/FT2)",
-            "TOTAL HEATING INTENSITY (BTU/H/FT2)",
+        )
+        columns = [
+            ("SPACE NAME", "str"),
+            ("LOAD CATEGORY", "str"),
+            ("COOLING SENSIBLE (KBTU/H)", "float_or_blank"),
+            ("COOLING LATENT (KBTU/H)", "float_or_blank"),
+            ("HEATING SENSIBLE (KBTU/H)", "float_or_blank"),
+            ("TOTAL COOLING INTENSITY (BTU/H/FT2)", "float_or_blank"),
+            ("TOTAL HEATING INTENSITY (BTU/H/FT2)", "float_or_blank"),
         ]
         category_name_span = (5, 28)
         category_spans = [(28, 36), (48, 56), (85, 93)]
         total_spans = [(28, 36), (75, 83)]
-        data = [headers]
-        lines = self.report_contents['LS-B']
+        data = self.ls_b_data or Table(columns)
+        if lines is None:
+            lines = self.report_contents['LS-B']
 
         for space_name, line in lines:
 
             if (
-                any(substring in line for substring in skipline_substrings)
-                or any(line.startswith(skipline_start_substring) for skipline_start_substring in skipline_start_substrings)
+                skipline.search(line)
+                or line.startswith(skipline_start_substrings)
                 or len(line.strip()) == 0
             ):
                 continue
@@ -196,95 +413,55 @@ class SIMFileReader:
             load_category = line[category_name_span[0]:category_name_span[1]].strip()
             if "TOTAL LOAD" in load_category:
                 line_data = [space_name, load_category, "", "", ""]
-                for start, end in total_spans:
-                    try:
-                        line_data.append(self.clean(line[start:end].strip()))
-                    except ValueError:
-                        line_data.append("")
+                line_data.extend(line[start:end].strip() for start, end in total_spans)
 
             else:
                 line_data = [space_name, load_category]
-                for start, end in category_spans:
-                    try:
-                        line_data.append(self.clean(line[start:end].strip()))
-                    except ValueError:
-                        line_data.append("")
+                line_data.extend(line[start:end].strip() for start, end in category_spans)
 
             data.append(line_data)
 
         self.ls_b_data = data
         return
 
-    def parse_lv_b(self):
+    def parse_lv_b(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
         ]
+        skipline = self.substring_pattern(skipline_substrings)
         summaryline_substrings = [
             "CONDITIONED FLOOR AREA",
             "TOTAL INSTALLED LIGHTING POWER",
             "TOTAL INSTALLED EQUIPMENT POWER",
         ]
-        segments = [(0, 37), (37, 43), (43, 47), (47, 54), (54, 62), (62, 69), (69, 77), (77, 91), (91, 97), (97, 109),
-                    (109, 121)]
-        summary_segments = [(0, 32), (35, 48), (48, 52)]
-        headers = [
-            "Floor Name",
-            "Space Name",
-            "Multiplier",
-            "Space Type",
-            "Azimuth",
-            "LPD",
-            "People",
-            "EPD",
-            "Infil. Method",
-            "ACH",
-            "Area",
-            "Volume",
-        ]
-        data = [headers]
-        lines = self.report_contents['LV-B']
+        summaryline = self.substring_pattern(summaryline_substrings)
+        data = self.lv_b_data or Table([("Floor Name", "str"), *LV_B_SPACE_COLUMNS.fields])
+        if lines is None:
+            lines = self.report_contents['LV-B']
 
         floor = None
         for line in lines:
 
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 continue
 
             if "BUILDING TOTALS" in line:
-                line_array = ["Summary"]
-                for start, end in segments:
-                    try:
-                        line_array.append(line[start:end].strip())
-                    except ValueError:
-                        line_array.append("")
-                data.append(line_array)
-
-            elif any(substring in line for substring in summaryline_substrings):
-                line_array = ["Summary"]
-                for start, end in summary_segments:
-                    try:
-                        line_array.append(line[start:end].strip())
-                    except ValueError:
-                        line_array.append("")
-                data.append(line_array)
+                data.append(["Summary", *LV_B_SPACE_COLUMNS.extract(line)])
+
+            elif summaryline.search(line):
+                data.append(["Summary", *LV_B_SUMMARY_COLUMNS.extract(line)])
 
             elif "Spaces on floor:" in line:
                 floor = line.split("Spaces on floor:")[1].strip()
 
             elif floor is not None:
-                line_array = [floor]
-                for start, end in segments:
-                    try:
-                        line_array.append(line[start:end].strip())
-                    except ValueError:
-                        line_array.append("")
-                data.append(line_array)
+                data.append([floor, *LV_B_SPACE_COLUMNS.extract(line)])
 
         self.lv_b_data = data
         return
 
-    def parse_lv_d(self):
+    def parse_lv_d(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -296,43 +473,33 @@ class SIMFileReader:
             "U-VALUE/WINDOWS      U-VALUE/WALLS",
             "(BTU/HR-SQFT-F)     (BTU/HR-SQFT-F)"
         ]
+        skipline = self.substring_pattern(skipline_substrings)
 
         summary_start = "AVERAGE             AVERAGE         AVERAGE U-VALUE         WINDOW         WALL           WINDOW+WALL"
         summary_started = False
 
-        segments = [(0, 41), (41, 48), (48, 62), (62, 75), (75, 89), (89, 100), (100, 118), (118, 128)]
-        summary_segments = [(0, 20), (20, 30), (30, 50), (50, 70), (70, 90), (90, 105), (105, 121)]
-        data = [["", "", "", "", "", "", "", "", ""],
-                ["Space Name", "Surface Name", "U-Value", "Area", "U-Value", "Area", "U-Value", "Area", "Azimuth"]]
-        summary_data = [[]]
+        data = Table([("Space Name", "str"), *LV_D_SURFACE_COLUMNS.fields])
+        summary_data = Table(LV_D_SUMMARY_COLUMNS.fields)
+        if self.lv_d_data:
+            data, summary_data = self.lv_d_data
 
-        lines = self.report_contents['LV-D']
+        if lines is None:
+            lines = self.report_contents['LV-D']
         line_array = []
 
         for line in lines:
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 continue
 
             if summary_started:
-                summ_line_array = []
-                for start, end in summary_segments:
-                    try:
-                        summ_line_array.append(line[start:end].strip())
-                    except ValueError:
-                        summ_line_array.append("")
-                summary_data.append(summ_line_array)
+                summary_data.append(LV_D_SUMMARY_COLUMNS.extract(line))
 
             elif summary_start in line:
                 summary_started = True
 
             else:
                 if "in space:" not in line:
-                    line_array = []
-                    for start, end in segments:
-                        try:
-                            line_array.append(line[start:end].strip())
-                        except ValueError:
-                            line_array.append("")
+                    line_array = LV_D_SURFACE_COLUMNS.extract(line)
                 else:
                     line_array.insert(0, line.split("in space:")[1].strip())
                     data.append(line_array)
@@ -340,7 +507,7 @@ class SIMFileReader:
         self.lv_d_data = (data, summary_data)
         return
 
-    def parse_pv_a(self):
+    def parse_pv_a(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -357,6 +524,7 @@ class SIMFileReader:
             "(MBTU/HR) (GAL/MIN   )  (FRAC)",
             "*** DW-HEATERS ***",
             ]
+        skipline = self.substring_pattern(skipline_substrings)
 
         loop_start = "*** CIRCULATION LOOPS ***"
         loop_data_started = False
@@ -365,31 +533,27 @@ class SIMFileReader:
         prim_start = "*** PRIMARY EQUIPMENT ***"
         prim_data_started = False
 
-        loop_segments = [(0, 13), (13, 25), (25, 37), (37, 49), (49, 61), (61, 73), (73, 86),
-                         (86, 97), (97, 109), (109, 120)]
-        pump_segments = [(0, 40), (40, 48), (48, 60), (60, 72), (72, 84), (84, 96), (96, 108),
-                         (108, 119)]
-
-        prim_segments = []
-        if self.doe_version == "DOE-2.2":
-            prim_segments = [(0, 19), (19, 53), (53, 65), (65, 77), (77, 89), (89, 101), (101, 112)]
-        elif self.doe_version == "DOE-2.3":
-            prim_segments = [(0, 19), (19, 53), (53, 65), (65, 77), (77, 88)]
+        prim_columns = PV_A_EQUIPMENT_COLUMNS.get(self.doe_version, ColumnSpec())
 
-        lines = self.report_contents['PV-A']
+        if lines is None:
+            lines = self.report_contents['PV-A']
 
-        loop_data = [
-            ["Loop Name", "Heat Demand \n(MMBtu/h)", "Cool Demand \n(MMBtu/h)", "Loop Flow \n(GPM)", "Total Head \n(ft)", "Supply UA Product \n(Btu/h-F)", "Supply Loss DT \n(F)", "Return UA Product \n(Btu/h-F)",
-             "Return Loss DT \n(F)", "Loop Volume \n(Gal)", "Fluid Heat Cap. \n(Btu/lb-F)"]]
-        pump_data = [
-            ["Pump Name", "Qty", "Attached To", "Attached Eqp Type", "Flow \n(GPM)", "Head \n(ft)", "Head Setpoint \n(ft)", "Capacity Control", "Power \n(kW)", "Mech. Eff.", "Motor Eff."]]
-        prim_data = [
-            ["Equipment Name", "Equipment Type", "Attached To", "Capacity \n(MMBtu/h)", "Flow \n(GPM)", "Head \n(ft)"]]
+        loop_data = Table([("Loop Name", "str"), *PV_A_LOOP_COLUMNS.fields])
+        pump_data = Table(
+            [("Pump Name", "str"), ("Qty", "float"), ("Attached To", "str"), ("Attached Eqp Type", "str"),
+             ("Flow \n(GPM)", "float"), ("Head \n(ft)", "float"), ("Head Setpoint \n(ft)", "float"),
+             ("Capacity Control", "str"), ("Power \n(kW)", "float"), ("Mech. Eff.", "float"), ("Motor Eff.", "float")])
+        # DOE-2.2 prints two more equipment columns than the sheet has headings for
+        prim_data = Table(
+            [("Equipment Name", "str"), *PV_A_EQUIPMENT_COLUMNS["DOE-2.2"].fields],
+            header=["Equipment Name", "Equipment Type", "Attached To", "Capacity \n(MMBtu/h)", "Flow \n(GPM)", "Head \n(ft)"])
+        if self.pv_a_data:
+            loop_data, pump_data, prim_data = self.pv_a_data
 
         system_line = None
         previous_line = None
         for line in lines:
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 previous_line = line
                 continue
 
@@ -417,24 +581,14 @@ class SIMFileReader:
                     loop_line_array = [previous_line[0:32]]
                 else:
                     loop_line_array = []
-
-                for start, end in loop_segments:
-                    try:
-                        loop_line_array.append(line[start:end].strip())
-                    except ValueError:
-                        loop_line_array.append("")
+                loop_line_array.extend(PV_A_LOOP_COLUMNS.extract(line))
                 if all(segment == "" for segment in loop_line_array[-6:]):
                     previous_line = line
                     continue
                 loop_data.append(loop_line_array)
 
             elif pump_data_started:
-                pump_line_array = [previous_line[0:32], ""]
-                for start, end in pump_segments:
-                    try:
-                        pump_line_array.append(line[start:end].strip())
-                    except ValueError:
-                        pump_line_array.append("")
+                pump_line_array = [previous_line[0:32], "", *PV_A_PUMP_COLUMNS.extract(line)]
                 if all(segment == "" for segment in pump_line_array[-6:]):
                     previous_line = line
                     continue
@@ -442,20 +596,12 @@ class SIMFileReader:
                 pump_data.append(pump_line_array)
 
             elif prim_data_started:
-                prim_line_array = []
-                for start, end in prim_segments:
-                    try:
-                        prim_line_array.append(line[start:end].strip())
-                    except ValueError:
-                        prim_line_array.append("")
+                prim_line_array = prim_columns.extract(line)
                 if all(segment == "" for segment in prim_line_array[-3:]):
                     system_line = line
                     continue
                 if prim_line_array[0] == "" and all(segment != "" for segment in prim_line_array[1:5]):
-                    start, end = prim_segments[0]
-                    prim_line_array[0] = previous_line[start:end].strip()
-                    start, end = prim_segments[1]
-                    prim_line_array[1] = previous_line[start:end].strip()
+                    prim_line_array[0:2] = prim_columns.extract(previous_line)[0:2]
 
                 prim_line_array.insert(0, system_line[0:32])
                 prim_data.append(prim_line_array)
@@ -465,19 +611,26 @@ class SIMFileReader:
         self.pv_a_data = (loop_data, pump_data, prim_data)
         return
 
-    def parse_ps_c(self):
+    def parse_ps_c(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
             "(MBTU)      (MBTU)",
             "(KBTU/HR)   (KBTU/HR)"
         ]
-        lines = self.report_contents.get("PS-C", [])
-        data = [["System", "Type", "Cool Load (MBTU)", "Heat Load (MBTU)", "Elec Use (kWh)", "Fuel Use (MBTU)", "Data Type", "PLR 0_10", "PLR 10_20", "PLR 20_30", "PLR 30_40", "PLR 40_50", "PLR 50_60", "PLR 60_70", "PLR 70_80", "PLR 80_90", "PLR 90_100", "PLR 100+", "Total Run Hours"]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents.get("PS-C", [])
+        data = self.ps_c_data or Table(
+            [("System", "str"), ("Type", "str"), ("Cool Load (MBTU)", "float_or_blank"),
+             ("Heat Load (MBTU)", "float_or_blank"), ("Elec Use (kWh)", "float_or_blank"),
+             ("Fuel Use (MBTU)", "float_or_blank"), ("Data Type", "str")]
+            + [(name, "float_or_blank") for name in ["PLR 0_10", "PLR 10_20", "PLR 20_30", "PLR 30_40", "PLR 40_50", "PLR 50_60", "PLR 60_70", "PLR 70_80", "PLR 80_90", "PLR 90_100", "PLR 100+", "Total Run Hours"]]
+        )
         current_system = None
 
         for line in lines:
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 continue
 
             stripped = line.strip()
@@ -497,20 +650,70 @@ class SIMFileReader:
             data.append([
                 current_system,
                 entry_type,
-                self.clean(cool_val),
-                self.clean(heat_val),
-                self.clean(elec_val),
-                self.clean(fuel_val),
+                cool_val,
+                heat_val,
+                elec_val,
+                fuel_val,
                 data_type,
-                *[self.clean(plr) for plr in plr_values],
+                *plr_values,
             ])
 
         self.ps_c_data = data
 
-    def parse_ps_h(self):
-        return
-
-    def parse_ss_a(self):
+    def parse_end_use_meters(self, data, lines):
+        # PS-E / PS-F: for each month, rows of energy, peak demand, its day/hour, ... (labelled "KWH",
+        # "MAX KW", ...) across the BEPU end uses. The columns are read off the page, the last ones being
+        # the end uses; a layout with fewer columns fills them from the right, up to Total. The day/hour
+        # rows ("19/ 9") go to a second table, one row per end use with the day and hour as numbers.
+        meters, peaks = data or (
+            Table([("Meter", "str"), ("Month", "str"), ("Item", "str")] + [(name, "float") for name in END_USES]),
+            Table([("Meter", "str"), ("Month", "str"), ("Item", "str"), ("End Use", "str"), ("Peak Day", "int"),
+                   ("Peak Hour", "int")]),
+        )
+        for meter, meter_lines in groupby(lines, key=itemgetter(0)):
+            for month, label, _, cells in layout_rows(map(itemgetter(1), meter_lines)):
+                cells = cells[-len(END_USES):]
+                cells = [*[""] * (len(END_USES) - len(cells)), *cells]
+                if any(map(is_peak_time, cells)):
+                    for end_use, cell in zip(END_USES, cells):
+                        if cell:
+                            peaks.append([meter, month, label, end_use, *peak_time(cell)])
+                else:
+                    meters.append([meter, month, label, *cells])
+        return meters, peaks
+
+    def parse_ps_e(self, lines=None):
+        if lines is None:
+            lines = self.report_contents["PS-E"]
+        self.ps_e_data = self.parse_end_use_meters(self.ps_e_data, lines)
+
+    def parse_ps_f(self, lines=None):
+        if lines is None:
+            lines = self.report_contents["PS-F"]
+        self.ps_f_data = self.parse_end_use_meters(self.ps_f_data, lines)
+
+    def parse_ps_h(self, lines=None):
+        # Each piece of plant equipment prints its own columns (loads, energy, part-load hours, ...), so
+        # PS-H is kept long: one row per filled cell, named by the headings above its column. The
+        # equipment properties block comes out the same way, with no month. A peak's day/hour cell
+        # ("2/16") fills Peak Day and Peak Hour instead of Value.
+        if lines is None:
+            lines = self.report_contents["PS-H"]
+        data = self.ps_h_data or Table(
+            [("Equipment", "str"), ("Month", "str"), ("Item", "str"), ("Quantity", "str"), ("Units", "str"),
+             ("Value", "float"), ("Peak Day", "int"), ("Peak Hour", "int")]
+        )
+        for equipment, equipment_lines in groupby(lines, key=itemgetter(0)):
+            for month, label, headings, cells in layout_rows(map(itemgetter(1), equipment_lines)):
+                for index, cell in enumerate(cells):
+                    if not cell:
+                        continue
+                    name, units, _ = headings[index] if headings is not None else (f"Value {index + 1}", None, None)
+                    values = ["", *peak_time(cell)] if is_peak_time(cell) else [cell, "", ""]
+                    data.append([equipment, month, label, name or f"Value {index + 1}", units or "", *values])
+        self.ps_h_data = data
+
+    def parse_ss_a(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -520,49 +723,38 @@ class SIMFileReader:
             "ENERGY   OF MAX   BULB  BULB",
             "MONTH     (MBTU)   DY  HR   TEMP  TEMP",
         ]
-        segments = [(0, 5), (5, 16), (16, 22), (22, 25), (25, 32), (32, 38), (38, 52), (52, 67), (67, 72), (72, 76),
-                    (76, 83), (83, 89), (89, 103), (103, 117), (117, 128)]
-        lines = self.report_contents['SS-A']  # Exclude the last line
-        data = [
-            ["System", "Month", "Cooling Energy \n(MBTU)", "Peak Cooling Day", "Peak Cooling Hour", "Dry Bulb Temp",
-             "Wet Bulb Temp", "Max Cooling Load \n(KBTU/H)", "Heating Energy \n(MBTU)", "Peak Heating Day",
-             "Peak Heating Hour", "Dry Bulb Temp", "Wet Bulb Temp", "Max Heating Load \n(KBTU/H)",
-             "Electrical Energy \n(KWH)", "Peak Electrical Load \n(KW)"]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents['SS-A']  # Exclude the last line
+        data = self.ss_a_data or Table([("System", "str"), *SS_MONTHLY_COLUMNS.fields])
 
         for line in lines:
-            if any(substring in line[1] for substring in skipline_substrings) or len(line[1].strip()) == 0:
+            if skipline.search(line[1]) or len(line[1].strip()) == 0:
                 continue
 
-            line_array = [line[0]]
-            for start, end in segments:
-                line_array.append(line[1][start:end].strip())
-            data.append(line_array)
+            data.append([line[0], *SS_MONTHLY_COLUMNS.extract(line[1])])
         self.ss_a_data = data
         return
 
-    def parse_ss_b(self):
+    def parse_ss_b(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
         ]
-        segments = [(0, 5), (5, 16), (16, 22), (22, 25), (25, 32), (32, 38), (38, 52), (52, 67), (67, 72), (72, 76),
-                    (76, 83), (83, 89), (89, 103), (103, 117), (117, 128)]
-        lines = self.report_contents['SS-B']
-        data = [
-            ["", "", ""]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents['SS-B']
+        data = self.ss_b_data or Table(SS_MONTHLY_COLUMNS.fields, header=["", "", ""])
 
         for line in lines:
-            if any(substring in line[1] for substring in skipline_substrings) or len(line[1].strip()) == 0:
+            if skipline.search(line[1]) or len(line[1].strip()) == 0:
                 continue
 
-            line_array = []
-            for start, end in segments:
-                line_array.append(line[1][start:end].strip())
-            data.append(line_array)
+            data.append(SS_MONTHLY_COLUMNS.extract(line[1]))
         self.ss_b_data = data
         return
 
-    def parse_ss_f(self):
+    def parse_ss_f(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -572,17 +764,22 @@ class SIMFileReader:
             "ENERGY        ENERGY",
             "(MBTU)        (MBTU)"
         ]
-        lines = self.report_contents.get("SS-F", [])
-        data = [["Zone", "Month", "Heat Extraction (MBTU)", "Heat Addition (MBTU)",
-                 "Baseboard Energy (MBTU)", "Max Baseboard Load (kBTU/hr)",
-                 "Max Zone Temp (°F)", "Min Zone Temp (°F)",
-                 "Hours Under Heated", "Hours Under Cooled"]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents.get("SS-F", [])
+        data = self.ss_f_data or Table(
+            [("Zone", "str"), ("Month", "str")]
+            + [(name, "float_or_blank") for name in ["Heat Extraction (MBTU)", "Heat Addition (MBTU)",
+                                                     "Baseboard Energy (MBTU)", "Max Baseboard Load (kBTU/hr)",
+                                                     "Max Zone Temp (°F)", "Min Zone Temp (°F)",
+                                                     "Hours Under Heated", "Hours Under Cooled"]]
+        )
 
         ssf_month_row = re.compile(r"^(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)\s+")
 
         for idx, (zone_name, line) in enumerate(lines):
 
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 continue
 
             stripped = line.strip()
@@ -596,22 +793,12 @@ class SIMFileReader:
                 )
                 if match:
                     month, heat_ex, heat_add, base_energy, base_load, max_temp, min_temp, hrs_heat, hrs_cool = match.groups()
-                    data.append([
-                        zone_name,
-                        month,
-                        self.clean(heat_ex),
-                        self.clean(heat_add),
-                        self.clean(base_energy),
-                        self.clean(base_load),
-                        self.clean(max_temp),
-                        self.clean(min_temp),
-                        self.clean(hrs_heat),
-                        self.clean(hrs_cool)
-                    ])
+                    data.append([zone_name, month, heat_ex, heat_add, base_energy, base_load, max_temp, min_temp,
+                                 hrs_heat, hrs_cool])
 
         self.ss_f_data = data
 
-    def parse_ss_g(self):
+    def parse_ss_g(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -621,27 +808,20 @@ class SIMFileReader:
             "ENERGY   OF MAX   BULB  BULB",
             "MONTH     (MBTU)   DY  HR   TEMP  TEMP",
         ]
-        segments = [(0, 5), (5, 16), (16, 22), (22, 25), (25, 32), (32, 38), (38, 52), (52, 67), (67, 72), (72, 76),
-                    (76, 83), (83, 89), (89, 103), (103, 117), (117, 128)]
-        lines = self.report_contents['SS-G']
-        data = [
-            ["System", "Month", "Cooling Energy \n(MBTU)", "Peak Cooling Day", "Peak Cooling Hour", "Dry Bulb Temp",
-             "Wet Bulb Temp", "Max Cooling Load \n(KBTU/H)", "Heating Energy \n(MBTU)", "Peak Heating Day",
-             "Peak Heating Hour", "Dry Bulb Temp", "Wet Bulb Temp", "Max Heating Load \n(KBTU/H)",
-             "Electrical Energy \n(KWH)", "Peak Electrical Load \n(KW)"]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents['SS-G']
+        data = self.ss_g_data or Table([("System", "str"), *SS_MONTHLY_COLUMNS.fields])
 
         for line in lines:
-            if any(substring in line[1] for substring in skipline_substrings) or len(line[1].strip()) == 0:
+            if skipline.search(line[1]) or len(line[1].strip()) == 0:
                 continue
 
-            line_array = [line[0]]
-            for start, end in segments:
-                line_array.append(line[1][start:end].strip())
-            data.append(line_array)
+            data.append([line[0], *SS_MONTHLY_COLUMNS.extract(line[1])])
         self.ss_g_data = data
         return
 
-    def parse_ss_h(self):
+    def parse_ss_h(self, lines=None):
         skipline_substrings = [
             "------",
             "BDL RUN",
@@ -652,18 +832,23 @@ class SIMFileReader:
             "ENERGY        LOAD",
             "(KWH)        (KW)"
         ]
-        lines = self.report_contents.get("SS-H", [])
-        data = [["System", "Month", "Fan Electric Energy (kWh)", "Maximum Fan Load (kW)",
-                 "Gas Heat Energy (MBtu)", "Maximum Gas Heat Load (kBtu/hr)",
-                 "Gas Cool Energy (MBtu)", "Maximum Gas Cool Load (kBtu/hr)",
-                 "Electric Heat Energy (kWh)", "Maximum Electric Heat Load (kW)",
-                 "Electric Cool Energy (kWh)", "Maximum Electric Cool Load (kW)"]]
+        skipline = self.substring_pattern(skipline_substrings)
+        if lines is None:
+            lines = self.report_contents.get("SS-H", [])
+        data = self.ss_h_data or Table(
+            [("System", "str"), ("Month", "str")]
+            + [(name, "float") for name in ["Fan Electric Energy (kWh)", "Maximum Fan Load (kW)",
+                                            "Gas Heat Energy (MBtu)", "Maximum Gas Heat Load (kBtu/hr)",
+                                            "Gas Cool Energy (MBtu)", "Maximum Gas Cool Load (kBtu/hr)",
+                                            "Electric Heat Energy (kWh)", "Maximum Electric Heat Load (kW)",
+                                            "Electric Cool Energy (kWh)", "Maximum Electric Cool Load (kW)"]]
+        )
 
         ss_h_row = re.compile(r"^(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|TOTAL|MAX)\s")
 
         for system_name, line in lines:
 
-            if any(substring in line for substring in skipline_substrings) or len(line.strip()) == 0:
+            if skipline.search(line) or len(line.strip()) == 0:
                 continue
 
             stripped = line.strip()
@@ -677,17 +862,9 @@ class SIMFileReader:
                 row = [system_name, month_tag] + [""] * 10
 
                 if month_tag == "TOTAL":
-                    row[2] = self.clean(values[0])  # Fan Electric Energy
-                    row[4] = self.clean(values[1])  # Gas Heat Energy
-                    row[6] = self.clean(values[2])  # Gas Cool Energy
-                    row[8] = self.clean(values[3])  # Electric Heat Energy
-                    row[10] = self.clean(values[4])  # Electric Cool Energy
+                    row[2:11:2] = numbers_or_blank(values[:5])  # Fan, Gas Heat, Gas Cool, Electric Heat, Electric Cool energy
                 elif month_tag == "MAX":
-                    row[3] = self.clean(values[0])  # Max Fan Load
-                    row[5] = self.clean(values[1])  # Max Gas Heat Load
-                    row[7] = self.clean(values[2])  # Max Gas Cool Load
-                    row[9] = self.clean(values[3])  # Max Elec Heat Load
-                    row[11] = self.clean(values[4])  # Max Elec Cool Load
+                    row[3:12:2] = numbers_or_blank(values[:5])  # Max Fan, Gas Heat, Gas Cool, Elec Heat, Elec Cool load
                 else:
                     row[2:12] = values[:10]
 
@@ -695,11 +872,11 @@ class SIMFileReader:
 
         self.ss_h_data = data
 
-    def parse_ss_l(self):
+    def parse_ss_l(self, lines=None):
         previous_line = ""
-        lines = self.report_contents.get("SS-L", [])
+        if lines is None:
+            lines = self.report_contents.get("SS-L", [])
         if not lines:
-            self.ss_l_data = None
             return
 
         month_line_regex = re.compile(r"^(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|ANNUAL)\b", re.IGNORECASE)
@@ -712,7 +889,8 @@ class SIMFileReader:
             "PLR_100+", "Total Run Hours", "Annual FAN ELEC (kWh)"
         ]
 
-        data = [columns]
+        data = self.ss_l_data or Table([(name, "str" if name in ("System", "Month") else "float")
+                                        for name in columns])
         in_month_section = False
         in_breakdown_section = False
         breakdown_headers_line = False
@@ -760,7 +938,7 @@ class SIMFileReader:
                 parts = [line.strip()[start:end] for start, end in spans]
                 rows = [
                     [system_name, "BREAKDOWN", "SUPPLY (KWH)", "HOT DECK (KWH)", "RETURN (KWH)", "RELIEF (KWH)", "PIU TERMINALS (KWH)", "ZONE EXH (KWH)", "TOTAL (KWH)"],
-                    [system_name, "BREAKDOWN"] + [self.clean(v) for v in parts]
+                    [system_name, "BREAKDOWN"] + numbers_or_blank(parts)
                 ]
                 if len(rows[1]) == len(full_columns):
                     data.extend(rows)
@@ -774,17 +952,20 @@ class SIMFileReader:
 
             previous_line = line.strip()
 
-        self.ss_l_data = data if len(data) > 1 else None
+        self.ss_l_data = data if len(data) else None
 
-    def parse_ss_r(self):
+    def parse_ss_r(self, lines=None):
         segments = [(18, 26), (27, 35), (36, 44), (45, 53), (59, 63), (65, 69), (71, 75),
                     (77, 81), (83, 87), (89, 93), (95, 99), (101, 105), (107, 111),
                     (113, 117), (119, 123), (125, 129)]
-        lines = self.report_contents['SS-R']
-        data = [
-            ["System Name", "Zone Name", "Max. Heat Hours", "Max. Cool Hours", "Unmet Heat Hours", "Unmet Cool Hours",
-             "00-10", "10-20", "20-30", "30-40",
-             "40-50", "50-60", "60-70", "70-80", "80-90", "90-100", "100+", "Run Hours"]]
+        if lines is None:
+            lines = self.report_contents['SS-R']
+        data = self.ss_r_data or Table(
+            [("System Name", "str"), ("Zone Name", "str")]
+            + [(name, "int_or_blank") for name in ["Max. Heat Hours", "Max. Cool Hours", "Unmet Heat Hours", "Unmet Cool Hours",
+                                          "00-10", "10-20", "20-30", "30-40", "40-50", "50-60", "60-70", "70-80",
+                                          "80-90", "90-100", "100+", "Run Hours"]]
+        )
 
         previous_line = None
         for line in lines:
@@ -792,18 +973,14 @@ class SIMFileReader:
             if re.match(r'^[\d\s]+$', line[1].strip()):
                 if previous_line is not None:
                     line_array = [line[0], previous_line[1].strip()]
-                    for start, end in segments:
-                        try:
-                            line_array.append(int(line[1][start:end].strip()))
-                        except ValueError:
-                            line_array.append("")
+                    line_array.extend(line[1][start:end].strip() for start, end in segments)
                     data.append(line_array)
             previous_line = line
 
         self.ss_r_data = data
         return
 
-    def parse_sv_a(self):
+    def parse_sv_a(self, lines=None):
         skipline_substrings = [
             "------",
             "*** ",
@@ -819,6 +996,7 @@ class SIMFileReader:
             "(CFM )     (CFM )    MULT",
             "VRF BRANCH GAS PIPE NOMINAL DIA"
         ]
+        skipline = self.substring_pattern(skipline_substrings)
 
         sys_start = "FLOOR               OUTSIDE    COOLING"
         sys_data_started = False
@@ -829,32 +1007,17 @@ class SIMFileReader:
         doas_start = "-----  OA ATTACHED TO  -----"
         doas_data_started = False
 
-        sys_segments = [(0, 13), (13, 19), (19, 30), (30, 42), (42, 52), (52, 63), (63, 74),
-                        (74, 85), (85, 96), (96, 107), (107, 118)]
-        fan_segments = [(0, 9), (9, 20), (20, 31), (31, 40), (40, 50), (50, 61), (61, 69),
-                        (69, 77), (77, 89), (89, 99), (99, 109), (109, 118)]
-        zn_segments = [(0, 28), (28, 37), (37, 47), (47, 57), (57, 67), (67, 77), (77, 87),
-                       (87, 97), (97, 107), (107, 117), (117, 127), (127, 131)]
-        doas_segments = [(0, 37), (37, 48), (48, 59), (59, 67)]
-
-        lines = self.report_contents['SV-A']
-        sys_data = [
-            ["System Name", "Type", "Alt. Factor", "Floor Area", "Max Occ.", "OA Ratio", "Cooling \n(kBtu/h)", "SHR",
-             "Heating \n(kBtu/h)", "Cool EIR", "Heat EIR", "HP Supp. \n(kBtu/h)"]]
-        fan_data = [
-            ["System Name", "Type", "Flow Cap. \n(CFM)", "Div. Factor", "Demand \n(kW)", "Fan dT \n(F)",
-             "SP \n(in. H2O)",
-             "Total Eff.", "Mech. Eff.", "Fan Placement", "Fan Control", "Max. Fan \nRatio", "Min. Fan \nRatio"]]
-        zn_data = [
-            ["System Name", "Zone Name", "Supply \n(CFM)", "Exhaust \n(CFM)", "Fan \n(kW)", "Min. Flow \nRatio",
-             "OA \n(CFM)",
-             "Cooling \n(kBtu/h)", "SHR", "Extr. \n(kBtu/h)", "Heating \n(kBtu/h)", "Addition \n(kBtu/h)", "Zn Mult."]]
-        doas_data = [
-            ["System Name", "Zone Name", "Mixed Air \n(CFM)", "Zone \n(CFM)", "Mult."],
-        ]
+        if lines is None:
+            lines = self.report_contents['SV-A']
+        sys_data = Table([("System Name", "str"), *SV_A_SYSTEM_COLUMNS.fields])
+        fan_data = Table([("System Name", "str"), *SV_A_FAN_COLUMNS.fields])
+        zn_data = Table([("System Name", "str"), *SV_A_ZONE_COLUMNS.fields])
+        doas_data = Table([("System Name", "str"), *SV_A_DOAS_COLUMNS.fields])
+        if self.sv_a_data:
+            sys_data, fan_data, zn_data, doas_data = self.sv_a_data
 
         for line in lines:
-            if any(substring in line[1] for substring in skipline_substrings) or len(line[1].strip()) == 0:
+            if skipline.search(line[1]) or len(line[1].strip()) == 0:
                 continue
 
             if sys_start in line[1]:
@@ -881,549 +1044,680 @@ class SIMFileReader:
                 continue
 
             if sys_data_started:
-                sys_line_array = [line[0]]
-                for start, end in sys_segments:
-                    try:
-                        sys_line_array.append(line[1][start:end].strip())
-                    except ValueError:
-                        sys_line_array.append("")
-                sys_data.append(sys_line_array)
+                sys_data.append([line[0], *SV_A_SYSTEM_COLUMNS.extract(line[1])])
 
             elif fan_data_started:
-                fan_line_array = [line[0]]
-                for start, end in fan_segments:
-                    try:
-                        fan_line_array.append(line[1][start:end].strip())
-                    except ValueError:
-                        fan_line_array.append("")
-                fan_data.append(fan_line_array)
+                fan_data.append([line[0], *SV_A_FAN_COLUMNS.extract(line[1])])
 
             elif zn_data_started:
-                zn_line_array = [line[0]]
-                for start, end in zn_segments:
-                    try:
-                        zn_line_array.append(line[1][start:end].strip())
-                    except ValueError:
-                        zn_line_array.append("")
-                zn_data.append(zn_line_array)
+                zn_data.append([line[0], *SV_A_ZONE_COLUMNS.extract(line[1])])
 
             elif doas_data_started:
-                doas_line_array = [line[0]]
-                for start, end in doas_segments:
-                    try:
-                        doas_line_array.append(line[1][start:end].strip())
-                    except ValueError:
-                        doas_line_array.append("")
-                doas_data.append(doas_line_array)
+                doas_data.append([line[0], *SV_A_DOAS_COLUMNS.extract(line[1])])
 
         self.sv_a_data = (sys_data, fan_data, zn_data, doas_data)
         return
 
-    def write_excel(self):
-        workbook = xlsxwriter.Workbook(self.wb_name, {'nan_inf_to_errors': True})
-
-        # --- Formats
-        header_format = workbook.add_format({
-            'bold': True,
-            'align': 'center',
-            'valign': 'vcenter',
-            'font_size': 14,
-            'text_wrap': True,
-            'bg_color': '#D9E1F2',
-        })
-        caution_format = workbook.add_format({
-            'font_color': 'red',
-            'bold': True,
-            'text_wrap': True
-        })
-        number_format = workbook.add_format({'num_format': '0.00'})
-        string_format = workbook.add_format({'num_format': '@'})
-        bold_format = workbook.add_format({'bold': True})
-        caution_merge_fmt = workbook.add_format({
-            'bold': True, 'font_color': '#FF0000', 'text_wrap': True,
-            'align': 'left', 'valign': 'vbottom'
-        })
-
-        # === BEPU ===
-        if self.bepu_data:
-            bepu_ws = workbook.add_worksheet("BEPU")
-            for row, data in enumerate(self.bepu_data):
-                if row == 0:
-                    bepu_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    bepu_ws.write_row(row, 0, data)
-            bepu_ws.set_column(0, len(self.bepu_data[0]) - 1, 15)
-
-        # === LS-B ===
-        if self.ls_b_data:
-            ls_b_ws = workbook.add_worksheet('LS-B')
-            numeric_cols = {2, 3, 4, 5, 6}  # columns containing numeric data
-
-            for row_idx, row_data in enumerate(self.ls_b_data):
-                for col_idx, value in enumerate(row_data):
-                    if row_idx == 0:
-                        ls_b_ws.write(row_idx, col_idx, value, header_format)
-                    else:
-                        if col_idx in numeric_cols:
-                            try:
-                                ls_b_ws.write_number(row_idx, col_idx, float(value), number_format)
-                            except ValueError:
-                                ls_b_ws.write(row_idx, col_idx, value, string_format)
-                        else:
-                            ls_b_ws.write_string(row_idx, col_idx, str(value), string_format)
-
-            # Column width tuning for readability
-            ls_b_ws.set_column(0, 0, 30)  # SPACE NAME
-            ls_b_ws.set_column(1, 1, 27)  # LOAD CATEGORY
-            ls_b_ws.set_column(2, 4, 18)  # Cooling/Heating sensible
-            ls_b_ws.set_column(5, 6, 22)  # Intensities
-
-            # Enable autofilter over the entire table (no default filters applied)
-            ls_b_ws.autofilter(0, 0, len(self.ls_b_data) - 1, len(self.ls_b_data[0]) - 1)
-
-        # === LV-B ===
-        if self.lv_b_data:
-            lv_b_ws = workbook.add_worksheet('LV-B')
-            numeric_cols = {2, 4, 5, 6, 7, 9, 10, 11}
-            for row_idx, row_data in enumerate(self.lv_b_data):
-                for col_idx, value in enumerate(row_data):
-                    if row_idx == 0:
-                        lv_b_ws.write(row_idx, col_idx, value, header_format)
-                    else:
-                        if col_idx in numeric_cols:
-                            try:
-                                lv_b_ws.write_number(row_idx, col_idx, float(value), number_format)
-                            except ValueError:
-                                lv_b_ws.write(row_idx, col_idx, value, string_format)
-                        else:
-                            lv_b_ws.write_string(row_idx, col_idx, str(value), string_format)
-            lv_b_ws.set_column(0, 0, 19.94)
-            lv_b_ws.set_column(1, 1, 32.04)
-            lv_b_ws.set_column(2, 5, 13.57)
-            lv_b_ws.set_column(5, 7, 11.39)
-            lv_b_ws.set_column(8, 8, 16.43)
-            lv_b_ws.set_column(9, 11, 11.39)
-
-        # === LV-D ===
-        if self.lv_d_data:
-            lv_d_ws = workbook.add_worksheet('LV-D')
-            for row, data in enumerate(self.lv_d_data[0]):
-                if row == 1:
-                    lv_d_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    lv_d_ws.write_row(row, 0, data)
-            lv_d_ws.set_column(0, 0, 31.14)
-            lv_d_ws.set_column(1, 1, 38.71)
-            lv_d_ws.set_column(2, 8, 12.14)
-            lv_d_ws.merge_range("C1:D1", "Windows", header_format)
-            lv_d_ws.merge_range("E1:F1", "Walls", header_format)
-            lv_d_ws.merge_range("G1:H1", "Walls+Windows", header_format)
-
-        # === PS-C ===
-        if self.ps_c_data:
-            ps_c_ws = workbook.add_worksheet("PS-C")
-            t_column_format = workbook.add_format({
-                'bold': True,
-                'font_size': 14,
-                'text_wrap': True,
-                'bg_color': '#D9E1F2'
-            })
-            caution_format_ps_c = workbook.add_format({'font_color': 'red', 'bold': True, 'text_wrap': False})
-
-            for row, data in enumerate(self.ps_c_data):
-                if row == 0:
-                    ps_c_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ps_c_ws.write_row(row, 0, data)
-            ps_c_ws.set_column(0, 0, 25)
-            ps_c_ws.set_column(1, 1, 10)
-            ps_c_ws.set_column(2, 5, 16)
+    def parse_hourly(self, lines=None):
+        # Lines come as (hourly report name, line); each named report becomes an HourlyBlock, extended in
+        # place by every later run or part of a run (see scan_reports) with its pages
+        if lines is None:
+            lines = self.report_contents[HOURLY_REPORT]
+        data = self.hourly_data or {}
+        for name, block_lines in groupby(lines, key=itemgetter(0)):
+            data[name] = parse_hourly_lines(name, map(itemgetter(1), block_lines), data.get(name))
+        # Pages without data rows (a report with no output) leave no block
+        self.hourly_data = {name: block for name, block in data.items() if block is not None}
+
+    def open_workbook(self, constant_memory=False):
+        import xlsxwriter
+
+        options = {'nan_inf_to_errors': True}
+        if constant_memory:
+            # Each row is flushed to a temp file once the next row is started, so every sheet below is
+            # written strictly top to bottom (merges, formulas and hidden rows included)
+            options['constant_memory'] = True
+        workbook = xlsxwriter.Workbook(self.wb_name, options)
+        workbook.worksheet_class = counting_worksheet_class()
+        # Shared by all sheet writers: formats["header"], formats.get({...})
+        return workbook, FormatRegistry(workbook)
+
+    def write_excel(self, constant_memory=False):
+        with self.stats.phase("write_excel"):
+            workbook, formats = self.open_workbook(constant_memory)
+            for report, write_method in self.writing_methods.items():
+                if getattr(self, self.data_attribute(report)) is not None:
+                    with self.stats.report(report).write.time():
+                        getattr(self, write_method)(workbook, formats)
+
+            if self.ss_a_data is not None and self.ss_h_data is not None:
+                self.write_efficiency(workbook, formats, self.total_rows(self.ss_a_data),
+                                      self.total_rows(self.ss_h_data))
+
+            # In the default mode the sheets' XML is only generated here, so this is most of the write
+            with self.stats.phase("close_workbook"):
+                workbook.close()
+        self.stats.count_cells(workbook)
+        self.stats.formats = len(formats)
+
+    def write_arrow(self, out_dir=None, export_format="parquet", reports=None):
+        # Typed Parquet / Arrow IPC files, one per parsed table; needs pyarrow
+        from sim_to_excel.arrow_export import write_tables
+
+        return write_tables(self, out_dir, export_format, reports)
+
+    def export_tables(self, export_format, out_dir=None, reports=None):
+        # --export: every parsed table and hourly block as Parquet / Arrow IPC (needs pyarrow) or CSV files
+        if export_format == "csv":
+            from sim_to_excel.csv_export import write_tables
+
+            return write_tables(self, out_dir, reports)
+        return self.write_arrow(out_dir, export_format, reports)
+
+    def stream_to_excel(self, export_format=None):
+        with self.stats.phase("stream_to_excel"):
+            self._stream_to_excel(export_format)
+
+    def _stream_to_excel(self, export_format):
+        # Constant-memory conversion: reads the file once, writes each report's sheets as soon as the
+        # report is complete and drops its parsed tables right after. Entity reports interleave within
+        # a section, so a report counts as complete once the scan has moved on to a later section
+        # (LOADS, SYSTEMS, PLANT/BEPU); the sheets therefore follow the file's section order instead of
+        # the write_excel order. Only the TOTAL rows of SS-A and SS-H are kept, for the Efficiency sheet.
+        # With an export_format the same tables are also written as Parquet / Arrow before being dropped.
+        # Hourly report blocks are kept to the end and written just before Efficiency.
+        workbook, formats = self.open_workbook(constant_memory=True)
+        parsed = []
+        written = set()
+        totals = {}
+        try:
+            active_section = None
+            for report, report_lines in self.scan_reports(self.file_lines(), self.reports):
+                if report not in self.parsing_methods:
+                    continue
+                section = self.streamed_section(report, written)
+                if section is not None:
+                    if active_section is not None and section > active_section:
+                        self.write_reports(workbook, formats, parsed, totals, export_format)
+                        written.update(parsed)
+                        parsed = []
+                    active_section = section
+
+                self.run_parser(report, report_lines)
+                if section is not None and report not in parsed:
+                    parsed.append(report)
+
+            self.write_reports(workbook, formats, parsed, totals, export_format)
+            self.finish_streamed_workbook(workbook, formats, totals, export_format)
+        except BaseException:
+            # Closing removes the sheets' temp files; the half-written workbook is not kept
+            workbook.close()
+            os.remove(self.wb_name)
+            raise
+
+    def pipeline_to_excel(self, export_format=None, queue_size=8):
+        with self.stats.phase("pipeline_to_excel"):
+            self._pipeline_to_excel(export_format, queue_size)
+
+    def _pipeline_to_excel(self, export_format, queue_size):
+        # The streaming conversion split over three threads joined by bounded queues: a reader thread
+        # scans the file and queues each report's lines, a parser thread parses them and queues the
+        # reports of each section once the scan has moved past it, and this thread writes their sheets
+        # while later sections are still being read and parsed. The sheets, their order and the peak
+        # memory are those of stream_to_excel; the queues cap how far reading can run ahead of parsing.
+        report_queue = queue.Queue(queue_size)
+        write_queue = queue.Queue(queue_size)
+        stop = threading.Event()
+
+        def put(stage_queue, item):
+            # Gives up once another stage has failed rather than block on a queue nobody drains
+            while not stop.is_set():
+                try:
+                    stage_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(stage_queue):
+            while not stop.is_set():
+                try:
+                    item = stage_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                return item
+            raise PipelineStopped
+
+        def read():
+            try:
+                for report, report_lines in self.scan_reports(self.file_lines(), self.reports):
+                    if report in self.parsing_methods and not put(report_queue, (report, report_lines)):
+                        return
+                put(report_queue, None)
+            except BaseException as error:
+                put(report_queue, error)
+
+        def parse():
+            parsed = []
+            written = set()
+            active_section = None
+            try:
+                while (item := get(report_queue)) is not None:
+                    report, report_lines = item
+                    section = self.streamed_section(report, written)
+                    if section is not None:
+                        if active_section is not None and section > active_section:
+                            put(write_queue, parsed)
+                            written.update(parsed)
+                            parsed = []
+                        active_section = section
+
+                    self.run_parser(report, report_lines)
+                    if section is not None and report not in parsed:
+                        parsed.append(report)
+                put(write_queue, parsed)
+                put(write_queue, None)
+            except PipelineStopped:
+                pass
+            except BaseException as error:
+                put(write_queue, error)
+
+        workbook, formats = self.open_workbook(constant_memory=True)
+        stages = [threading.Thread(target=read, name="sim-read", daemon=True),
+                  threading.Thread(target=parse, name="sim-parse", daemon=True)]
+        totals = {}
+        try:
+            for stage in stages:
+                stage.start()
+            while (reports := get(write_queue)) is not None:
+                self.write_reports(workbook, formats, reports, totals, export_format)
+            self.finish_streamed_workbook(workbook, formats, totals, export_format)
+        except BaseException:
+            stop.set()
+            workbook.close()
+            os.remove(self.wb_name)
+            raise
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+
+    def streamed_section(self, report, written):
+        # The section whose end completes the report; None for the hourly reports, which can follow any
+        # section and are kept until the end of the file
+        if report in written:
+            raise ValueError(f"{report} appears again after its section ended; "
+                             f"convert {self.file_path} without streaming")
+        return report_section(report)
+
+    def write_reports(self, workbook, formats, reports, totals, export_format=None):
+        # Writes the sheets of completed reports in the write_excel order and drops their tables, keeping
+        # the SS-A / SS-H TOTAL rows in `totals` for the Efficiency sheet
+        if export_format is not None:
+            self.export_tables(export_format,
+                             reports=[report for report in self.parsing_methods if report in reports])
+        for report, write_method in self.writing_methods.items():
+            if report not in reports:
+                continue
+            with self.stats.report(report).write.time():
+                getattr(self, write_method)(workbook, formats)
+            if report in ("SS-A", "SS-H"):
+                totals[report] = self.total_rows(getattr(self, self.data_attribute(report)))
+        for report in reports:
+            setattr(self, self.data_attribute(report), None)
+
+    def finish_streamed_workbook(self, workbook, formats, totals, export_format=None):
+        # Hourly blocks belong to no section (see streamed_section) and are only complete at the end
+        if self.hourly_data:
+            self.write_reports(workbook, formats, [HOURLY_REPORT], totals, export_format)
+        if "SS-A" in totals and "SS-H" in totals:
+            self.write_efficiency(workbook, formats, totals["SS-A"], totals["SS-H"])
+        with self.stats.phase("close_workbook"):
+            workbook.close()
+        self.stats.count_cells(workbook)
+        self.stats.formats = len(formats)
 
-            ps_c_ws.autofilter(0, 0, len(self.ps_c_data) - 1, len(self.ps_c_data[0]) - 1)
+    @staticmethod
+    def total_rows(table):
+        # The rows left visible on the SS-A / SS-H sheets
+        return list(compress(table.rows(), table.rows_containing('TOTAL')))
+
+    def write_summary_rows(self, worksheet, table, first_row, marker, write_extra=None):
+        # Writes the rows of a table whose sheet is read by its summary rows (those containing `marker`)
+        # from first_row down and returns the row after the last one. The "hidden" layout writes every
+        # row and hides the others; the "summary" layout writes just the summary rows, as one block.
+        # write_extra(worksheet, row) adds the per-row formulas.
+        marked = table.rows_containing(marker)
+        if self.layout == "summary":
+            return write_table(worksheet, table, first_row, select=marked, write_extra=write_extra)
+        return write_table(worksheet, table, first_row, hidden=bytes(map(not_, marked)), write_extra=write_extra)
+
+    def write_detail_sheet(self, workbook, formats, name, table, marker, write_extra=None, header_cells=()):
+        # "summary" layout: the rows without `marker` (the monthly rows), none hidden, on a "<name> Monthly"
+        # sheet. header_cells are (column, value, format) written next to the header.
+        detail_ws = workbook.add_worksheet(f"{name} Monthly")
+        detail_ws.write_row(0, 0, table.header, formats["header"])
+        for column, value, cell_format in header_cells:
+            detail_ws.write(0, column, value, cell_format)
+        end_row = write_table(detail_ws, table, 1, select=bytes(map(not_, table.rows_containing(marker))),
+                              write_extra=write_extra)
+        detail_ws.autofilter(0, 0, end_row - 1, len(table.header) - 1)
+        detail_ws.freeze_panes(1, 0)
+        return detail_ws
+
+    # Report -> sheet writer, in the order the sheets appear in the workbook
+    writing_methods = {
+        "BEPU": "write_bepu",
+        "LS-B": "write_ls_b",
+        "LV-B": "write_lv_b",
+        "LV-D": "write_lv_d",
+        "PS-C": "write_ps_c",
+        "PS-E": "write_ps_e",
+        "PS-F": "write_ps_f",
+        "PS-H": "write_ps_h",
+        "PV-A": "write_pv_a",
+        "SS-A": "write_ss_a",
+        "SS-F": "write_ss_f",
+        "SS-G": "write_ss_g",
+        "SS-H": "write_ss_h",
+        "SS-L": "write_ss_l",
+        "SS-R": "write_ss_r",
+        "SV-A": "write_sv_a",
+        HOURLY_REPORT: "write_hourly",
+    }
+
+    # Sheets that are a parsed table as is, by table name (see table_names)
+    sheet_specs = {
+        "BEPU": SheetSpec("BEPU", widths=[(0, 14, 15)]),
+        # LS-B and LV-B keep NaN / inf (shown as #NUM!) and format every cell
+        "LS-B": SheetSpec("LS-B", blank="", number_format="number", text_format="string",
+                          widths=[(0, 0, 30), (1, 1, 27), (2, 4, 18), (5, 6, 22)], autofilter=True),
+        "LV-B": SheetSpec("LV-B", blank="", number_format="number", text_format="string",
+                          widths=[(0, 0, 19.94), (1, 1, 32.04), (2, 5, 13.57), (5, 7, 11.39), (8, 8, 16.43),
+                                  (9, 11, 11.39)]),
+        "PS-E": SheetSpec("PS-E", widths=[(0, 0, 18), (1, 1, 8), (2, 2, 14), (3, 15, 13)], autofilter=True,
+                          freeze_header=True),
+        "PS-E Peaks": SheetSpec("PS-E Peaks", widths=[(0, 0, 18), (1, 1, 8), (2, 2, 14), (3, 3, 22), (4, 5, 11)],
+                                autofilter=True, freeze_header=True),
+        "PS-F": SheetSpec("PS-F", widths=[(0, 0, 27.86), (1, 1, 8), (2, 2, 14), (3, 15, 13)], autofilter=True,
+                          freeze_header=True),
+        "PS-F Peaks": SheetSpec("PS-F Peaks", widths=[(0, 0, 27.86), (1, 1, 8), (2, 2, 14), (3, 3, 22), (4, 5, 11)],
+                                autofilter=True, freeze_header=True),
+        "PS-H": SheetSpec("PS-H", widths=[(0, 0, 27.86), (1, 1, 8), (2, 2, 20), (3, 3, 30), (4, 4, 12), (5, 5, 14),
+                                          (6, 7, 11)],
+                          autofilter=True, freeze_header=True),
+        "PV-A Loops": SheetSpec("PV-A Loops", widths=[(0, 0, 27.86), (1, 10, 13.57)]),
+        "PV-A Pumps": SheetSpec("PV-A Pumps", widths=[(0, 0, 27.86), (1, 1, 10), (2, 2, 24.29), (3, 4, 15),
+                                                      (5, 10, 13.57)]),
+        "PV-A Equip.": SheetSpec("PV-A Equip.", widths=[(0, 3, 27.86), (3, 5, 13.57)]),
+        "SS-G": SheetSpec("SS-G"),
+        "SS-R": SheetSpec("SS-R", blank="", widths=[(0, 0, 27.86), (1, 1, 38.57), (2, 5, 14.57), (17, 17, 15.14)]),
+        "SV-A Fans": SheetSpec("SV-A Fans", widths=[(0, 0, 31.14), (1, 2, 13.57), (3, 3, 12.86), (4, 8, 11.43),
+                                                    (9, 9, 12.86), (10, 11, 11.43)]),
+        "SV-A Zones": SheetSpec("SV-A Zones", widths=[(0, 0, 31.14), (1, 1, 26.43), (2, 2, 13.57), (3, 3, 12.86),
+                                                      (4, 11, 11.43)]),
+        "SV-A DOAS": SheetSpec("SV-A DOAS"),
+    }
+
+    def write_bepu(self, workbook, formats):
+        self.sheet_specs["BEPU"].write(workbook, formats, self.bepu_data)
+
+    def write_ls_b(self, workbook, formats):
+        self.sheet_specs["LS-B"].write(workbook, formats, self.ls_b_data)
+
+    def write_lv_b(self, workbook, formats):
+        self.sheet_specs["LV-B"].write(workbook, formats, self.lv_b_data)
+
+    def write_lv_d(self, workbook, formats):
+        header_format = formats["header"]
+        lv_d_ws = workbook.add_worksheet('LV-D')
+        lv_d_ws.merge_range("C1:D1", "Windows", header_format)
+        lv_d_ws.merge_range("E1:F1", "Walls", header_format)
+        lv_d_ws.merge_range("G1:H1", "Walls+Windows", header_format)
+        lv_d_ws.write_row(1, 0, self.lv_d_data[0].header, header_format)
+        write_table(lv_d_ws, self.lv_d_data[0], 2)
+        lv_d_ws.set_column(0, 0, 31.14)
+        lv_d_ws.set_column(1, 1, 38.71)
+        lv_d_ws.set_column(2, 8, 12.14)
+
+    def write_ps_c(self, workbook, formats):
+        ps_c_ws = workbook.add_worksheet("PS-C")
+        t_column_format = formats["column_heading"]
+        caution_format_ps_c = formats["caution_nowrap"]
+
+        ps_c_ws.write_row(0, 0, self.ps_c_data.header, formats["header"])
+        ps_c_ws.write('T1', 'Heating Efficiency', t_column_format)
+        caution_text = ("⚠️ If a piece of equipment provides both heating and cooling, "
+                        "the calculated heating efficiency will not be accurate.")
+        ps_c_ws.write('U1', caution_text, caution_format_ps_c)
+
+        def write_heating_efficiency(worksheet, row_idx):
+            excel_row = row_idx + 1
+            formula = f'=IFERROR(ABS(D{excel_row}/((E{excel_row}*3.412)/1000)),"")'
+            worksheet.write_formula(row_idx, 19, formula)  # T column
+
+        # Rows containing 'SUM' are the ones left visible
+        end_row = self.write_summary_rows(ps_c_ws, self.ps_c_data, 1, 'SUM', write_heating_efficiency)
+        sheets = [ps_c_ws]
+        if self.layout == "summary":
+            sheets.append(self.write_detail_sheet(workbook, formats, "PS-C", self.ps_c_data, 'SUM', write_heating_efficiency,
+                                                  [(19, 'Heating Efficiency', t_column_format)]))
+        for worksheet in sheets:
+            worksheet.set_column(0, 0, 25)
+            worksheet.set_column(1, 1, 10)
+            worksheet.set_column(2, 5, 16)
+            worksheet.set_column('G:S', None, None, {'hidden': True})  # Hide G:S
+
+        ps_c_ws.autofilter(0, 0, end_row - 1, len(self.ps_c_data.header) - 1)
+        if self.layout == "hidden":
             ps_c_ws.filter_column(1, 'Type == SUM')  # keep your filter UI
-            ps_c_ws.set_column('G:S', None, None, {'hidden': True})  # Hide G:S
-
-            for row_idx in range(1, len(self.ps_c_data)):
-                excel_row = row_idx + 1
-                formula = f'=IFERROR(ABS(D{excel_row}/((E{excel_row}*3.412)/1000)),"")'
-                ps_c_ws.write_formula(row_idx, 19, formula)  # T column
-            ps_c_ws.write('T1', 'Heating Efficiency', t_column_format)
-            caution_text = ("⚠️ If a piece of equipment provides both heating and cooling, "
-                            "the calculated heating efficiency will not be accurate.")
-            ps_c_ws.write('U1', caution_text, caution_format_ps_c)
-
-            # Hide rows not containing 'SUM'
-            # Header row is 0; start hiding from Excel row 2 (0-based row 1)
-            for r in range(1, len(self.ps_c_data)):
-                row_vals = self.ps_c_data[r]
-                if not any(isinstance(v, str) and 'SUM' in v for v in row_vals):
-                    ps_c_ws.set_row(r, options={'hidden': True})
-
-        # === PV-A ===
-        if self.pv_a_data:
-            pv_a0_ws = workbook.add_worksheet('PV-A Loops')
-            for row, data in enumerate(self.pv_a_data[0]):
-                if row == 0:
-                    pv_a0_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    pv_a0_ws.write_row(row, 0, data)
-            pv_a0_ws.set_column(0, 0, 27.86)
-            pv_a0_ws.set_column(1, 10, 13.57)
-
-            pv_a1_ws = workbook.add_worksheet('PV-A Pumps')
-            for row, data in enumerate(self.pv_a_data[1]):
-                if row == 0:
-                    pv_a1_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    pv_a1_ws.write_row(row, 0, data)
-            pv_a1_ws.set_column(0, 0, 27.86)
-            pv_a1_ws.set_column(1, 1, 10)
-            pv_a1_ws.set_column(2, 2, 24.29)
-            pv_a1_ws.set_column(3, 4, 15)
-            pv_a1_ws.set_column(5, 10, 13.57)
-
-            pv_a2_ws = workbook.add_worksheet('PV-A Equip.')
-            for row, data in enumerate(self.pv_a_data[2]):
-                if row == 0:
-                    pv_a2_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    pv_a2_ws.write_row(row, 0, data)
-            pv_a2_ws.set_column(0, 3, 27.86)
-            pv_a2_ws.set_column(3, 5, 13.57)
 
-        # === SS-A ===
-        if self.ss_a_data:
-            ss_a_ws = workbook.add_worksheet('SS-A')
-            calcs_heading_format = workbook.add_format({'bold': True, 'text_wrap': True})
+    def write_ps_e(self, workbook, formats):
+        for name, table in zip(self.table_names["PS-E"], self.ps_e_data):
+            self.sheet_specs[name].write(workbook, formats, table)
+
+    def write_ps_f(self, workbook, formats):
+        for name, table in zip(self.table_names["PS-F"], self.ps_f_data):
+            self.sheet_specs[name].write(workbook, formats, table)
+
+    def write_ps_h(self, workbook, formats):
+        self.sheet_specs["PS-H"].write(workbook, formats, self.ps_h_data)
 
-            # Cautions
+    def write_pv_a(self, workbook, formats):
+        for name, table in zip(self.table_names["PV-A"], self.pv_a_data):
+            self.sheet_specs[name].write(workbook, formats, table)
+
+    def write_ss_a(self, workbook, formats):
+        ss_a_ws = workbook.add_worksheet('SS-A')
+        caution_format = formats["caution"]
+        bold_format = formats["bold"]
+        calcs_heading_format = formats["heading"]
+
+        # Cautions
+        if self.layout == "hidden":
             ss_a_ws.write('A1', "⚠️ Load and Efficiency will not be Accurate unless the 'TOTAL' Filter is Applied.", caution_format)
-            ss_a_ws.write('B1', "⚠️ QC that cells D2 and J2 align with the BEPU tab and that the BEPU tab is not missing data.", caution_format)
-
-            # Headings
-            ss_a_ws.write('C1', "Total Cooling Load, MMBtu", calcs_heading_format)
-            ss_a_ws.write('D1', "Cooling Consumption from BEPU tab, MMBtu", calcs_heading_format)
-            ss_a_ws.write('E1', "Whole Building Annualized Cooling Efficiency, COP", calcs_heading_format)
-            ss_a_ws.write('I1', "Total Heating Load, MMBtu", calcs_heading_format)
-            ss_a_ws.write('J1', "Heating Consumption from BEPU tab, MMBtu", calcs_heading_format)
-            ss_a_ws.write('K1', "Whole Building Annualized Heating Efficiency, COP", calcs_heading_format)
-
-            # Data (shift down 2 rows like before)
-            for row, data in enumerate(self.ss_a_data):
-                excel_row = row + 2
-                if row == 0:
-                    ss_a_ws.write_row(excel_row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ss_a_ws.write_row(excel_row, 0, data)
-            ss_a_ws.set_column(0, 1, 18.71)
-            ss_a_ws.set_column(2, 3, 9.29)
-            ss_a_ws.set_column(4, 5, 11.00)
-            ss_a_ws.set_column(6, 6, 12.14)
-            ss_a_ws.set_column(7, 7, 18.71)
-            ss_a_ws.set_column(8, 9, 9.29)
-            ss_a_ws.set_column(10, 11, 11.00)
-            ss_a_ws.set_column(12, 12, 12.14)
-            ss_a_ws.set_column(13, 14, 11.57)
-
-            header_row = 2  # Excel row 3
-            ss_a_ws.autofilter(header_row, 0, len(self.ss_a_data) - 1, len(self.ss_a_data[0]) - 1)
+        else:
+            ss_a_ws.write('A1', "Monthly rows are on the 'SS-A Monthly' sheet.", caution_format)
+        ss_a_ws.write('B1', "⚠️ QC that cells D2 and J2 align with the BEPU tab and that the BEPU tab is not missing data.", caution_format)
+
+        # Headings
+        ss_a_ws.write('C1', "Total Cooling Load, MMBtu", calcs_heading_format)
+        ss_a_ws.write('D1', "Cooling Consumption from BEPU tab, MMBtu", calcs_heading_format)
+        ss_a_ws.write('E1', "Whole Building Annualized Cooling Efficiency, COP", calcs_heading_format)
+        ss_a_ws.write('I1', "Total Heating Load, MMBtu", calcs_heading_format)
+        ss_a_ws.write('J1', "Heating Consumption from BEPU tab, MMBtu", calcs_heading_format)
+        ss_a_ws.write('K1', "Whole Building Annualized Heating Efficiency, COP", calcs_heading_format)
+
+        # Totals / COP formulas on row 2
+        start_row = 4
+        end_row = len(self.ss_a_data) + 3
+        ss_a_ws.write_formula('C2', f'=SUBTOTAL(9,C{start_row}:C{end_row})', bold_format)
+        ss_a_ws.write_formula('D2', '=(BEPU!G2*3.412)/1000', bold_format)
+        ss_a_ws.write_formula('E2', '=ABS(C2)/D2', bold_format)
+        ss_a_ws.write_formula('I2', f'=SUBTOTAL(9,I{start_row}:I{end_row})', bold_format)
+        ss_a_ws.write_formula('J2', '=(BEPU!F2+BEPU!L2)*3.412*(1/1000)', bold_format)
+        ss_a_ws.write_formula('K2', '=ABS(I2)/J2', bold_format)
+
+        # Data (shift down 2 rows like before); rows containing 'TOTAL' are the ones left visible
+        ss_a_ws.write_row(2, 0, self.ss_a_data.header, formats["header"])
+        end_row = self.write_summary_rows(ss_a_ws, self.ss_a_data, 3, 'TOTAL')
+        sheets = [ss_a_ws]
+        if self.layout == "summary":
+            sheets.append(self.write_detail_sheet(workbook, formats, "SS-A", self.ss_a_data, 'TOTAL'))
+        for worksheet in sheets:
+            worksheet.set_column(0, 1, 18.71)
+            worksheet.set_column(2, 3, 9.29)
+            worksheet.set_column(4, 5, 11.00)
+            worksheet.set_column(6, 6, 12.14)
+            worksheet.set_column(7, 7, 18.71)
+            worksheet.set_column(8, 9, 9.29)
+            worksheet.set_column(10, 11, 11.00)
+            worksheet.set_column(12, 12, 12.14)
+            worksheet.set_column(13, 14, 11.57)
+
+        header_row = 2  # Excel row 3
+        ss_a_ws.autofilter(header_row, 0, end_row - 1, len(self.ss_a_data.header) - 1)
+        if self.layout == "hidden":
             # Filter UI (label says Type in your original; value is in the "Month" column which can be TOTAL)
             ss_a_ws.filter_column(1, 'Type == TOTAL')
 
-            # Totals / COP formulas on row 2
-            start_row = 4
-            end_row = len(self.ss_a_data) + 2
-            ss_a_ws.write_formula('C2', f'=SUBTOTAL(9,C{start_row}:C{end_row})', bold_format)
-            ss_a_ws.write_formula('D2', '=(BEPU!G2*3.412)/1000', bold_format)
-            ss_a_ws.write_formula('E2', '=ABS(C2)/D2', bold_format)
-            ss_a_ws.write_formula('I2', f'=SUBTOTAL(9,I{start_row}:I{end_row})', bold_format)
-            ss_a_ws.write_formula('J2', '=(BEPU!F2+BEPU!L2)*3.412*(1/1000)', bold_format)
-            ss_a_ws.write_formula('K2', '=ABS(I2)/J2', bold_format)
-
-            # Hide all rows not containing 'TOTAL' (from Excel row 4 down)
-            for r in range(3, len(self.ss_a_data) + 2):
-                # map to data index: r-2
-                row_vals = self.ss_a_data[r - 2]
-                if not any(isinstance(v, str) and 'TOTAL' in v for v in row_vals):
-                    ss_a_ws.set_row(r, options={'hidden': True})
-
-        # === SS-F ===
-        if self.ss_f_data:
-            ss_f_ws = workbook.add_worksheet('SS-F')
-            for row, data in enumerate(self.ss_f_data):
-                if row == 0:
-                    # Add a "System" column header at K1
-                    hdr = data + ["System"]
-                    ss_f_ws.write_row(row, 0, hdr, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ss_f_ws.write_row(row, 0, data)
-            ss_f_ws.set_column(0, 1, 26)
-            ss_f_ws.set_column(2, len(self.ss_f_data[0]) - 1, 14)
-
-            # Caution (L1)
-            ss_f_ws.set_column(11, 11, 40)
-            total_bbrd_text = "Use Column E to Verify Baseboard is Actually being Modeled where Expected"
-            ss_f_ws.write('L1', total_bbrd_text, caution_format)
-
-            # Populate "System" formulas in column K (index 10), matching zone names to SS-R col B
-            if self.ss_r_data:
-                last_row_r = len(self.ss_r_data)  # includes header
-                rng_a = f"'SS-R'!$A$2:$A${last_row_r}"
-                rng_b = f"'SS-R'!$B$2:$B${last_row_r}"
-                for r in range(1, len(self.ss_f_data)):
-                    excel_row = r + 1
-                    formula = f'=INDEX({rng_a},MATCH(A{excel_row},{rng_b},0),1)'
-                    ss_f_ws.write_formula(r, 10, formula)  # K column
-
-        # === SS-G ===
-        if self.ss_g_data:
-            ss_g_ws = workbook.add_worksheet('SS-G')
-            for row, data in enumerate(self.ss_g_data):
-                if row == 0:
-                    ss_g_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ss_g_ws.write_row(row, 0, data)
-
-        # === SS-H ===
-        if self.ss_h_data:
-            ss_h_ws = workbook.add_worksheet('SS-H')
-            for row, data in enumerate(self.ss_h_data):
-                if row == 0:
-                    ss_h_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ss_h_ws.write_row(row, 0, data)
-            ss_h_ws.set_column(0, 1, 20)
-            ss_h_ws.set_column(2, len(self.ss_h_data[0]) - 1, 14)
-
-            ss_h_ws.autofilter(0, 0, len(self.ss_h_data) - 1, len(self.ss_h_data[0]) - 1)
+    def write_ss_f(self, workbook, formats):
+        ss_f_ws = workbook.add_worksheet('SS-F')
+        # Add a "System" column header at K1
+        ss_f_ws.write_row(0, 0, self.ss_f_data.header + ["System"], formats["header"])
+
+        # Caution (L1)
+        total_bbrd_text = "Use Column E to Verify Baseboard is Actually being Modeled where Expected"
+        ss_f_ws.write('L1', total_bbrd_text, formats["caution"])
+
+        # "System" formulas in column K (index 10), matching zone names to SS-R col B
+        write_system = None
+        if self.ss_r_data is not None:
+            last_row_r = len(self.ss_r_data) + 1  # includes header
+            rng_a = f"'SS-R'!$A$2:$A${last_row_r}"
+            rng_b = f"'SS-R'!$B$2:$B${last_row_r}"
+            system_formula = f'=INDEX({rng_a},MATCH(A{{excel_row}},{rng_b},0),1)'
+
+            def write_system(worksheet, r):
+                worksheet.write_formula(r, 10, system_formula.format(excel_row=r + 1))  # K column
+
+        write_table(ss_f_ws, self.ss_f_data, 1, write_extra=write_system)
+        ss_f_ws.set_column(0, 1, 26)
+        ss_f_ws.set_column(2, len(self.ss_f_data.header) - 1, 14)
+        ss_f_ws.set_column(11, 11, 40)
+
+    def write_ss_g(self, workbook, formats):
+        self.sheet_specs["SS-G"].write(workbook, formats, self.ss_g_data)
+
+    def write_ss_h(self, workbook, formats):
+        ss_h_ws = workbook.add_worksheet('SS-H')
+        ss_h_ws.write_row(0, 0, self.ss_h_data.header, formats["header"])
+        # Rows containing 'TOTAL' are the ones left visible
+        end_row = self.write_summary_rows(ss_h_ws, self.ss_h_data, 1, 'TOTAL')
+        sheets = [ss_h_ws]
+        if self.layout == "summary":
+            sheets.append(self.write_detail_sheet(workbook, formats, "SS-H", self.ss_h_data, 'TOTAL'))
+        for worksheet in sheets:
+            worksheet.set_column(0, 1, 20)
+            worksheet.set_column(2, len(self.ss_h_data.header) - 1, 14)
+            worksheet.set_column(12, 12, 40)
+
+        ss_h_ws.autofilter(0, 0, end_row - 1, len(self.ss_h_data.header) - 1)
+        if self.layout == "hidden":
             ss_h_ws.filter_column(1, 'Type == TOTAL')  # Month column where 'TOTAL' appears
-            ss_h_ws.set_column(12, 12, 40)
-
-            # Hide rows not containing 'TOTAL' (from Excel row 2 down)
-            for r in range(1, len(self.ss_h_data)):
-                row_vals = self.ss_h_data[r]
-                if not any(isinstance(v, str) and 'TOTAL' in v for v in row_vals):
-                    ss_h_ws.set_row(r, options={'hidden': True})
-
-        # === SS-L ===
-        if self.ss_l_data:
-            ss_l_ws = workbook.add_worksheet('SS-L')
-            for row, data in enumerate(self.ss_l_data):
-                if row == 0:
-                    ss_l_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    ss_l_ws.write_row(row, 0, data)
-            ss_l_ws.set_column(0, 1, 20)
-            ss_l_ws.set_column(2, len(self.ss_l_data[0]) - 1, 14)
 
-            ss_l_ws.set_column('G:Q', None, None, {'hidden': True})
-            ss_l_ws.autofilter(0, 0, len(self.ss_l_data) - 1, len(self.ss_l_data[0]) - 1)
+    def write_ss_l(self, workbook, formats):
+        ss_l_ws = workbook.add_worksheet('SS-L')
+        ss_l_ws.write_row(0, 0, self.ss_l_data.header, formats["header"])
+        # Rows containing 'ANNUAL' are the ones left visible
+        end_row = self.write_summary_rows(ss_l_ws, self.ss_l_data, 1, 'ANNUAL')
+        sheets = [ss_l_ws]
+        if self.layout == "summary":
+            sheets.append(self.write_detail_sheet(workbook, formats, "SS-L", self.ss_l_data, 'ANNUAL'))
+        for worksheet in sheets:
+            worksheet.set_column(0, 1, 20)
+            worksheet.set_column(2, len(self.ss_l_data.header) - 1, 14)
+            worksheet.set_column('G:Q', None, None, {'hidden': True})
+            worksheet.set_column(20, 20, 40)
+
+        ss_l_ws.autofilter(0, 0, end_row - 1, len(self.ss_l_data.header) - 1)
+        if self.layout == "hidden":
             ss_l_ws.filter_column(1, 'Type == ANNUAL')
-            ss_l_ws.set_column(20, 20, 40)
-
-            # Hide rows not containing 'ANNUAL' (from Excel row 2 down)
-            for r in range(1, len(self.ss_l_data)):
-                row_vals = self.ss_l_data[r]
-                if not any(isinstance(v, str) and 'ANNUAL' in v for v in row_vals):
-                    ss_l_ws.set_row(r, options={'hidden': True})
-
-        # === SS-R ===
-        if self.ss_r_data:
-            ss_r_ws = workbook.add_worksheet('SS-R')
-            for row, data in enumerate(self.ss_r_data):
-                if row == 0:
-                    ss_r_ws.write_row(row, 0, data, header_format)
-                else:
-                    ss_r_ws.write_row(row, 0, data)
-            ss_r_ws.set_column(0, 0, 27.86)
-            ss_r_ws.set_column(1, 1, 38.57)
-            ss_r_ws.set_column(2, 5, 14.57)
-            ss_r_ws.set_column(17, 17, 15.14)
 
-        # === SV-A ===
-        if self.sv_a_data:
-            # Systems
-            sv_sys_ws = workbook.add_worksheet('SV-A Systems')
-            for row, data in enumerate(self.sv_a_data[0]):
-                if row == 0:
-                    # Add extra headers M..P
-                    hdr = data + ["Supply CFM", "OA CFM", "Supply CFM/sf", "OA CFM/sf"]
-                    sv_sys_ws.write_row(row, 0, hdr, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    sv_sys_ws.write_row(row, 0, data)
-            sv_sys_ws.set_column(0, 0, 31.14)
-            sv_sys_ws.set_column(1, 2, 13.57)
-            sv_sys_ws.set_column(3, 3, 12.86)
-            sv_sys_ws.set_column(4, 12, 11.43)
-
-            # Fans
-            sv_fan_ws = workbook.add_worksheet('SV-A Fans')
-            for row, data in enumerate(self.sv_a_data[1]):
-                if row == 0:
-                    sv_fan_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    sv_fan_ws.write_row(row, 0, data)
-            sv_fan_ws.set_column(0, 0, 31.14)
-            sv_fan_ws.set_column(1, 2, 13.57)
-            sv_fan_ws.set_column(3, 3, 12.86)
-            sv_fan_ws.set_column(4, 8, 11.43)
-            sv_fan_ws.set_column(9, 9, 12.86)
-            sv_fan_ws.set_column(10, 11, 11.43)
-
-            # Zones
-            sv_zn_ws = workbook.add_worksheet('SV-A Zones')
-            for row, data in enumerate(self.sv_a_data[2]):
-                if row == 0:
-                    sv_zn_ws.write_row(row, 0, data, header_format)
-                else:
-                    data = try_convert_element_to_float(data)
-                    sv_zn_ws.write_row(row, 0, data)
-            sv_zn_ws.set_column(0, 0, 31.14)
-            sv_zn_ws.set_column(1, 1, 26.43)
-            sv_zn_ws.set_column(2, 2, 13.57)
-            sv_zn_ws.set_column(3, 3, 12.86)
-            sv_zn_ws.set_column(4, 11, 11.43)
-
-            # DOAS (optional)
-            if len(self.sv_a_data[3]) > 1:
-                sv_doas_ws = workbook.add_worksheet('SV-A DOAS')
-                for row, data in enumerate(self.sv_a_data[3]):
-                    if row == 0:
-                        sv_doas_ws.write_row(row, 0, data, header_format)
-                    else:
-                        data = try_convert_element_to_float(data)
-                        sv_doas_ws.write_row(row, 0, data)
-
-            # Add Systems formulas referencing Fans (M..P)
-            last_fans_row = len(self.sv_a_data[1])  # includes header
-            fans_a = f"'SV-A Fans'!$A$2:$A${last_fans_row}"
-            fans_b = f"'SV-A Fans'!$B$2:$B${last_fans_row}"
-            fans_c = f"'SV-A Fans'!$C$2:$C${last_fans_row}"
-            for r in range(1, len(self.sv_a_data[0])):
-                excel_row = r + 1
-                # M (index 12): Supply CFM lookup where Fans.Type == "SUPPLY"
-                sup_formula = (f'=INDEX({fans_c}, '
-                               f'MATCH(1, INDEX(({fans_a}=A{excel_row})*({fans_b}="SUPPLY"), 0), 0))')
-                sv_sys_ws.write_formula(r, 12, sup_formula, number_format)
-                # N (index 13): OA CFM = F * M  (F is OA Ratio, M is Supply CFM)
-                sv_sys_ws.write_formula(r, 13, f'=F{excel_row} * M{excel_row}', number_format)
-                # O (index 14): Supply CFM/sf = M / D  (D is Floor Area)
-                sv_sys_ws.write_formula(r, 14, f'=M{excel_row} / D{excel_row}', workbook.add_format({'num_format': '0.0#'}))
-                # P (index 15): OA CFM/sf = N / D
-                sv_sys_ws.write_formula(r, 15, f'=N{excel_row} / D{excel_row}', workbook.add_format({'num_format': '0.0#'}))
-
-        # === Efficiency sheet (replicates openpyxl logic using visible TOTAL rows) ===
-        if self.ss_a_data and self.ss_h_data:
-            eff_ws = workbook.add_worksheet('Efficiency')
-            # Header
-            headers = [
-                'System', 'N/A', 'Cooling Load MMBtu', 'Heating Load MMBtu',
-                'Electric Heat Energy (kWh)', 'Electric Cool Energy (kWh)',
-                'Heat Eff', 'Cool Eff'
-            ]
-            eff_ws.write_row(0, 0, headers, header_format)
-
-            # Visible rows = those with 'TOTAL' in SS-A (like post-hide), SS-A data starts at row index 1
-            ss_a_visible = [row for row in self.ss_a_data[1:] if any(isinstance(v, str) and 'TOTAL' in v for v in row)]
-            ss_h_visible = [row for row in self.ss_h_data[1:] if any(isinstance(v, str) and 'TOTAL' in v for v in row)]
-
-            max_rows = min(len(ss_a_visible), len(ss_h_visible))
-            for i in range(max_rows):
-                a = ss_a_visible[i]
-                h = ss_h_visible[i]
-                # a[0] System, a[2] Cooling Energy (MBTU), a[8] Heating Energy (MBTU)
-                system = a[0]
-                cool_load = a[2]
-                heat_load = a[8]
-                elec_heat_kwh = h[8]   # Electric Heat Energy (kWh)
-                elec_cool_kwh = h[10]  # Electric Cool Energy (kWh)
-
-                row_idx = i + 1
-                eff_ws.write(row_idx, 0, system)
-                eff_ws.write(row_idx, 1, "N/A")
-                eff_ws.write(row_idx, 2, try_num(cool_load), number_format if is_num(cool_load) else None)
-                eff_ws.write(row_idx, 3, try_num(heat_load), number_format if is_num(heat_load) else None)
-                eff_ws.write(row_idx, 4, try_num(elec_heat_kwh), number_format if is_num(elec_heat_kwh) else None)
-                eff_ws.write(row_idx, 5, try_num(elec_cool_kwh), number_format if is_num(elec_cool_kwh) else None)
-
-                # Formulas
-                r = row_idx + 1  # Excel 1-based
-                eff_ws.write_formula(row_idx, 6, f'=IFERROR(ABS(D{r}/((E{r}*3.412)/1000)),"")', number_format)
-                eff_ws.write_formula(row_idx, 7, f'=IFERROR(C{r}/((F{r}*3.412)/1000),"")', number_format)
-
-            # Caution note (merged I1:P1)
-            eff_ws.merge_range('I1:P1',
-                               "⚠️ This does not account for energy consumption associated with chiller or boiler plants "
-                               "(or any other water-side equipment). Therefore, exercise caution when interpreting the "
-                               "efficiency values as they may not be accurate.",
-                               caution_merge_fmt)
-
-        workbook.close()
-
-
-def try_convert_element_to_float(item):
-    if not isinstance(item, (list, tuple)):
-        li = [item]
+    def write_ss_r(self, workbook, formats):
+        self.sheet_specs["SS-R"].write(workbook, formats, self.ss_r_data)
+
+    def write_sv_a(self, workbook, formats):
+        header_format = formats["header"]
+        number_format = formats["number"]
+        ratio_format = formats["ratio"]
+
+        # Systems, with formulas referencing Fans (M..P)
+        sv_sys_ws = workbook.add_worksheet('SV-A Systems')
+        # Add extra headers M..P
+        sv_sys_ws.write_row(0, 0, self.sv_a_data[0].header + ["Supply CFM", "OA CFM", "Supply CFM/sf", "OA CFM/sf"],
+                            header_format)
+        last_fans_row = len(self.sv_a_data[1]) + 1  # includes header
+        fans_a = f"'SV-A Fans'!$A$2:$A${last_fans_row}"
+        fans_b = f"'SV-A Fans'!$B$2:$B${last_fans_row}"
+        fans_c = f"'SV-A Fans'!$C$2:$C${last_fans_row}"
+
+        def write_airflows(worksheet, r):
+            excel_row = r + 1
+            # M (index 12): Supply CFM lookup where Fans.Type == "SUPPLY"
+            sup_formula = (f'=INDEX({fans_c}, '
+                           f'MATCH(1, INDEX(({fans_a}=A{excel_row})*({fans_b}="SUPPLY"), 0), 0))')
+            worksheet.write_formula(r, 12, sup_formula, number_format)
+            # N (index 13): OA CFM = F * M  (F is OA Ratio, M is Supply CFM)
+            worksheet.write_formula(r, 13, f'=F{excel_row} * M{excel_row}', number_format)
+            # O (index 14): Supply CFM/sf = M / D  (D is Floor Area)
+            worksheet.write_formula(r, 14, f'=M{excel_row} / D{excel_row}', ratio_format)
+            # P (index 15): OA CFM/sf = N / D
+            worksheet.write_formula(r, 15, f'=N{excel_row} / D{excel_row}', ratio_format)
+
+        write_table(sv_sys_ws, self.sv_a_data[0], 1, write_extra=write_airflows)
+        sv_sys_ws.set_column(0, 0, 31.14)
+        sv_sys_ws.set_column(1, 2, 13.57)
+        sv_sys_ws.set_column(3, 3, 12.86)
+        sv_sys_ws.set_column(4, 12, 11.43)
+
+        self.sheet_specs["SV-A Fans"].write(workbook, formats, self.sv_a_data[1])
+        self.sheet_specs["SV-A Zones"].write(workbook, formats, self.sv_a_data[2])
+        if len(self.sv_a_data[3]):
+            self.sheet_specs["SV-A DOAS"].write(workbook, formats, self.sv_a_data[3])
+
+    def write_hourly(self, workbook, formats):
+        for block in self.hourly_data.values():
+            write_hourly_sheets(workbook, formats, block)
+
+    def write_efficiency(self, workbook, formats, ss_a_visible, ss_h_visible):
+        # Replicates the openpyxl logic using the visible TOTAL rows of SS-A and SS-H
+        number_format = formats["number"]
+        eff_ws = workbook.add_worksheet('Efficiency')
+        # Header
+        headers = [
+            'System', 'N/A', 'Cooling Load MMBtu', 'Heating Load MMBtu',
+            'Electric Heat Energy (kWh)', 'Electric Cool Energy (kWh)',
+            'Heat Eff', 'Cool Eff'
+        ]
+        eff_ws.write_row(0, 0, headers, formats["header"])
+
+        # Caution note (merged I1:P1)
+        eff_ws.merge_range('I1:P1',
+                           "⚠️ This does not account for energy consumption associated with chiller or boiler plants "
+                           "(or any other water-side equipment). Therefore, exercise caution when interpreting the "
+                           "efficiency values as they may not be accurate.",
+                           formats["caution_merge"])
+
+        max_rows = min(len(ss_a_visible), len(ss_h_visible))
+        for i in range(max_rows):
+            a = ss_a_visible[i]
+            h = ss_h_visible[i]
+            # a[0] System, a[2] Cooling Energy (MBTU), a[8] Heating Energy (MBTU)
+            system = a[0]
+            cool_load = a[2]
+            heat_load = a[8]
+            elec_heat_kwh = h[8]   # Electric Heat Energy (kWh)
+            elec_cool_kwh = h[10]  # Electric Cool Energy (kWh)
+
+            row_idx = i + 1
+            eff_ws.write(row_idx, 0, system)
+            eff_ws.write(row_idx, 1, "N/A")
+            eff_ws.write(row_idx, 2, cool_load, number_format if isinstance(cool_load, float) else None)
+            eff_ws.write(row_idx, 3, heat_load, number_format if isinstance(heat_load, float) else None)
+            eff_ws.write(row_idx, 4, elec_heat_kwh, number_format if isinstance(elec_heat_kwh, float) else None)
+            eff_ws.write(row_idx, 5, elec_cool_kwh, number_format if isinstance(elec_cool_kwh, float) else None)
+
+            # Formulas
+            r = row_idx + 1  # Excel 1-based
+            eff_ws.write_formula(row_idx, 6, f'=IFERROR(ABS(D{r}/((E{r}*3.412)/1000)),"")', number_format)
+            eff_ws.write_formula(row_idx, 7, f'=IFERROR(C{r}/((F{r}*3.412)/1000),"")', number_format)
+
+
+def parse_report(report, lines, doe_version=None):
+    # Worker for SIMFileReader.parse_contents(jobs=...): parses one report's lines in a fresh reader
+    reader = SIMFileReader("")
+    reader.doe_version = doe_version
+    report_parse_method = getattr(reader, reader.parsing_methods[report])
+    report_parse_method(lines)
+    return getattr(reader, reader.data_attribute(report))
+
+
+def convert_file(sim_file_path, out_dir=None, reports=None, cache_dir=None, cache_max_mb=512, streaming=False,
+                 export_format=None, stats=False, layout="hidden", pipeline=False, parse_jobs=None):
+    # pipeline: streaming with reading, parsing and writing overlapped on threads (implies streaming).
+    # parse_jobs: processes to parse one file's reports in; streaming and pipeline runs parse as they read.
+    reader = SIMFileReader(sim_file_path, reports=reports, out_dir=out_dir, layout=layout)
+    streaming = streaming or pipeline
+    if pipeline and not cache_dir:
+        reader.pipeline_to_excel(export_format)
+    elif streaming and not cache_dir:
+        reader.stream_to_excel(export_format)
     else:
-        li = item
-
-    out = []
-    for ele in li:
-        if ele is None or (isinstance(ele, str) and ele.strip() == ""):
-            out.append(None)
-            continue
-
-        try:
-            f = float(ele)
-            if math.isnan(f) or math.isinf(f):
-                out.append(None)
-            else:
-                out.append(f)
-        except (ValueError, TypeError):
-            out.append(ele)
-    return out
-
-
-def is_num(x):
-    try:
-        float(x)
-        return True
-    except Exception:
-        return False
-
-
-def try_num(x):
-    try:
-        return float(x)
-    except Exception:
-        return x
-
-
-def main():
-    window = tk.Tk()
-    window.withdraw()
-    window.iconbitmap(str(ICON_PATH))
-
-    filepath = filedialog.askopenfilename(
-        title="Select a SIM File",
-        filetypes=(("SIM Files", "*.SIM"), ("All Files", "*.*"))
-    )
+        # A cache entry needs every parsed table at once, so with a cache streaming only applies to the write
+        cache = ParseCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+        reader.read_and_parse(cache, parse_jobs)
+        if export_format is not None:
+            with reader.stats.phase("export"):
+                reader.export_tables(export_format)
+        reader.write_excel(constant_memory=streaming)
+
+    if stats:
+        reader.stats.write_json(stats_path(reader.wb_name), sim_file=reader.file_path, workbook=reader.wb_name,
+                                doe_version=(reader.doe_version or "").strip() or None)
+    return reader.wb_name
+
+
+def stats_path(wb_name):
+    # Sidecar written next to the workbook by convert_file(stats=True): "run - SIM.stats.json"
+    return os.path.splitext(wb_name)[0] + ".stats.json"
+
+
+def parse_file(sim_file_path, reports=None, cache_dir=None, cache_max_mb=512):
+    # Worker for `sim-to-excel ingest`: returns the reader with every report parsed
+    reader = SIMFileReader(sim_file_path, reports=reports)
+    cache = ParseCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+    reader.read_and_parse(cache)
+    return reader
+
+
+def split_reports(value):
+    reports = [report.strip().upper() for report in value.split(",") if report.strip()]
+    unknown = [report for report in reports if report not in SIMFileReader.parsing_methods]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown report(s): {', '.join(unknown)}")
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract data from eQUEST .SIM files and write to .xlsx")
+    parser.add_argument("sim_file", nargs="?", help="SIM file to convert (a file dialog opens when omitted)")
+    parser.add_argument("--reports", type=split_reports,
+                        help="comma-separated report codes to convert, e.g. BEPU,SS-R (default: all)")
+    args = parser.parse_args(argv)
+
+    filepath = args.sim_file
+    if not filepath:
+        # Tk and the window icon are only needed for the file dialog, so importing this module stays
+        # free of side effects and works on hosts without Tk
+        import tkinter as tk
+        from tkinter import filedialog
+
+        from sim_to_excel.add_logo import icon_path
+
+        window = tk.Tk()
+        window.withdraw()
+        window.iconbitmap(str(icon_path()))
+
+        filepath = filedialog.askopenfilename(
+            title="Select a SIM File",
+            filetypes=(("SIM Files", "*.SIM"), ("All Files", "*.*"))
+        )
 
     if filepath:
-        reader = SIMFileReader(filepath)
+        reader = SIMFileReader(filepath, reports=args.reports)
         reader.read_file()
         reader.parse_contents()
         reader.write_excel()
@@ -1,5 +1,6 @@
 import base64
 import tempfile
+from functools import cache
 from pathlib import Path
 
 
@@ -1070,12 +1071,13 @@ AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA
 AAAAAAAAAAA=
 """
 
-icondata = base64.b64decode(icon)
-tmp_dir = Path(tempfile.gettempdir())
-icon_path = tmp_dir / "icon.ico"
 
-with open(icon_path, "wb") as f:
-    f.write(icondata)
-
-# expose the path for the caller
-ICON_PATH = icon_path
+@cache
+def icon_path():
+    # Decoded into the temp directory the first time the GUI asks for it, then reused
+    path = Path(tempfile.gettempdir()) / "icon.ico"
+    icondata = base64.b64decode(icon)
+    if not path.is_file() or path.stat().st_size != len(icondata):
+        with open(path, "wb") as f:
+            f.write(icondata)
+    return path
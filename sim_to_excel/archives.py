@@ -0,0 +1,108 @@
+import fnmatch
+import glob
+import importlib
+import io
+import os
+from contextlib import contextmanager
+
+# A SIM file inside a zip archive is addressed as "<archive>::<member>", e.g. "runs.zip::Proposed/run.SIM"
+MEMBER_SEPARATOR = "::"
+# Single-file compression, recognised by the last suffix: run.SIM.gz, run.SIM.bz2, run.SIM.xz. The modules
+# (and zipfile) are imported on first use so that reading plain SIM files does not pay for them.
+COMPRESSION_MODULES = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+SIM_ENCODING = "iso-8859-1"
+
+
+def split_member(path):
+    # (archive, member) for "<archive>::<member>", (path, None) for anything else
+    archive, separator, member = path.partition(MEMBER_SEPARATOR)
+    return (archive, member) if separator else (path, None)
+
+
+def compression(path):
+    # The suffix of a compressed single file ('.gz', '.bz2', '.xz'), else None
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix if suffix in COMPRESSION_MODULES else None
+
+
+def is_plain_file(path):
+    # True when the SIM text is the file on disk as is, so it can be memory-mapped
+    return split_member(path)[1] is None and compression(path) is None
+
+
+def sim_location(path):
+    # (directory, file name) a SIM path stands for: where the file or its archive is, and the name of the
+    # SIM file itself, e.g. ("runs", "run.SIM") for runs/run.SIM.gz and for runs/project.zip::Proposed/run.SIM
+    archive, member = split_member(path)
+    if member is not None:
+        return os.path.dirname(archive), posix_basename(member)
+    name = os.path.basename(path)
+    if compression(name) is not None:
+        name = os.path.splitext(name)[0]
+    return os.path.dirname(path), name
+
+
+def posix_basename(member):
+    # Zip member names always use "/"
+    return member.rsplit("/", 1)[-1]
+
+
+@contextmanager
+def open_binary(path):
+    # The SIM file's bytes, decompressed on the fly; nothing is extracted to disk
+    archive, member = split_member(path)
+    suffix = compression(path)
+    if member is not None:
+        import zipfile
+
+        with zipfile.ZipFile(archive) as zip_file, zip_file.open(member) as f:
+            yield f
+    elif suffix is not None:
+        with importlib.import_module(COMPRESSION_MODULES[suffix]).open(path, "rb") as f:
+            yield f
+    else:
+        with open(path, "rb") as f:
+            yield f
+
+
+@contextmanager
+def open_text(path):
+    # The SIM file as text, read line by line with the SIM encoding whatever it is stored in
+    if is_plain_file(path):
+        with open(path, "r", encoding=SIM_ENCODING) as f:
+            yield f
+    else:
+        with open_binary(path) as f, io.TextIOWrapper(f, encoding=SIM_ENCODING) as text:
+            yield text
+
+
+def archive_members(archive, pattern=None):
+    # The SIM paths inside a zip archive, in archive order, optionally only the members matching a
+    # wildcard pattern ("runs.zip::*/Proposed*.SIM")
+    import zipfile
+
+    with zipfile.ZipFile(archive) as zip_file:
+        names = [info.filename for info in zip_file.infolist()
+                 if not info.is_dir() and posix_basename(info.filename).upper().endswith(".SIM")]
+    if pattern is not None:
+        names = fnmatch.filter(names, pattern)
+    return [f"{archive}{MEMBER_SEPARATOR}{name}" for name in names]
+
+
+def expand_sim_path(path):
+    # Every SIM file a command-line path stands for: each SIM member of a .zip archive (optionally
+    # "<archive>::<pattern>"), else the path itself
+    import zipfile
+
+    archive, member = split_member(path)
+    if member is not None:
+        if not glob.has_magic(member):
+            return [path]
+        try:
+            return archive_members(archive, member)
+        except (OSError, zipfile.BadZipFile):
+            # Left for the conversion to report
+            return [path]
+    if path.lower().endswith(".zip") and zipfile.is_zipfile(path):
+        return archive_members(path)
+    return [path]
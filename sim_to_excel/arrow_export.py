@@ -0,0 +1,146 @@
+import os
+import re
+from itertools import chain
+from operator import eq
+
+from sim_to_excel.hourly import HOURLY_REPORT
+from sim_to_excel.parse_cache import PARSER_VERSION
+from sim_to_excel.table import StringColumn
+
+# Export format -> file extension
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+UNITS_REGEX = re.compile(r"\(([^()]*)\)\s*$")
+
+
+def import_pyarrow():
+    # pyarrow is optional; only the columnar export needs it
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet / Arrow export needs pyarrow: pip install pyarrow "
+                          "(or pip install sim-to-excel[arrow])") from None
+    return pyarrow
+
+
+def field_names(names):
+    # Stable field names from the column names: whitespace (including the line breaks meant for the
+    # Excel header) collapsed, and repeated names numbered the way pandas does ("U-Value", "U-Value.1").
+    # A trailing "(...)" is the column's units.
+    fields = []
+    seen = {}
+    for name in names:
+        name = " ".join(name.split()) or "Column"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        units = UNITS_REGEX.search(name)
+        fields.append((f"{name}.{count}" if count else name, units.group(1).strip() if units else None))
+    return fields
+
+
+def column_to_arrow(pa, column, column_type):
+    if isinstance(column, StringColumn):
+        # Keep the dictionary encoding: the codes become the indices of an Arrow DictionaryArray
+        indices = pa.Array.from_buffers(pa.uint32(), len(column), [None, pa.py_buffer(column.codes.tobytes())])
+        return pa.DictionaryArray.from_arrays(indices, pa.array(column.values, pa.string()))
+
+    valid = column.valid
+    if column_type.startswith("int"):
+        valid = bytearray(map(min, valid, map(float.is_integer, column.values)))
+
+    values = float_array(pa, column.values, valid)
+    if column_type.startswith("int"):
+        return values.cast(pa.int64(), safe=False)
+    return values
+
+
+def float_array(pa, values, valid):
+    # Cells without a number (blanks, "******" overflow markers) are nulls; the byte mask is packed into
+    # Arrow's validity bitmap by a cast instead of a Python loop
+    bitmap = None
+    if valid.count(1) != len(valid):
+        bitmap = pa.Array.from_buffers(pa.uint8(), len(valid), [None, pa.py_buffer(bytes(valid))])
+        bitmap = bitmap.cast(pa.bool_()).buffers()[1]
+    return pa.Array.from_buffers(pa.float64(), len(values), [bitmap, pa.py_buffer(values.tobytes())])
+
+
+def text_array(pa, column):
+    # The text a numeric column kept where it holds no number, null elsewhere
+    return pa.array(list(map(column.text.get, range(len(column)))), pa.string())
+
+
+def table_to_arrow(table, metadata=None):
+    # A numeric column that kept text ("******", a label) is followed by a "<name> text" string field
+    # holding it, so the numbers stay typed and the text is not lost
+    pa = import_pyarrow()
+    table.flush()
+    arrays = []
+    fields = []
+    for (name, units), column, column_type in zip(field_names(table.names), table.columns, table.types):
+        array = column_to_arrow(pa, column, column_type)
+        arrays.append(array)
+        fields.append(pa.field(name, array.type, metadata={"units": units} if units else None))
+        if getattr(column, "text", None):
+            arrays.append(text_array(pa, column))
+            fields.append(pa.field(f"{name} text", pa.string()))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+
+def hourly_to_arrow(block, metadata=None):
+    # Month / Day / Hour as uint8 and one float64 column per variable, NaN cells as nulls. The fields
+    # carry the variables' units and DOE-2 variable numbers.
+    pa = import_pyarrow()
+    arrays = [pa.Array.from_buffers(pa.uint8(), block.rows, [None, pa.py_buffer(stamps[:block.rows].tobytes())])
+              for stamps in (block.months, block.days, block.hours)]
+    fields = [pa.field(name, pa.uint8()) for name in ("Month", "Day", "Hour")]
+    for index, ((name, units), column) in enumerate(zip(field_names(block.labels()), block.columns)):
+        values = block.column(index)
+        arrays.append(float_array(pa, values, bytearray(map(eq, values, values))))
+        field_metadata = {"units": units} if units else {}
+        if column.variable is not None:
+            field_metadata["variable"] = str(column.variable)
+        fields.append(pa.field(name, pa.float64(), metadata=field_metadata or None))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+
+def export_path(reader, out_dir, name, extension):
+    # "run - SS-A.parquet" next to the workbook, or in out_dir
+    if out_dir is None:
+        out_dir = os.path.dirname(reader.wb_name)
+    name = re.sub(r'[<>:"/\\|?*]', "_", name.rstrip('.'))
+    return os.path.join(out_dir, f"{reader.file_name} - {name}{extension}")
+
+
+def write_tables(reader, out_dir=None, export_format="parquet", reports=None):
+    # Writes every parsed table of a SIMFileReader to its own file next to the workbook (or in out_dir),
+    # e.g. "run - SS-A.parquet", "run - SV-A Zones.parquet", and every hourly report block as
+    # "run - Hourly <name>.parquet". Returns the paths written.
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}. Choose from: {', '.join(EXPORT_FORMATS)}")
+    pa = import_pyarrow()
+
+    def metadata(report, name):
+        return {
+            "sim_file": os.path.basename(reader.file_path),
+            "doe_version": (reader.doe_version or "").strip(),
+            "report": report,
+            "table": name,
+            "parser_version": str(PARSER_VERSION),
+        }
+
+    # Converted one at a time as they are written
+    exports = chain(((table_to_arrow(table, metadata(report, name)), name)
+                     for report, name, table in reader.tables(reports)),
+                    ((hourly_to_arrow(block, metadata(HOURLY_REPORT, block.name)), f"Hourly {block.name}")
+                     for block in reader.hourly_blocks(reports)))
+    paths = []
+    for arrow_table, name in exports:
+        path = export_path(reader, out_dir, name, EXPORT_FORMATS[export_format])
+        if export_format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(arrow_table, path)
+        else:
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+        paths.append(path)
+    return paths
@@ -0,0 +1,321 @@
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sim_to_excel.archives import MEMBER_SEPARATOR, expand_sim_path, split_member
+from sim_to_excel.SIMtoExcel import LAYOUTS, convert_file, parse_file, split_reports, stats_path
+from sim_to_excel.stats import format_summary
+
+
+def expand_paths(patterns):
+    # Windows shells do not expand wildcards, so do it here; literal paths are kept as given. A .zip
+    # archive stands for every SIM file inside it, "archive.zip::pattern" for the members matching pattern.
+    paths = []
+    for pattern in patterns:
+        archive, member = split_member(pattern)
+        matches = sorted(glob.glob(archive)) if glob.has_magic(archive) else []
+        for path in matches or [archive]:
+            paths.extend(expand_sim_path(path if member is None else f"{path}{MEMBER_SEPARATOR}{member}"))
+    return list(dict.fromkeys(paths))
+
+
+def iter_results(function, sim_files, jobs, *args):
+    # Yields (sim_file, function(sim_file, *args), error) as each file finishes; one failing file never
+    # stops the others
+    if jobs == 1:
+        for sim_file in sim_files:
+            try:
+                yield sim_file, function(sim_file, *args), None
+            except Exception as e:
+                yield sim_file, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(function, sim_file, *args): sim_file for sim_file in sim_files}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def iter_conversions(sim_files, jobs, out_dir=None, reports=None, cache_dir=None, cache_max_mb=512, streaming=False,
+                     export_format=None, stats=False, layout="hidden", pipeline=False, parse_jobs=None):
+    # Yields (sim_file, wb_name, error) as each conversion finishes
+    return iter_results(convert_file, sim_files, jobs, out_dir, reports, cache_dir, cache_max_mb, streaming,
+                        export_format, stats, layout, pipeline, parse_jobs)
+
+
+def run_convert(args):
+    sim_files = expand_paths(args.sim_files)
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(sim_files)))
+    failed = []
+    conversion_args = (args.out_dir, args.reports, args.cache_dir, args.cache_max_mb, args.streaming, args.export,
+                       args.stats, args.layout, args.pipeline, args.parse_jobs)
+    if args.profile:
+        if len(sim_files) != 1:
+            print("--profile takes a single SIM file", file=sys.stderr)
+            return 2
+        # In this process so the profile sees the whole conversion
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        conversions = profiler.runcall(lambda: list(iter_conversions(sim_files, 1, *conversion_args)))
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+        print(f"cProfile stats written to {args.profile}")
+    else:
+        conversions = iter_conversions(sim_files, jobs, *conversion_args)
+
+    for sim_file, wb_name, error in conversions:
+        if error is None:
+            print(f"ok     {sim_file} -> {wb_name}")
+            if args.stats:
+                with open(stats_path(wb_name)) as f:
+                    print(f"       {format_summary(json.load(f))}")
+        else:
+            failed.append((sim_file, error))
+            print(f"FAILED {sim_file}: {error}", file=sys.stderr)
+
+    print(f"Converted {len(sim_files) - len(failed)} of {len(sim_files)} file(s); {len(failed)} failed.")
+    for sim_file, error in failed:
+        print(f"  {sim_file}: {type(error).__name__}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_ingest(args):
+    from sim_to_excel.parse_cache import file_sha256
+    from sim_to_excel.warehouse import Warehouse
+
+    sim_files = expand_paths(args.sim_files)
+    failed = []
+    ingested = skipped = 0
+    with Warehouse(args.db) as warehouse:
+        # Files whose content is already in the database are not even parsed
+        hashes = {}
+        for sim_file in sim_files:
+            try:
+                hashes[sim_file] = file_sha256(sim_file)
+            except OSError as e:
+                failed.append((sim_file, e))
+                print(f"FAILED {sim_file}: {e}", file=sys.stderr)
+        pending = [sim_file for sim_file, sha256 in hashes.items()
+                   if args.replace or warehouse.find_run(sim_file, sha256) is None]
+        skipped = len(hashes) - len(pending)
+
+        # Workers parse, this process writes: SQLite takes one writer at a time
+        jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(pending) or 1))
+        for sim_file, reader, error in iter_results(parse_file, pending, jobs, args.reports, args.cache_dir,
+                                                    args.cache_max_mb):
+            if error is None:
+                try:
+                    run_id = warehouse.ingest(reader, hashes[sim_file], replace=args.replace)
+                except Exception as e:
+                    error = e
+                else:
+                    ingested += 1
+                    print(f"ok     {sim_file} -> run {run_id}")
+            if error is not None:
+                failed.append((sim_file, error))
+                print(f"FAILED {sim_file}: {error}", file=sys.stderr)
+
+    print(f"Ingested {ingested} of {len(sim_files)} file(s) into {args.db}; {skipped} already present, "
+          f"{len(failed)} failed.")
+    for sim_file, error in failed:
+        print(f"  {sim_file}: {type(error).__name__}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_compare(args):
+    from sim_to_excel.compare import compare_readers, diff_path, run_labels, write_diff_workbook
+
+    sim_files = expand_paths(args.sim_files)
+    if len(sim_files) < 2:
+        print("compare takes a baseline SIM file and at least one proposed SIM file", file=sys.stderr)
+        return 2
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    # Files are parsed in parallel and compared in the order given, the first being the baseline
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(sim_files)))
+    readers = {}
+    failed = []
+    for sim_file, reader, error in iter_results(parse_file, sim_files, jobs, args.reports, args.cache_dir,
+                                                args.cache_max_mb):
+        if error is None:
+            readers[sim_file] = reader
+        else:
+            failed.append((sim_file, error))
+            print(f"FAILED {sim_file}: {type(error).__name__}: {error}", file=sys.stderr)
+    if failed:
+        return 1
+
+    readers = [readers[sim_file] for sim_file in sim_files]
+    path = args.output or diff_path(sim_files[0], args.out_dir)
+    diffs = compare_readers(readers, args.reports, args.tolerance)
+    write_diff_workbook(path, diffs, run_labels(readers), args.changed_only)
+    for run, sim_file in enumerate(sim_files[1:], 1):
+        changed = sum(diff.changed_cells(run) for diff in diffs)
+        print(f"{sim_file}: {changed} cell(s) changed from {sim_files[0]}")
+    print(f"Wrote {path}")
+    return 0
+
+
+def interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_watch(args):
+    from sim_to_excel.watch import Watcher
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    watcher = Watcher(args.directory, jobs=args.jobs or 1, interval=args.interval, settle=args.settle,
+                      recursive=args.recursive, out_dir=args.out_dir,
+                      conversion_args=(args.reports, args.cache_dir, args.cache_max_mb, args.streaming, args.export,
+                                       args.stats, args.layout, args.pipeline))
+    # A service manager stops the watcher with SIGTERM: finish like Ctrl+C does
+    signal.signal(signal.SIGTERM, interrupt)
+    if not args.once:
+        print(f"Watching {args.directory} for .SIM files (Ctrl+C to stop)", flush=True)
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+    print(f"Converted {watcher.converted} file(s); {watcher.skipped} unchanged, {watcher.failed} failed.")
+    return 1 if args.once and watcher.failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sim-to-excel", description="Extract data from eQUEST .SIM files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="convert SIM files to .xlsx workbooks")
+    convert_parser.add_argument("sim_files", nargs="+",
+                                help="SIM files (also .gz, .bz2, .xz), .zip archives of them or wildcard patterns")
+    convert_parser.add_argument("-j", "--jobs", type=int, default=None,
+                                help="number of worker processes (default: number of CPUs)")
+    convert_parser.add_argument("--out-dir", default=None,
+                                help="directory for the workbooks (default: next to each SIM file)")
+    convert_parser.add_argument("--reports", type=split_reports,
+                                help="comma-separated report codes to convert, e.g. BEPU,SS-R (default: all)")
+    convert_parser.add_argument("--cache-dir", default=None,
+                                help="reuse parsed reports from this directory across runs (shared by all workers)")
+    convert_parser.add_argument("--cache-max-mb", type=int, default=512,
+                                help="size cap for --cache-dir; least recently used entries are evicted (default: 512)")
+    convert_parser.add_argument("--streaming", action="store_true",
+                                help="write each report's sheets as soon as it is parsed, in constant memory "
+                                     "(sheets follow the SIM file's section order)")
+    convert_parser.add_argument("--pipeline", action="store_true",
+                                help="like --streaming, with reading, parsing and writing overlapped on separate "
+                                     "threads")
+    convert_parser.add_argument("--export", choices=["parquet", "arrow", "csv"], default=None,
+                                help="also write every parsed table and hourly report as a typed Parquet or Arrow "
+                                     "IPC file (needs pyarrow) or as CSV")
+    convert_parser.add_argument("--layout", choices=LAYOUTS, default="hidden",
+                                help="SS-A, PS-C, SS-H and SS-L sheets: 'hidden' writes every row and hides the "
+                                     "monthly ones, 'summary' writes only the TOTAL / SUM / ANNUAL rows and puts "
+                                     "the monthly rows on a separate '<report> Monthly' sheet (default: hidden)")
+    convert_parser.add_argument("--parse-jobs", type=int, default=None, metavar="N",
+                                help="parse the reports of each file in N worker processes instead of while reading "
+                                     "(for a few large files; ignored with --streaming and --pipeline)")
+    convert_parser.add_argument("--stats", action="store_true",
+                                help="write per-phase timings and counters to a .stats.json file next to each "
+                                     "workbook and print a summary")
+    convert_parser.add_argument("--profile", metavar="PATH",
+                                help="profile a single conversion with cProfile and write the stats to PATH")
+    convert_parser.set_defaults(func=run_convert)
+
+    ingest_parser = subparsers.add_parser("ingest", help="load parsed SIM files into a SQLite database")
+    ingest_parser.add_argument("db", help="SQLite database file (created if missing)")
+    ingest_parser.add_argument("sim_files", nargs="+",
+                               help="SIM files (also .gz, .bz2, .xz), .zip archives of them or wildcard patterns")
+    ingest_parser.add_argument("-j", "--jobs", type=int, default=None,
+                               help="number of worker processes parsing files (default: number of CPUs)")
+    ingest_parser.add_argument("--reports", type=split_reports,
+                               help="comma-separated report codes to load, e.g. SS-R,SV-A (default: all)")
+    ingest_parser.add_argument("--cache-dir", default=None,
+                               help="reuse parsed reports from this directory across runs (shared by all workers)")
+    ingest_parser.add_argument("--cache-max-mb", type=int, default=512,
+                               help="size cap for --cache-dir; least recently used entries are evicted (default: 512)")
+    ingest_parser.add_argument("--replace", action="store_true",
+                               help="re-load files that are already in the database instead of skipping them")
+    ingest_parser.set_defaults(func=run_ingest)
+
+    compare_parser = subparsers.add_parser("compare", help="compare a baseline SIM file with proposed-design runs")
+    compare_parser.add_argument("sim_files", nargs="+",
+                                help="the baseline SIM file, then one or more proposed SIM files (also .gz, .bz2, "
+                                     ".xz or zip members)")
+    compare_parser.add_argument("-o", "--output", default=None,
+                                help="diff workbook to write (default: '<baseline> - Compare.xlsx')")
+    compare_parser.add_argument("--out-dir", default=None,
+                                help="directory for the diff workbook (default: next to the baseline SIM file)")
+    compare_parser.add_argument("-j", "--jobs", type=int, default=None,
+                                help="number of worker processes parsing files (default: number of CPUs)")
+    compare_parser.add_argument("--reports", type=split_reports,
+                                help="comma-separated report codes to compare, e.g. BEPU,SS-R (default: all)")
+    compare_parser.add_argument("--tolerance", type=float, default=0.0,
+                                help="absolute difference up to which numbers count as unchanged (default: 0)")
+    compare_parser.add_argument("--changed-only", action="store_true",
+                                help="write only the rows with a changed cell, and only the tables that have one")
+    compare_parser.add_argument("--cache-dir", default=None,
+                                help="reuse parsed reports from this directory across runs (shared by all workers)")
+    compare_parser.add_argument("--cache-max-mb", type=int, default=512,
+                                help="size cap for --cache-dir; least recently used entries are evicted (default: 512)")
+    compare_parser.set_defaults(func=run_compare)
+
+    watch_parser = subparsers.add_parser("watch", help="convert SIM files as they appear or change in a directory")
+    watch_parser.add_argument("directory", help="directory to watch")
+    watch_parser.add_argument("-j", "--jobs", type=int, default=1,
+                              help="number of conversions to run at once, in worker processes (default: 1)")
+    watch_parser.add_argument("--interval", type=float, default=1.0,
+                              help="seconds between scans of the directory (default: 1)")
+    watch_parser.add_argument("--settle", type=float, default=2.0,
+                              help="seconds a file's size and modification time must stay unchanged before it is "
+                                   "converted (default: 2)")
+    watch_parser.add_argument("-r", "--recursive", action="store_true", help="also watch subdirectories")
+    watch_parser.add_argument("--once", action="store_true",
+                              help="convert the files that are new or changed since their workbook was written, "
+                                   "then exit")
+    watch_parser.add_argument("--out-dir", default=None,
+                              help="directory for the workbooks (default: next to each SIM file)")
+    watch_parser.add_argument("--reports", type=split_reports,
+                              help="comma-separated report codes to convert, e.g. BEPU,SS-R (default: all)")
+    watch_parser.add_argument("--cache-dir", default=None,
+                              help="reuse parsed reports from this directory across runs (shared by all workers)")
+    watch_parser.add_argument("--cache-max-mb", type=int, default=512,
+                              help="size cap for --cache-dir; least recently used entries are evicted (default: 512)")
+    watch_parser.add_argument("--streaming", action="store_true",
+                              help="write each report's sheets as soon as it is parsed, in constant memory")
+    watch_parser.add_argument("--pipeline", action="store_true",
+                              help="like --streaming, with reading, parsing and writing overlapped on separate threads")
+    watch_parser.add_argument("--export", choices=["parquet", "arrow", "csv"], default=None,
+                              help="also write every parsed table and hourly report as Parquet, Arrow IPC or CSV")
+    watch_parser.add_argument("--layout", choices=LAYOUTS, default="hidden",
+                              help="SS-A, PS-C, SS-H and SS-L sheet layout, as for convert (default: hidden)")
+    watch_parser.add_argument("--stats", action="store_true",
+                              help="write per-phase timings and counters to a .stats.json file next to each workbook")
+    watch_parser.set_defaults(func=run_watch)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+import re
+from operator import itemgetter
+
+
+class ColumnSpec:
+    # Fixed-width layout of one table in a SIM report. Each column is (name, start, end, type) where type
+    # is the target type of the field ("str", "float" or "int"). The spans compile to a single
+    # itemgetter of slices, so extracting a row is one C-level call plus a strip per field.
+    def __init__(self, *columns):
+        self.columns = columns
+        self.names = [name for name, _, _, _ in columns]
+        self.spans = [(start, end) for _, start, end, _ in columns]
+        self.types = [column_type for _, _, _, column_type in columns]
+        slices = [slice(start, end) for start, end in self.spans]
+        if len(slices) == 1:
+            getter = itemgetter(slices[0])
+            self._getter = lambda line: (getter(line),)
+        elif slices:
+            self._getter = itemgetter(*slices)
+        else:
+            self._getter = lambda line: ()
+
+    def __len__(self):
+        return len(self.columns)
+
+    @property
+    def fields(self):
+        # (name, type) pairs, the column layout Table expects
+        return list(zip(self.names, self.types))
+
+    def extract(self, line):
+        return list(map(str.strip, self._getter(line)))
+
+
+# === LV-B ===
+LV_B_SPACE_COLUMNS = ColumnSpec(
+    ("Space Name", 0, 37, "str"),
+    ("Multiplier", 37, 43, "float"),
+    ("Space Type", 43, 47, "str"),
+    ("Azimuth", 47, 54, "float"),
+    ("LPD", 54, 62, "float"),
+    ("People", 62, 69, "float"),
+    ("EPD", 69, 77, "float"),
+    ("Infil. Method", 77, 91, "str"),
+    ("ACH", 91, 97, "float"),
+    ("Area", 97, 109, "float"),
+    ("Volume", 109, 121, "float"),
+)
+LV_B_SUMMARY_COLUMNS = ColumnSpec(
+    ("Summary", 0, 32, "str"),
+    ("Value", 35, 48, "float"),
+    ("Units", 48, 52, "str"),
+)
+
+# === LV-D ===
+LV_D_SURFACE_COLUMNS = ColumnSpec(
+    ("Surface Name", 0, 41, "str"),
+    ("U-Value", 41, 48, "float"),
+    ("Area", 48, 62, "float"),
+    ("U-Value", 62, 75, "float"),
+    ("Area", 75, 89, "float"),
+    ("U-Value", 89, 100, "float"),
+    ("Area", 100, 118, "float"),
+    ("Azimuth", 118, 128, "str"),
+)
+LV_D_SUMMARY_COLUMNS = ColumnSpec(
+    ("Surface", 0, 20, "str"),
+    ("Avg. Window U-Value", 20, 30, "float"),
+    ("Avg. Wall U-Value", 30, 50, "float"),
+    ("Avg. Window+Wall U-Value", 50, 70, "float"),
+    ("Window Area", 70, 90, "float"),
+    ("Wall Area", 90, 105, "float"),
+    ("Window+Wall Area", 105, 121, "float"),
+)
+
+# === PV-A ===
+PV_A_LOOP_COLUMNS = ColumnSpec(
+    ("Heat Demand \n(MMBtu/h)", 0, 13, "float"),
+    ("Cool Demand \n(MMBtu/h)", 13, 25, "float"),
+    ("Loop Flow \n(GPM)", 25, 37, "float"),
+    ("Total Head \n(ft)", 37, 49, "float"),
+    ("Supply UA Product \n(Btu/h-F)", 49, 61, "float"),
+    ("Supply Loss DT \n(F)", 61, 73, "float"),
+    ("Return UA Product \n(Btu/h-F)", 73, 86, "float"),
+    ("Return Loss DT \n(F)", 86, 97, "float"),
+    ("Loop Volume \n(Gal)", 97, 109, "float"),
+    ("Fluid Heat Cap. \n(Btu/lb-F)", 109, 120, "float"),
+)
+PV_A_PUMP_COLUMNS = ColumnSpec(
+    ("Attached To", 0, 40, "str"),
+    ("Flow \n(GPM)", 40, 48, "float"),
+    ("Head \n(ft)", 48, 60, "float"),
+    ("Head Setpoint \n(ft)", 60, 72, "float"),
+    ("Capacity Control", 72, 84, "str"),
+    ("Power \n(kW)", 84, 96, "float"),
+    ("Mech. Eff.", 96, 108, "float"),
+    ("Motor Eff.", 108, 119, "float"),
+)
+# The primary equipment table is laid out differently by each DOE-2 version. Its headings sit one cell to the
+# right of the data, so "Capacity" holds the name of the loop the equipment is attached to
+PV_A_EQUIPMENT_COLUMNS = {
+    "DOE-2.2": ColumnSpec(
+        ("Equipment Type", 0, 19, "str"),
+        ("Attached To", 19, 53, "str"),
+        ("Capacity \n(MMBtu/h)", 53, 65, "str"),
+        ("Flow \n(GPM)", 65, 77, "float"),
+        ("Head \n(ft)", 77, 89, "float"),
+        ("Column G", 89, 101, "float"),
+        ("Column H", 101, 112, "float"),
+    ),
+    "DOE-2.3": ColumnSpec(
+        ("Equipment Type", 0, 19, "str"),
+        ("Attached To", 19, 53, "str"),
+        ("Capacity \n(MMBtu/h)", 53, 65, "str"),
+        ("Flow \n(GPM)", 65, 77, "float"),
+        ("Head \n(ft)", 77, 88, "float"),
+    ),
+}
+
+# === SS-A / SS-B / SS-G ===
+SS_MONTHLY_COLUMNS = ColumnSpec(
+    ("Month", 0, 5, "str"),
+    ("Cooling Energy \n(MBTU)", 5, 16, "float"),
+    ("Peak Cooling Day", 16, 22, "int"),
+    ("Peak Cooling Hour", 22, 25, "int"),
+    ("Dry Bulb Temp", 25, 32, "str"),
+    ("Wet Bulb Temp", 32, 38, "str"),
+    ("Max Cooling Load \n(KBTU/H)", 38, 52, "float"),
+    ("Heating Energy \n(MBTU)", 52, 67, "float"),
+    ("Peak Heating Day", 67, 72, "int"),
+    ("Peak Heating Hour", 72, 76, "int"),
+    ("Dry Bulb Temp", 76, 83, "str"),
+    ("Wet Bulb Temp", 83, 89, "str"),
+    ("Max Heating Load \n(KBTU/H)", 89, 103, "float"),
+    ("Electrical Energy \n(KWH)", 103, 117, "float"),
+    ("Peak Electrical Load \n(KW)", 117, 128, "float"),
+)
+
+# === SV-A ===
+SV_A_SYSTEM_COLUMNS = ColumnSpec(
+    ("Type", 0, 13, "str"),
+    ("Alt. Factor", 13, 19, "float"),
+    ("Floor Area", 19, 30, "float"),
+    ("Max Occ.", 30, 42, "float"),
+    ("OA Ratio", 42, 52, "float"),
+    ("Cooling \n(kBtu/h)", 52, 63, "float"),
+    ("SHR", 63, 74, "float"),
+    ("Heating \n(kBtu/h)", 74, 85, "float"),
+    ("Cool EIR", 85, 96, "float"),
+    ("Heat EIR", 96, 107, "float"),
+    ("HP Supp. \n(kBtu/h)", 107, 118, "float"),
+)
+SV_A_FAN_COLUMNS = ColumnSpec(
+    ("Type", 0, 9, "str"),
+    ("Flow Cap. \n(CFM)", 9, 20, "float"),
+    ("Div. Factor", 20, 31, "float"),
+    ("Demand \n(kW)", 31, 40, "float"),
+    ("Fan dT \n(F)", 40, 50, "float"),
+    ("SP \n(in. H2O)", 50, 61, "float"),
+    ("Total Eff.", 61, 69, "float"),
+    ("Mech. Eff.", 69, 77, "float"),
+    ("Fan Placement", 77, 89, "str"),
+    ("Fan Control", 89, 99, "str"),
+    ("Max. Fan \nRatio", 99, 109, "float"),
+    ("Min. Fan \nRatio", 109, 118, "float"),
+)
+SV_A_ZONE_COLUMNS = ColumnSpec(
+    ("Zone Name", 0, 28, "str"),
+    ("Supply \n(CFM)", 28, 37, "float"),
+    ("Exhaust \n(CFM)", 37, 47, "float"),
+    ("Fan \n(kW)", 47, 57, "float"),
+    ("Min. Flow \nRatio", 57, 67, "float"),
+    ("OA \n(CFM)", 67, 77, "float"),
+    ("Cooling \n(kBtu/h)", 77, 87, "float"),
+    ("SHR", 87, 97, "float"),
+    ("Extr. \n(kBtu/h)", 97, 107, "float"),
+    ("Heating \n(kBtu/h)", 107, 117, "float"),
+    ("Addition \n(kBtu/h)", 117, 127, "float"),
+    ("Zn Mult.", 127, 131, "float"),
+)
+SV_A_DOAS_COLUMNS = ColumnSpec(
+    ("Zone Name", 0, 37, "str"),
+    ("Mixed Air \n(CFM)", 37, 48, "float"),
+    ("Zone \n(CFM)", 48, 59, "float"),
+    ("Mult.", 59, 67, "float"),
+)
+
+# === Layouts read off the report itself (PS-E, PS-F, PS-H) ===
+# These reports' columns depend on the meter or equipment type, so the fields are taken from the page:
+# the dash groups underlining the headings give the columns, the numbers are right-aligned in them, and
+# the heading text inside each field names it.
+MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+# Labels of the rows after the monthly ones
+SUMMARY_MONTHS = ("TOTAL", "YEAR", "ANNUAL", "YR")
+# The end-use columns of PS-E / PS-F, named as on BEPU
+END_USES = ["Lights", "Task Lights", "Misc. Equip.", "Heating", "Cooling", "Heat Rejection", "Pumps & Aux.", "Fans",
+            "Refrig. Display", "Ht. Pump Supplemental", "Domestic Hot Water", "Exterior", "Total"]
+
+DASH_GROUPS_REGEX = re.compile(r"^[ -]*-[ -]*$")
+TOKEN_REGEX = re.compile(r"\d+/\s*\d+(?:/\s*\d+)?|\S+")
+PARENTHESES_REGEX = re.compile(r"^\((.*)\)$")
+
+
+def dash_spans(line):
+    # (start, end) of each dash group of a line made of two or more groups ("--------  --------"), else None
+    if not DASH_GROUPS_REGEX.match(line):
+        return None
+    spans = [match.span() for match in re.finditer(r"-+", line)]
+    return spans if len(spans) > 1 else None
+
+
+def field_spans(spans):
+    # Right-aligned fields: each runs from the end of the previous dash group to the end of its own
+    return [(spans[index - 1][1] if index else 0, end) for index, (_, end) in enumerate(spans)]
+
+
+def field_headings(header, fields):
+    # (name, units, number) of each field from the heading lines above it: the text inside the field,
+    # line by line, with "(MBTU)" taken as the units and "(4)" as DOE-2's variable number
+    headings = []
+    for start, end in fields:
+        name_parts = []
+        units = number = None
+        for line in header:
+            text = line[start:end].strip()
+            if not text or set(text) <= {"-", "="}:
+                continue
+            parentheses = PARENTHESES_REGEX.match(text)
+            if parentheses is None:
+                name_parts.append(text)
+            elif parentheses.group(1).strip().isdigit():
+                number = int(parentheses.group(1))
+            elif units is None:
+                units = parentheses.group(1).strip()
+        headings.append((" ".join(name_parts), units, number))
+    return headings
+
+
+def row_label(line):
+    # The leading words of a data row ("JAN   KWH", "PEAK ENDUSE", "DY/HR") and the column they end at
+    label = []
+    end = 0
+    for match in TOKEN_REGEX.finditer(line):
+        if any(character.isdigit() for character in match.group()) or match.group().startswith("*"):
+            break
+        label.append(match.group())
+        end = match.end()
+    return label, end
+
+
+def row_cells(line, fields, label_end):
+    # The text of each field right of the row label; dates printed as "31/ 15" lose their inner space
+    line = " " * label_end + line[label_end:]
+    return [re.sub(r"/\s+", "/", line[start:end].strip()) if end > label_end else "" for start, end in fields]
+
+
+def row_tokens(line, label_end):
+    # Fallback for pages without dash groups: the whitespace-separated values right of the label
+    return [re.sub(r"/\s+", "/", token) for token in TOKEN_REGEX.findall(line[label_end:])]
+
+
+def is_peak_time(cell):
+    # A day/hour cell ("19/9"); a number or an overflow has no slash
+    return "/" in cell
+
+
+def peak_time(cell):
+    # "19/9" -> ["19", "9"]: the day and hour of a peak (a leading month, as in "1/19/9", is dropped)
+    return cell.split("/")[-2:]
+
+
+def layout_rows(lines):
+    # Yields (month, label, headings, cells) for every data row of a report whose columns are read off the
+    # page: the heading lines above each dash underline give `headings` ((name, units, number) per field),
+    # the row's leading words give the label, less a leading month (JAN..DEC, TOTAL, YR) that also carries
+    # over to the unlabelled rows below it. A month printed alone on its line only sets the month.
+    header = []
+    fields = headings = None
+    month = ""
+    for line in lines:
+        if not line.strip():
+            continue
+        spans = dash_spans(line)
+        if spans is not None:
+            fields = field_spans(spans)
+            headings = field_headings(header, fields)
+            header = []
+            month = ""
+            continue
+
+        label, label_end = row_label(line)
+        cells = row_cells(line, fields, label_end) if fields is not None else row_tokens(line, label_end)
+        if label and (label[0] in MONTHS or label[0] in SUMMARY_MONTHS):
+            month = label.pop(0)
+        if not any(cells):
+            # Headings (of this table or of the next page's), or a month on its own line
+            header.append(line)
+            continue
+        header = []
+        yield month, " ".join(label), headings, cells
@@ -0,0 +1,324 @@
+import math
+import os
+from array import array
+from collections import deque
+from itertools import compress, count, repeat
+from operator import call, gt, ne, sub, truediv
+
+from sim_to_excel.archives import sim_location
+from sim_to_excel.table import StringColumn
+
+# A baseline value of 0 has no percent change
+_ZERO_TO_NAN = {0.0: math.nan}
+
+EXCEL_MAX_SHEET_NAME = 31
+
+
+# Columns that say which system / zone / space / meter / equipment (and month) a row is about, compared
+# case-insensitively: rows of two runs are paired by these. Everything else, text such as a system's type or
+# a row's units included, is a result and is compared, so a changed type shows as a changed cell.
+KEY_COLUMNS = {"system", "system name", "zone", "zone name", "space name", "floor name", "surface", "surface name",
+               "load category", "meter", "equipment", "equipment name", "loop name", "pump name", "month", "item",
+               "end use"}
+
+
+def key_columns(table):
+    # The identity columns of a table
+    return [index for index, (name, column) in enumerate(zip(table.names, table.columns))
+            if isinstance(column, StringColumn) and name.casefold() in KEY_COLUMNS]
+
+
+def row_keys(table, keys):
+    # One key per row: the row's key-column texts and how many rows before it had the same texts, so
+    # repeated keys (a system's SUM / PEAK rows, pages continued) pair up in order
+    seen = {}
+    result = []
+    for texts in zip(*[table.columns[index].cells() for index in keys]) if keys else repeat((), len(table)):
+        occurrence = seen[texts] = seen.get(texts, -1) + 1
+        result.append((texts, occurrence))
+    return result
+
+
+def gather(cells, index):
+    # cells[i] for every i of index, None where i is -1 (the row is missing from that run)
+    cells = list(cells)
+    cells.append(None)
+    return list(map(cells.__getitem__, index))
+
+
+def gather_values(values, index):
+    # As gather(), for an array('d'), with NaN for missing rows
+    values = values + array("d", [math.nan])
+    return array("d", map(values.__getitem__, index))
+
+
+class ColumnDiff:
+    # One result column across the runs: per run its cells and values aligned on the diff's rows, and per
+    # proposed run the absolute and percent deltas against the baseline and a flag per changed cell. Text
+    # columns (numeric False) only have the flags.
+    def __init__(self, name, cells, values, tolerance, numeric=True):
+        self.name = name
+        self.numeric = numeric
+        self.cells = cells
+        self.values = values
+        base_cells, base_values = cells[0], values[0]
+        denominators = array("d", map(abs, map(_ZERO_TO_NAN.get, base_values, base_values)))
+        self.deltas = []
+        self.percents = []
+        self.changed = []
+        for run_cells, run_values in zip(cells[1:], values[1:]):
+            deltas = array("d", map(sub, run_values, base_values))
+            changed = bytearray(map(gt, map(abs, deltas), repeat(tolerance)))
+            # Where either side is not a number (blank, text, missing row) the cells themselves are compared
+            undefined = bytearray(map(ne, deltas, deltas))
+            position = undefined.find(1)
+            while position != -1:
+                changed[position] = base_cells[position] != run_cells[position]
+                position = undefined.find(1, position + 1)
+            self.deltas.append(deltas)
+            self.percents.append(array("d", map(truediv, deltas, denominators)))
+            self.changed.append(changed)
+
+
+class TableDiff:
+    # A table of the baseline aligned with the same table of each proposed run. Rows are matched by their
+    # key (see row_keys): the baseline's rows in order, then the rows only proposed runs have. `index`
+    # holds, per run, the row of its table on each diff row (-1 when the run does not have it).
+    # tables[0] is the baseline's; when it is None (the baseline lacks the report) the comparison stays
+    # against the baseline: every row counts as added and every filled cell as changed. The first table present
+    # only gives the column layout.
+    def __init__(self, name, tables, tolerance=0.0):
+        self.name = name
+        self.present = [table is not None for table in tables]
+        layout = next(table for table in tables if table is not None)
+        for table in tables:
+            if table is not None:
+                table.flush()
+        self.keys = key_columns(layout)
+        self.key_names = [layout.names[index] for index in self.keys]
+        run_keys = [row_keys(table, self.keys) if table is not None else [] for table in tables]
+
+        self.rows = list(dict.fromkeys(key for keys in run_keys for key in keys))
+        self.index = []
+        for keys in run_keys:
+            position = dict(zip(keys, count()))
+            self.index.append(array("q", map(position.get, self.rows, repeat(-1))))
+
+        self.columns = []
+        for column_index, name in enumerate(layout.names):
+            if column_index in self.keys:
+                continue
+            cells = []
+            values = []
+            for table, index in zip(tables, self.index):
+                if table is None:
+                    cells.append([None] * len(self.rows))
+                    values.append(array("d", repeat(math.nan, len(self.rows))))
+                    continue
+                column = table.columns[column_index]
+                cells.append(gather(column.cells(None), index))
+                # Text columns have no numbers: every cell goes to the text comparison
+                values.append(gather_values(column.values, index) if not isinstance(column, StringColumn)
+                              else array("d", repeat(math.nan, len(self.rows))))
+            self.columns.append(ColumnDiff(name, cells, values, tolerance,
+                                           not isinstance(layout.columns[column_index], StringColumn)))
+
+    def key_cells(self):
+        # The key texts of every diff row, a list per key column, None for empty ones
+        return [[text or None for text in texts] for texts in zip(*[texts for texts, _ in self.rows])]
+
+    def report_status(self, run):
+        # "added" when only the proposed run has the report, "missing" when only the baseline has it
+        if self.present[run] == self.present[0]:
+            return None
+        return "added" if self.present[run] else "missing"
+
+    def missing(self, run):
+        # Rows of the diff the run does not have
+        return self.index[run].count(-1)
+
+    def added(self, run):
+        # Rows of the run the baseline does not have; they come after the baseline's rows
+        baseline_rows = len(self.index[0]) - self.index[0].count(-1)
+        return len(self.rows) - baseline_rows - self.index[run][baseline_rows:].count(-1)
+
+    def changed_cells(self, run):
+        # Changed cells of a proposed run (1, 2, ...) against the baseline
+        return sum(column.changed[run - 1].count(1) for column in self.columns)
+
+    def changed_rows(self):
+        # A flag per diff row: any cell changed in any proposed run, or the row missing from a run
+        flags = bytearray(len(self.rows))
+        for column in self.columns:
+            for changed in column.changed:
+                flags = bytearray(map(max, flags, changed))
+        for index in self.index:
+            flags = bytearray(map(max, flags, map((-1).__eq__, index)))
+        return flags
+
+
+def compare_readers(readers, reports=None, tolerance=0.0):
+    # TableDiffs of every table the parsed readers have, the first reader being the baseline, in report
+    # order. Numbers differing by no more than `tolerance` count as unchanged.
+    names = {}
+    for reader in readers:
+        for report, name, _ in reader.tables(reports):
+            names.setdefault(name, report)
+    diffs = []
+    for name, report in names.items():
+        tables = [dict((table_name, table) for _, table_name, table in reader.tables([report])).get(name)
+                  for reader in readers]
+        diffs.append(TableDiff(name, tables, tolerance))
+    return diffs
+
+
+def run_labels(readers):
+    # Column labels for the runs: their file names, numbered when two runs share one
+    labels = [reader.file_name for reader in readers]
+    for label in set(labels):
+        if labels.count(label) > 1:
+            numbers = count(1)
+            labels = [f"{name} ({next(numbers)})" if name == label else name for name in labels]
+    return labels
+
+
+def diff_path(baseline_path, out_dir=None):
+    # "<baseline> - Compare.xlsx" next to the baseline SIM file (or in out_dir)
+    sim_dir, sim_name = sim_location(baseline_path)
+    file_name = "".join(sim_name.split('.')[:-1])
+    return os.path.join(sim_dir if out_dir is None else out_dir, f"{file_name} - Compare.xlsx")
+
+
+def sheet_title(name, names):
+    title = name[:EXCEL_MAX_SHEET_NAME]
+    suffixes = count(2)
+    while title in names:
+        suffix = f" ({next(suffixes)})"
+        title = name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+    names.add(title)
+    return title
+
+
+def write_cells(worksheet, first_row, col, cells, formats):
+    # One column of cells from first_row down, each with its format. The worksheet method for each cell is
+    # picked by a map over the cells' types (or, for an array of deltas, over which are finite) instead of
+    # the per-cell probing worksheet.write() does (the public write_number / write_string / write_blank);
+    # NaN, None and blanks without a format are not written.
+    write_blank = worksheet.write_blank
+    write_number = worksheet.write_number
+    if isinstance(cells, array):
+        writers = list(map((write_blank, write_number).__getitem__, map(math.isfinite, cells)))
+    else:
+        by_type = {float: write_number, int: write_number, str: worksheet.write_string}
+        writers = list(map(by_type.get, map(type, cells), repeat(write_blank)))
+    deque(map(call, writers, count(first_row), repeat(col), cells, formats), 0)
+
+
+def write_summary_sheet(workbook, formats, diffs, labels):
+    worksheet = workbook.add_worksheet("Summary")
+    worksheet.write_row(0, 0, ["Baseline", labels[0]], formats["bold"])
+    header = ["Table", "Run", "Report", "Rows", "Rows Missing", "Rows Added", "Cells Changed"]
+    worksheet.write_row(2, 0, header, formats["header"])
+    row = 3
+    for diff in diffs:
+        for run, label in enumerate(labels[1:], 1):
+            added = diff.added(run)
+            changed = diff.changed_cells(run)
+            status = diff.report_status(run)
+            worksheet.write_row(row, 0, [diff.name, label])
+            if status is not None:
+                worksheet.write(row, 2, status, formats["changed"])
+            worksheet.write_row(row, 3, [len(diff.rows), diff.missing(run), added])
+            worksheet.write(row, 6, changed, formats["changed"] if changed or added or diff.missing(run) else None)
+            row += 1
+    worksheet.set_column(0, 0, 18)
+    worksheet.set_column(1, 1, 30)
+    worksheet.set_column(2, 6, 14)
+    worksheet.autofilter(2, 0, max(row - 1, 3), len(header) - 1)
+    worksheet.freeze_panes(3, 0)
+    return worksheet
+
+
+def write_diff_sheet(workbook, formats, diff, labels, sheet_names, changed_only=False):
+    # Key columns and a Rows column (which runs lack the row), then per column the baseline, and for each
+    # proposed run its value and, for numbers, the delta and the percent delta. Only changed cells are
+    # highlighted.
+    worksheet = workbook.add_worksheet(sheet_title(diff.name, sheet_names))
+    header_format = formats["header"]
+    changed_format = formats["changed"]
+    percent_formats = (formats["percent"], formats["changed_percent"])
+    plain = (None, changed_format)
+
+    select = diff.changed_rows() if changed_only else None
+    if changed_only:
+        def pick(cells):
+            picked = compress(cells, select)
+            return array("d", picked) if isinstance(cells, array) else list(picked)
+    else:
+        def pick(cells):
+            return cells
+
+    key_count = len(diff.key_names)
+    for col, name in enumerate(diff.key_names + ["Rows"]):
+        worksheet.merge_range(0, col, 1, col, name, header_format)
+    for col, cells in enumerate(diff.key_cells()):
+        write_cells(worksheet, 2, col, pick(cells), repeat(None))
+    status = [", ".join(f"no {label}" for label, index in zip(labels, diff.index) if index[position] == -1) or None
+              for position in range(len(diff.rows))]
+    status = pick(status)
+    write_cells(worksheet, 2, key_count, status, [changed_format if text else None for text in status])
+
+    col = key_count + 1
+    for column in diff.columns:
+        sub_header = [labels[0]]
+        for label in labels[1:]:
+            sub_header += [label, "Δ", "Δ %"] if column.numeric else [label]
+        worksheet.merge_range(0, col, 0, col + len(sub_header) - 1, column.name, header_format)
+        worksheet.write_row(1, col, sub_header, header_format)
+
+        write_cells(worksheet, 2, col, pick(column.cells[0]), repeat(None))
+        col += 1
+        for cells, deltas, percents, changed in zip(column.cells[1:], column.deltas, column.percents,
+                                                     column.changed):
+            changed = pick(changed)
+            write_cells(worksheet, 2, col, pick(cells), map(plain.__getitem__, changed))
+            col += 1
+            if column.numeric:
+                write_cells(worksheet, 2, col, pick(deltas), map(plain.__getitem__, changed))
+                write_cells(worksheet, 2, col + 1, pick(percents), map(percent_formats.__getitem__, changed))
+                col += 2
+
+    rows = len(status)
+    worksheet.set_column(0, max(key_count - 1, 0), 24)
+    worksheet.set_column(key_count, key_count, 16)
+    worksheet.set_column(key_count + 1, max(col - 1, key_count + 1), 13)
+    worksheet.autofilter(1, 0, rows + 1, max(col - 1, key_count))
+    worksheet.freeze_panes(2, key_count + 1)
+    return worksheet
+
+
+def write_diff_workbook(path, diffs, labels, changed_only=False):
+    # A Summary sheet (rows and changed cells per table and run), then one sheet per table
+    import xlsxwriter
+
+    from sim_to_excel.formats import FormatRegistry
+
+    workbook = xlsxwriter.Workbook(path, {'nan_inf_to_errors': True})
+    formats = FormatRegistry(workbook)
+    write_summary_sheet(workbook, formats, diffs, labels)
+    sheet_names = {"Summary"}
+    for diff in diffs:
+        if changed_only and not any(diff.changed_rows()):
+            continue
+        write_diff_sheet(workbook, formats, diff, labels, sheet_names, changed_only)
+    workbook.close()
+    return path
+
+
+def compare_files(sim_paths, path=None, out_dir=None, reports=None, tolerance=0.0, changed_only=False):
+    # Parses the SIM files (the first is the baseline) and writes their diff workbook; returns its path
+    from sim_to_excel.SIMtoExcel import parse_file
+
+    readers = [parse_file(sim_path, reports) for sim_path in sim_paths]
+    path = path or diff_path(sim_paths[0], out_dir)
+    return write_diff_workbook(path, compare_readers(readers, reports, tolerance), run_labels(readers), changed_only)
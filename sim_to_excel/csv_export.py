@@ -0,0 +1,36 @@
+import csv
+from operator import ne
+
+from sim_to_excel.arrow_export import export_path, field_names
+
+
+def write_table_csv(table, path):
+    # Header from the column names (line breaks collapsed, units kept); blank cells, NaN and inf as ""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in field_names(table.names)])
+        writer.writerows(table.rows(None))
+
+
+def write_hourly_csv(block, path):
+    # Month, Day, Hour and one column per variable ("GLOBAL DRY-BULB TEMP (F)"); NaN cells as ""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Month", "Day", "Hour"] + block.labels())
+        for index in range(block.rows):
+            values = block.row(index).tolist()
+            if any(map(ne, values, values)):
+                values = [value if value == value else None for value in values]
+            writer.writerow([block.months[index], block.days[index], block.hours[index], *values])
+
+
+def write_tables(reader, out_dir=None, reports=None):
+    # The CSV counterpart of arrow_export.write_tables: "run - SS-A.csv", "run - Hourly <name>.csv", ...
+    paths = []
+    for _, name, table in reader.tables(reports):
+        paths.append(export_path(reader, out_dir, name, ".csv"))
+        write_table_csv(table, paths[-1])
+    for block in reader.hourly_blocks(reports):
+        paths.append(export_path(reader, out_dir, f"Hourly {block.name}", ".csv"))
+        write_hourly_csv(block, paths[-1])
+    return paths
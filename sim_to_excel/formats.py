@@ -0,0 +1,62 @@
+# Named cell styles shared by the sheet writers, as xlsxwriter format properties
+STYLES = {
+    "header": {
+        'bold': True,
+        'align': 'center',
+        'valign': 'vcenter',
+        'font_size': 14,
+        'text_wrap': True,
+        'bg_color': '#D9E1F2',
+    },
+    # Extra headings next to a header row, e.g. PS-C "Heating Efficiency"
+    "column_heading": {
+        'bold': True,
+        'font_size': 14,
+        'text_wrap': True,
+        'bg_color': '#D9E1F2',
+    },
+    "heading": {'bold': True, 'text_wrap': True},
+    "caution": {
+        'font_color': 'red',
+        'bold': True,
+        'text_wrap': True
+    },
+    "caution_nowrap": {'font_color': 'red', 'bold': True, 'text_wrap': False},
+    "caution_merge": {
+        'bold': True, 'font_color': '#FF0000', 'text_wrap': True,
+        'align': 'left', 'valign': 'vbottom'
+    },
+    "number": {'num_format': '0.00'},
+    "ratio": {'num_format': '0.0#'},
+    "string": {'num_format': '@'},
+    "bold": {'bold': True},
+    # Compare workbooks: cells that differ from the baseline
+    "changed": {'bg_color': '#FFEB9C'},
+    "percent": {'num_format': '0.0%'},
+    "changed_percent": {'num_format': '0.0%', 'bg_color': '#FFEB9C'},
+}
+
+
+class FormatRegistry:
+    # The formats of one workbook, shared by every sheet writer. A format is created on first use and
+    # cached by its properties, so asking for the same style again (from another sheet or inside a
+    # per-row loop) returns the same object and styles.xml grows with the number of distinct styles
+    # only. formats["header"] looks up a named style from STYLES; formats.get({...}) takes any properties.
+    def __init__(self, workbook, styles=None):
+        self.workbook = workbook
+        self.styles = STYLES if styles is None else styles
+        self.formats = {}
+
+    def __getitem__(self, name):
+        return self.get(self.styles[name])
+
+    def __len__(self):
+        # Distinct formats created so far
+        return len(self.formats)
+
+    def get(self, properties):
+        key = tuple(sorted(properties.items()))
+        cell_format = self.formats.get(key)
+        if cell_format is None:
+            cell_format = self.formats[key] = self.workbook.add_format(dict(properties))
+        return cell_format
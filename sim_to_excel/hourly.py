@@ -0,0 +1,201 @@
+import math
+import re
+from array import array
+from collections import deque, namedtuple
+from itertools import count, repeat
+
+from sim_to_excel.columns import dash_spans, field_headings
+
+# Key of the hourly report blocks in SIMFileReader.parsing_methods; their pages start "HOURLY REPORT- <name>"
+HOURLY_REPORT = "HOURLY"
+
+# Excel's row limit per sheet; longer blocks continue on "<sheet> (2)", "<sheet> (3)", ...
+EXCEL_MAX_ROWS = 1_048_576
+# A year of hours (leap years included), the first allocation of a block's buffer
+HOURS_PER_YEAR = 8784
+
+# One variable of an hourly report: the heading lines above its column joined ("GLOBAL DRY-BULB TEMP"),
+# its units ("F") and DOE-2's variable number, both None when the header does not show them
+HourlyColumn = namedtuple("HourlyColumn", ["name", "units", "variable"])
+
+TIMESTAMP_LABEL = "MMDDHH"
+
+
+class HourlyBlock:
+    # The rows of one HOURLY REPORT as a (hours x variables) float matrix, filled row by row in a buffer
+    # allocated for a year of hours up front and doubled when a run is longer. The matrix is row-major
+    # in one array('d'); matrix() is a 2-D memoryview over it (numpy.asarray() takes it without a copy).
+    # Cells that held no number ("******" overflows, short rows) are NaN.
+    def __init__(self, name, columns, capacity=HOURS_PER_YEAR):
+        self.name = name
+        self.columns = list(columns)
+        self.width = len(self.columns)
+        self.rows = 0
+        self.capacity = capacity
+        self.values = array('d', bytes(8 * capacity * self.width))
+        self.months = array('B', bytes(capacity))
+        self.days = array('B', bytes(capacity))
+        self.hours = array('B', bytes(capacity))
+
+    def __len__(self):
+        return self.rows
+
+    def __getstate__(self):
+        # Only the filled part of the buffers is pickled (parse cache, worker processes)
+        state = dict(self.__dict__)
+        state["capacity"] = self.rows
+        state["values"] = self.values[:self.rows * self.width]
+        for name in ("months", "days", "hours"):
+            state[name] = getattr(self, name)[:self.rows]
+        return state
+
+    def append(self, month, day, hour, values):
+        # values: array('d') of exactly `width` numbers
+        if self.rows == self.capacity:
+            self.values.extend(array('d', bytes(8 * self.capacity * self.width)))
+            for name in ("months", "days", "hours"):
+                getattr(self, name).extend(bytes(self.capacity))
+            self.capacity *= 2
+        start = self.rows * self.width
+        self.values[start:start + self.width] = values
+        self.months[self.rows] = month
+        self.days[self.rows] = day
+        self.hours[self.rows] = hour
+        self.rows += 1
+
+    def matrix(self):
+        # (rows, width) view of the filled rows; the block cannot grow while the view is alive
+        if not self.rows or not self.width:
+            return memoryview(self.values)[:0]
+        return memoryview(self.values)[:self.rows * self.width].cast('B').cast('d', [self.rows, self.width])
+
+    def column(self, index):
+        return self.values[index:self.rows * self.width:self.width]
+
+    def row(self, index):
+        start = index * self.width
+        return self.values[start:start + self.width]
+
+    def labels(self):
+        # Column titles with their units: "GLOBAL DRY-BULB TEMP (F)"
+        return [f"{column.name} ({column.units})" if column.units else column.name for column in self.columns]
+
+
+def timestamp(line, offset):
+    # (month, day, hour) of a data row, whose first fields are the MMDDHH columns as three 2-digit numbers;
+    # None for header and blank lines
+    fields = line[offset:offset + 2], line[offset + 2:offset + 4], line[offset + 4:offset + 6]
+    if not all(field.strip().isdigit() for field in fields) or line[offset + 6:offset + 7].strip():
+        return None
+    month, day, hour = map(int, fields)
+    if not (1 <= month <= 12 and 1 <= day <= 31 and 1 <= hour <= 24):
+        return None
+    return month, day, hour
+
+
+def row_values(line, fields, start):
+    # The numbers of a data row after its timestamp. A row with one number per field is split on whitespace;
+    # otherwise (Fortran prints "******" when a value overflows its field, wide values run into each other
+    # as "-12.5-130.2", short rows) each field is read at its position and those without a number are NaN.
+    tokens = line[start:].split()
+    if len(tokens) == len(fields):
+        try:
+            return array('d', map(float, tokens))
+        except ValueError:
+            pass
+    values = []
+    for field_start, end in fields:
+        try:
+            values.append(float(line[field_start:end]))
+        except ValueError:
+            values.append(math.nan)
+    return array('d', values)
+
+
+def hourly_fields(header, first_row, start):
+    # (start, end) of each variable's right-aligned field. As layout_rows does for the plant reports, the
+    # dash underline of the headings marks the fields; without one the ends of the words of the header line
+    # with the most of them (the "(4)" variable numbers, usually) do. Only a page without headings falls back
+    # to the numbers of its first data row, which miscounts when one of them overflowed or ran into another.
+    ends = []
+    for line in header:
+        spans = dash_spans(line)
+        if spans is not None:
+            ends = [end for _, end in spans if end > start]
+            break
+        line_ends = [match.end() for match in re.finditer(r"\S+", line) if match.start() >= start]
+        if len(line_ends) > len(ends):
+            ends = line_ends
+    if not ends:
+        ends = [match.end() for match in re.finditer(r"\S+", first_row) if match.start() >= start]
+    return [(ends[index - 1] if index else start, end) for index, end in enumerate(ends)]
+
+
+def hourly_columns(header, fields):
+    # Column metadata from the header lines of a page: the header text inside each field names the variable
+    return [HourlyColumn(name or f"Variable {index}", units, variable)
+            for index, (name, units, variable) in enumerate(field_headings(header, fields), 1)]
+
+
+def parse_hourly_lines(name, lines, block=None):
+    # Adds the data rows of one hourly report's pages to block (a new HourlyBlock when None) and returns
+    # it. Each page repeats the column headings above its rows; the first page's give the column metadata.
+    header = []
+    fields = None
+    in_rows = False
+    offset = 1
+    for line in lines:
+        stamp = timestamp(line, offset)
+        if stamp is None:
+            if in_rows:
+                header = []
+                in_rows = False
+            if line.strip():
+                header.append(line)
+                if TIMESTAMP_LABEL in line:
+                    offset = line.index(TIMESTAMP_LABEL)
+            continue
+
+        if fields is None:
+            fields = hourly_fields(header, line, offset + 6)
+        if block is None:
+            block = HourlyBlock(name, hourly_columns(header, fields))
+        block.append(*stamp, row_values(line, fields, offset + 6))
+        in_rows = True
+    return block
+
+
+def sheet_name(name, part=1):
+    # Worksheet name of an hourly block within Excel's 31 characters and allowed characters
+    name = re.sub(r"[\[\]:*?/\\]", "_", f"Hourly {name}")
+    suffix = f" ({part})" if part > 1 else ""
+    return name[:31 - len(suffix)] + suffix
+
+
+def write_hourly_sheets(workbook, formats, block, max_rows=EXCEL_MAX_ROWS):
+    # Writes a block as Month / Day / Hour and one column per variable, continuing on further sheets
+    # past Excel's row limit. Each sheet repeats the header row. Returns the worksheets.
+    worksheets = []
+    header = ["Month", "Day", "Hour"] + block.labels()
+    rows_per_sheet = max_rows - 1
+    for part, first in enumerate(range(0, max(block.rows, 1), rows_per_sheet), 1):
+        worksheet = workbook.add_worksheet(sheet_name(block.name, part))
+        worksheet.write_row(0, 0, header, formats["header"])
+        worksheet.set_column(0, 2, 7)
+        worksheet.set_column(3, len(header) - 1, 14)
+        worksheet.freeze_panes(1, 3)
+        write_number = worksheet.write_number
+        for row, index in zip(count(1), range(first, min(first + rows_per_sheet, block.rows))):
+            write_number(row, 0, block.months[index])
+            write_number(row, 1, block.days[index])
+            write_number(row, 2, block.hours[index])
+            values = block.row(index)
+            if values == values:
+                deque(map(write_number, repeat(row), count(3), values), 0)
+            else:
+                # NaN never equals itself: leave those cells blank
+                for col, value in enumerate(values, 3):
+                    if value == value:
+                        write_number(row, col, value)
+        worksheets.append(worksheet)
+    return worksheets
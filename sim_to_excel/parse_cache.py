@@ -0,0 +1,142 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import zlib
+
+from sim_to_excel.archives import open_binary, split_member
+
+# Bump whenever a parse_* method changes its output so stale cache entries are never reused
+PARSER_VERSION = 10
+
+ENTRY_SUFFIX = ".simcache"
+
+
+def file_sha256(path):
+    # A zip member is hashed by its own content, any other file (compressed or not) by its bytes on disk
+    archive, member = split_member(path)
+    with open_binary(path) if member is not None else open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class CacheLock:
+    # Exclusive lock on a file inside the cache directory, shared by every process using that directory
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 seconds; keep waiting
+                    time.sleep(0.1)
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if os.name == "nt":
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+
+
+class ParseCache:
+    # Stores the parsed *_data tables of a SIMFileReader as zlib-compressed pickles, keyed by the SIM
+    # file's content hash, size, mtime, the report selection and PARSER_VERSION. Least recently used
+    # entries are evicted once the directory grows past max_bytes. Entries are unpickled, so only point
+    # this at a directory you trust.
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.lock_path = os.path.join(self.cache_dir, "cache.lock")
+
+    def key(self, reader):
+        stat = os.stat(split_member(reader.file_path)[0])
+        content_hash = file_sha256(reader.file_path)
+        reports = ",".join(sorted(reader.reports)) if reader.reports else "*"
+        key_text = f"{content_hash}|{stat.st_size}|{stat.st_mtime_ns}|{reports}|{PARSER_VERSION}"
+        return hashlib.sha256(key_text.encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def load(self, reader, key=None):
+        path = self.entry_path(key or self.key(reader))
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return False
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            self.discard(path)
+            return False
+
+        reader.doe_version = entry["doe_version"]
+        for attribute, value in entry["data"].items():
+            setattr(reader, attribute, value)
+
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        return True
+
+    def store(self, reader, key=None):
+        path = self.entry_path(key or self.key(reader))
+        entry = {
+            "doe_version": reader.doe_version,
+            "data": {reader.data_attribute(report): getattr(reader, reader.data_attribute(report))
+                     for report in reader.parsing_methods},
+        }
+        payload = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            with CacheLock(self.lock_path):
+                os.replace(tmp_path, path)
+                self.evict()
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+
+    def evict(self):
+        # Caller holds the lock
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.discard(os.path.join(self.cache_dir, name))
+            total -= size
+
+    @staticmethod
+    def discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,106 @@
+import io
+import mmap
+import os
+import re
+from collections import namedtuple
+
+from sim_to_excel.hourly import HOURLY_REPORT
+
+# These reports occur per system/zone/space, so their pages carry the system/zone/space name
+ENTITY_REPORTS = ["LS-B", "SS-A", "SS-B", "SS-F", "SS-G", "SS-H", "SS-L", "SS-R", "SV-A"]
+# These PLANT reports occur per meter (PS-F), per meter type (PS-E, "all Electric Meters") or per piece of
+# equipment (PS-H); the name follows the title's " for "
+PLANT_ENTITY_REPORTS = ["PS-E", "PS-F", "PS-H"]
+PLANT_ENTITY_REGEX = re.compile(r" for\s+(?:all\s+)?(.*?)(?:\s{2,}|$)")
+
+# DOE-2 prints the LOADS, SYSTEMS, PLANT and ECONOMICS reports in that order; BEPS/BEPU belong to PLANT
+SECTION_ORDER = {"L": 0, "S": 1, "P": 2, "B": 2, "E": 3}
+REPORT_CODE_REGEX = re.compile(r"^(?:[A-Z]{2}-[A-Z]|BEP[SU])$")
+
+ReportPage = namedtuple("ReportPage", ["report", "entity", "start", "end"])
+
+
+def parse_report_header(line):
+    index = line.index("REPORT- ") + len("REPORT- ")
+    if line[:index].endswith("HOURLY REPORT- "):
+        # "HOURLY REPORT- <name>   WEATHER FILE- ...": every hourly report is an entity of HOURLY
+        return HOURLY_REPORT, re.split(r"\s{2,}", line[index:].strip())[0]
+    report = line[index:index + 4]
+
+    entity = None
+    if report in ENTITY_REPORTS:
+        parts: list[str] = re.split(r"\s{2,}", line)
+        entity = parts[1].strip()
+    elif report in PLANT_ENTITY_REPORTS:
+        match = PLANT_ENTITY_REGEX.search(line, index)
+        entity = match.group(1).strip() if match else ""
+    return report, entity
+
+
+def report_section(report):
+    if not REPORT_CODE_REGEX.match(report):
+        return None
+    return SECTION_ORDER.get(report[0])
+
+
+class ReportIndex:
+    # Byte offsets of every "REPORT- " page in a SIM file, found in one pass over a memory map.
+    # A page runs from the start of its "REPORT- " line to the start of the next one.
+    def __init__(self, sim_file_path):
+        self.file_path = sim_file_path
+        self.doe_version = None
+        self.pages = []
+        self.reports = {}
+        self.entities = {}
+
+        if os.path.getsize(self.file_path) == 0:
+            return
+
+        with open(self.file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            self._build(mm)
+
+    def _build(self, mm):
+        bdl_pos = mm.find(b"BDL RUN")
+        if bdl_pos != -1:
+            line = self._line_at(mm, bdl_pos)[0]
+            self.doe_version = line[81:88]
+
+        headers = []
+        pos = mm.find(b"REPORT- ")
+        while pos != -1:
+            line, line_start, line_end = self._line_at(mm, pos)
+            headers.append((line_start, line))
+            pos = mm.find(b"REPORT- ", line_end)
+
+        for i, (start, line) in enumerate(headers):
+            end = headers[i + 1][0] if i + 1 < len(headers) else len(mm)
+            report, entity = parse_report_header(line)
+            page = ReportPage(report, entity, start, end)
+            self.pages.append(page)
+            self.reports.setdefault(report, []).append(page)
+            if entity is not None:
+                self.entities.setdefault((report, entity), []).append(page)
+
+    @staticmethod
+    def _line_at(mm, pos):
+        line_start = mm.rfind(b"\n", 0, pos) + 1
+        line_end = mm.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(mm)
+        return mm[line_start:line_end].decode("iso-8859-1").rstrip("\r"), line_start, line_end
+
+    def entity_names(self, report):
+        return list(dict.fromkeys(entity for r, entity in self.entities if r == report))
+
+    def iter_lines(self, reports=None, entity=None):
+        # Decodes only the pages of the requested reports (all pages when reports is None),
+        # yielding their lines in file order exactly as iterating the open file would
+        pages = [page for page in self.pages
+                 if (reports is None or page.report in reports) and (entity is None or page.entity == entity)]
+        if not pages:
+            return
+
+        with open(self.file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for page in pages:
+                text = mm[page.start:page.end].decode("iso-8859-1")
+                yield from io.StringIO(text, newline=None)
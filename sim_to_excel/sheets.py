@@ -0,0 +1,93 @@
+import math
+from collections import deque
+from functools import partial
+from itertools import compress, count, repeat
+from operator import call
+
+from sim_to_excel.table import StringColumn
+
+
+def skip_cell(row, col, value):
+    # Blank cells without a format are not written, as worksheet.write() does with None
+    return 0
+
+
+def column_writers(worksheet, column, blank=None, number_format=None, text_format=None):
+    # The cells of one table column and, for each, the worksheet method that writes it. The method is
+    # picked from what parsing already recorded (the string behind each code, the number mask, the kept
+    # text) with C-level maps, so no cell's Python type is probed the way worksheet.write() does.
+    # They are xlsxwriter's public write_string / write_number / write_blank. number_format applies to
+    # numbers, text_format to text and blanks; `blank` is as for Table.rows().
+    write_string = partial(worksheet.write_string, cell_format=text_format)
+    write_blank = skip_cell if text_format is None else partial(worksheet.write_blank, cell_format=text_format)
+    if isinstance(column, StringColumn):
+        values = column.values
+        if blank != "":
+            values = [blank if value is None or not value.strip() else value for value in values]
+        # With a text_format empty text stays a (formatted, empty) text cell, as LS-B and LV-B always had
+        by_code = [write_string if isinstance(value, str) and (value or text_format is not None) else write_blank
+                   for value in values]
+        return list(map(values.__getitem__, column.codes)), list(map(by_code.__getitem__, column.codes))
+
+    write_number = partial(worksheet.write_number, cell_format=number_format)
+    mask = column.valid if blank == "" else bytearray(map(math.isfinite, column.values))
+    writers = list(map((write_blank, write_number).__getitem__, mask))
+    for position in column.text:
+        writers[position] = write_string
+    return column.cells(blank), writers
+
+
+def write_table(worksheet, table, first_row, blank=None, number_format=None, text_format=None, select=None,
+                hidden=None, write_extra=None):
+    # Writes a parsed table from first_row down and returns the row after the last one. Rows are written
+    # in order (as constant_memory mode needs), each as one map over its precomputed cell writers.
+    # select: a flag per table row, only the flagged rows are written (one block, no gaps)
+    # hidden: a flag per written row, flagged rows are hidden
+    # write_extra(worksheet, row): adds the row's formulas
+    table.flush()
+    columns = [column_writers(worksheet, column, blank, number_format, text_format) for column in table.columns]
+    rows = zip(*[cells for cells, _ in columns])
+    writers = zip(*[column_writers for _, column_writers in columns])
+    widths = table.widths
+    if select is not None:
+        rows, writers, widths = compress(rows, select), compress(writers, select), compress(widths, select)
+
+    end_row = first_row
+    for row, cells, row_writers, width in zip(count(first_row), rows, writers, widths):
+        deque(map(call, row_writers, repeat(row), range(width), cells), 0)
+        if write_extra is not None:
+            write_extra(worksheet, row)
+        if hidden is not None and hidden[row - first_row]:
+            worksheet.set_row(row, options={'hidden': True})
+        end_row = row + 1
+    return end_row
+
+
+class SheetSpec:
+    # A sheet that is one parsed table as is: header row, cell formats, column widths, autofilter and
+    # frozen header, declared once and written by write_table. widths are (first, last, width) or
+    # (first, last, width, options) for worksheet.set_column; the formats are names in the FormatRegistry.
+    def __init__(self, name, header_row=0, blank=None, number_format=None, text_format=None, widths=(),
+                 autofilter=False, freeze_header=False):
+        self.name = name
+        self.header_row = header_row
+        self.blank = blank
+        self.number_format = number_format
+        self.text_format = text_format
+        self.widths = widths
+        self.autofilter = autofilter
+        self.freeze_header = freeze_header
+
+    def write(self, workbook, formats, table):
+        worksheet = workbook.add_worksheet(self.name)
+        worksheet.write_row(self.header_row, 0, table.header, formats["header"])
+        end_row = write_table(worksheet, table, self.header_row + 1, self.blank,
+                              formats[self.number_format] if self.number_format else None,
+                              formats[self.text_format] if self.text_format else None)
+        for first, last, width, *options in self.widths:
+            worksheet.set_column(first, last, width, None, *options)
+        if self.autofilter:
+            worksheet.autofilter(self.header_row, 0, end_row - 1, len(table.header) - 1)
+        if self.freeze_header:
+            worksheet.freeze_panes(self.header_row + 1, 0)
+        return worksheet
@@ -0,0 +1,174 @@
+import json
+import time
+from contextlib import contextmanager
+from functools import cache
+
+
+class Timer:
+    __slots__ = ("wall_s", "cpu_s", "calls")
+
+    def __init__(self):
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.calls = 0
+
+    @contextmanager
+    def time(self):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall_s += time.perf_counter() - wall
+            self.cpu_s += time.process_time() - cpu
+            self.calls += 1
+
+    def to_dict(self):
+        return {"wall_s": round(self.wall_s, 6), "cpu_s": round(self.cpu_s, 6), "calls": self.calls}
+
+
+class ReportStats:
+    __slots__ = ("parse", "write", "lines", "rows")
+
+    def __init__(self):
+        self.parse = Timer()
+        self.write = Timer()
+        self.lines = 0  # lines handed to the report's parser
+        self.rows = 0  # rows its parser added to the report's tables
+
+    def to_dict(self):
+        return {"parse": self.parse.to_dict(), "write": self.write.to_dict(), "lines": self.lines, "rows": self.rows}
+
+
+class ConversionStats:
+    # Wall and CPU time per phase and per report plus line, row and cell counters, collected by every
+    # SIMFileReader. read_file includes the parsing of reports that are parsed while reading (the default),
+    # so "parse" and each report's parse time are a breakdown of it rather than extra time.
+    def __init__(self):
+        self.phases = {}
+        self.reports = {}
+        self.sheets = {}
+        self.lines_scanned = 0
+        self.formats = 0  # distinct cell formats the workbook was written with
+
+    def phase(self, name):
+        timer = self.phases.get(name)
+        if timer is None:
+            timer = self.phases[name] = Timer()
+        return timer.time()
+
+    def report(self, report):
+        report_stats = self.reports.get(report)
+        if report_stats is None:
+            report_stats = self.reports[report] = ReportStats()
+        return report_stats
+
+    def count_cells(self, workbook):
+        # After workbook.close(): cells stored per sheet, as counted by CountingWorksheet
+        for worksheet in workbook.worksheets():
+            self.sheets[worksheet.name] = {"cells": getattr(worksheet, "cells_written", 0)}
+
+    def to_dict(self):
+        parse = Timer()
+        for report_stats in self.reports.values():
+            parse.wall_s += report_stats.parse.wall_s
+            parse.cpu_s += report_stats.parse.cpu_s
+            parse.calls += report_stats.parse.calls
+        lines_parsed = sum(report_stats.lines for report_stats in self.reports.values())
+        return {
+            "phases": {**{name: timer.to_dict() for name, timer in self.phases.items()}, "parse": parse.to_dict()},
+            "lines_scanned": self.lines_scanned,
+            # Lines of reports without a parser, page headers and blank lines
+            "lines_skipped": max(0, self.lines_scanned - lines_parsed),
+            "reports": {report: report_stats.to_dict() for report, report_stats in self.reports.items()},
+            "sheets": self.sheets,
+            "cells_written": sum(sheet["cells"] for sheet in self.sheets.values()),
+            "formats": self.formats,
+        }
+
+    def write_json(self, path, **extra):
+        with open(path, "w") as f:
+            json.dump({**extra, **self.to_dict()}, f, indent=2)
+
+
+def format_summary(stats):
+    # One line per conversion for the CLI, from a to_dict() result
+    phases = stats["phases"]
+    names = ("read_file", "parse", "write_excel", "stream_to_excel", "pipeline_to_excel", "close_workbook")
+    parts = [f"{name} {phases[name]['wall_s']:.2f}s" for name in names if name in phases and phases[name]["calls"]]
+    slowest = sorted(stats["reports"].items(), key=lambda item: item[1]["parse"]["wall_s"], reverse=True)[:3]
+    if slowest:
+        parts.append("slowest parse: " + ", ".join(f"{report} {report_stats['parse']['wall_s']:.2f}s"
+                                                   for report, report_stats in slowest))
+    parts.append(f"{stats['lines_scanned']} lines, {stats['cells_written']} cells")
+    return "; ".join(parts)
+
+
+@cache
+def counting_worksheet_class():
+    # Counts the cells each sheet stores through xlsxwriter's public writers (a writer returns 0 once the cell
+    # is stored), so nothing depends on its private methods. write, write_row and write_column dispatch to
+    # the private typed writers, not the public ones, so no cell is counted twice. A blank without a format
+    # stores nothing and is not counted; a cell written twice counts twice.
+    from xlsxwriter.worksheet import Worksheet, convert_cell_args, convert_range_args
+
+    def stores(token, cell_format):
+        return cell_format is not None or (token is not None and token != "")
+
+    def counting(write):
+        # The wrapped writer resolves "A1" notation itself; its result is all that is needed here
+        def write_cell(self, *args, **kwargs):
+            error = write(self, *args, **kwargs)
+            if not error:
+                self.cells_written += 1
+            return error
+        return write_cell
+
+    class CountingWorksheet(Worksheet):
+        cells_written = 0
+
+        write_string = counting(Worksheet.write_string)
+        write_number = counting(Worksheet.write_number)
+        write_formula = counting(Worksheet.write_formula)
+        write_boolean = counting(Worksheet.write_boolean)
+        write_datetime = counting(Worksheet.write_datetime)
+        write_url = counting(Worksheet.write_url)
+        write_rich_string = counting(Worksheet.write_rich_string)
+
+        @convert_cell_args
+        def write_blank(self, row, col, blank, cell_format=None):
+            error = super().write_blank(row, col, blank, cell_format)
+            if not error and cell_format is not None:
+                self.cells_written += 1
+            return error
+
+        @convert_cell_args
+        def write(self, row, col, *args):
+            error = super().write(row, col, *args)
+            if not error and stores(args[0] if args else None, args[1] if len(args) > 1 else None):
+                self.cells_written += 1
+            return error
+
+        @convert_cell_args
+        def write_row(self, row, col, data, cell_format=None):
+            error = super().write_row(row, col, data, cell_format)
+            if not error:
+                self.cells_written += sum(stores(token, cell_format) for token in data)
+            return error
+
+        @convert_cell_args
+        def write_column(self, row, col, data, cell_format=None):
+            error = super().write_column(row, col, data, cell_format)
+            if not error:
+                self.cells_written += sum(stores(token, cell_format) for token in data)
+            return error
+
+        @convert_range_args
+        def merge_range(self, first_row, first_col, last_row, last_col, data, cell_format=None):
+            error = super().merge_range(first_row, first_col, last_row, last_col, data, cell_format)
+            if not error:
+                # The first cell holds the data, the rest are blanks in the merge's format
+                cells = (last_row - first_row + 1) * (last_col - first_col + 1)
+                self.cells_written += cells if cell_format is not None else stores(data, None)
+            return error
+
+    return CountingWorksheet
@@ -0,0 +1,223 @@
+import math
+from array import array
+from itertools import repeat, zip_longest
+from operator import getitem
+
+# Column types. "float" and "int" keep the text of cells that are not numbers ("******" overflow
+# markers, labels), the "_or_blank" variants turn them into blanks.
+NUMERIC_TYPES = ("float", "int", "float_or_blank", "int_or_blank")
+
+# Rows are buffered and converted a column at a time once this many are pending
+FLUSH_ROWS = 4096
+
+CONVERT_CHUNK = 256
+
+_BLANK_TO_NAN = {"": "nan", None: "nan"}
+_IS_BLANK = {"": 0, None: 0}
+
+
+def convert_numbers(cells, keep_text=True, integer=False):
+    # Converts a whole column of fixed-width fields at once. Returns the numbers as array('d') (NaN where
+    # a cell holds no number), a mask that is 1 where float() accepted the cell and 0 for blanks and
+    # text, and the text of the non-numeric cells by position. NaN and inf are numbers here, as they are
+    # to float(); the writer decides how to show them. Chunks of cells that are all numbers or blanks
+    # go through map(float, ...) in C; only a chunk containing text is converted cell by cell.
+    values = array("d")
+    valid = bytearray()
+    text = {}
+    for start in range(0, len(cells), CONVERT_CHUNK):
+        chunk = cells[start:start + CONVERT_CHUNK]
+        try:
+            values.extend(array("d", map(float, map(_BLANK_TO_NAN.get, chunk, chunk))))
+            valid.extend(map(_IS_BLANK.get, chunk, repeat(1)))
+        except (ValueError, TypeError):
+            for position, cell in enumerate(chunk, start):
+                try:
+                    values.append(float(cell))
+                    valid.append(1)
+                except (ValueError, TypeError):
+                    values.append(math.nan)
+                    valid.append(0)
+                    if keep_text and isinstance(cell, str) and cell.strip():
+                        text[position] = cell
+
+    if integer and not keep_text:
+        # int() used to reject these outright
+        valid = bytearray(map(min, valid, map(float.is_integer, values)))
+    return values, valid, text
+
+
+def numbers_or_blank(cells):
+    # For the few rows whose unreadable numbers have always been blanked, in columns that otherwise keep
+    # their text (the SS-H TOTAL / MAX rows, the SS-L breakdown)
+    values, valid, _ = convert_numbers(cells, keep_text=False)
+    return [value if is_number else "" for value, is_number in zip(values, valid)]
+
+
+class StringColumn:
+    # Dictionary-encoded text: each distinct value is stored once and every row holds a 4-byte code.
+    # System, zone and month names repeat on every row, so this is a small fraction of a list of str.
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self):
+        self.codes = array("I")
+        self.values = []
+        self.index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def __iter__(self):
+        return map(self.values.__getitem__, self.codes)
+
+    def extend(self, cells):
+        index = self.index
+        for value in dict.fromkeys(cells):
+            if value not in index:
+                index[value] = len(self.values)
+                self.values.append(value)
+        self.codes.extend(map(index.__getitem__, cells))
+
+    def cells(self, blank=""):
+        values = self.values
+        if blank != "":
+            values = [blank if value is None or not value.strip() else value for value in values]
+        return list(map(values.__getitem__, self.codes))
+
+
+class NumberColumn:
+    # Numbers in an array('d') with a validity mask. Cells that hold no number are NaN in `values`, 0 in
+    # `valid`, and (for "float" / "int" columns) keep their original text in `text`.
+    __slots__ = ("type", "values", "valid", "text")
+
+    def __init__(self, column_type="float"):
+        self.type = column_type
+        self.values = array("d")
+        self.valid = bytearray()
+        self.text = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, row):
+        if not self.valid[row]:
+            return self.text.get(row, "")
+        value = self.values[row]
+        if self.type.startswith("int") and value.is_integer():
+            return int(value)
+        return value
+
+    def __iter__(self):
+        return iter(self.cells())
+
+    def extend(self, cells):
+        offset = len(self.values)
+        values, valid, text = convert_numbers(cells, keep_text=not self.type.endswith("_or_blank"),
+                                              integer=self.type.startswith("int"))
+        self.values += values
+        self.valid += valid
+        for position, value in text.items():
+            self.text[offset + position] = value
+
+    def cells(self, blank="", text=True):
+        # With blank=None NaN and inf come back as None too, the way Excel sheets have always shown them.
+        # With text=False non-numeric cells are `blank` as well, leaving only numbers.
+        cells = self.values.tolist()
+        if self.type.startswith("int"):
+            cells = [int(value) if value.is_integer() else value for value in cells]
+        mask = self.valid if blank == "" else bytearray(map(math.isfinite, self.values))
+        position = mask.find(0)
+        while position != -1:
+            cells[position] = self.text.get(position, blank) if text and not self.valid[position] else blank
+            position = mask.find(0, position + 1)
+        return cells
+
+    def numbers(self):
+        # The finite numeric cells only, without a Python-level loop
+        return filter(math.isfinite, self.values)
+
+    def sum(self):
+        return math.fsum(self.numbers())
+
+
+class Table:
+    # A parsed report table stored by column. `columns` is a sequence of (name, type) pairs with type
+    # "str" or one of NUMERIC_TYPES; `header` is the row written above the data and defaults to the
+    # names. Appended rows are buffered and converted in batches, a column at a time. Rows may be
+    # shorter than the table (e.g. the LV-B summary lines), so each row's width is kept and rows() gives
+    # back exactly the cells that were appended.
+    def __init__(self, columns, header=None):
+        self.names = [name for name, _ in columns]
+        self.types = [column_type for _, column_type in columns]
+        self.header = list(self.names if header is None else header)
+        self.columns = [NumberColumn(column_type) if column_type in NUMERIC_TYPES else StringColumn()
+                        for column_type in self.types]
+        self.widths = array("H")
+        self.pending = []
+
+    def __len__(self):
+        return len(self.widths) + len(self.pending)
+
+    def __getstate__(self):
+        self.flush()
+        return self.__dict__
+
+    def append(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= FLUSH_ROWS:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        widths = array("H", map(len, rows))
+        if max(widths) > len(self.columns):
+            raise ValueError(f"row has {max(widths)} cells but the table only has {len(self.columns)} columns")
+
+        cells_by_column = list(zip_longest(*rows, fillvalue=""))
+        for column, cells in zip(self.columns, cells_by_column):
+            column.extend(cells)
+        for column in self.columns[len(cells_by_column):]:
+            column.extend([""] * len(rows))
+        self.widths += widths
+
+    def row(self, index):
+        self.flush()
+        return [column[index] for column in self.columns[:self.widths[index]]]
+
+    def rows(self, blank=""):
+        # Rows as tuples of typed cells. With the default "" every cell comes back as parsed; any other
+        # `blank` replaces empty cells, whitespace-only text, NaN and inf.
+        self.flush()
+        rows = zip(*[column.cells(blank) for column in self.columns])
+        if self.widths.count(len(self.columns)) != len(self.widths):
+            return map(getitem, rows, map(slice, self.widths))
+        return rows
+
+    def column(self, name):
+        self.flush()
+        return self.columns[self.names.index(name)]
+
+    def rows_containing(self, text):
+        # One flag per row, 1 where any text cell contains `text` (the TOTAL / SUM / ANNUAL rows). Each
+        # distinct string of a column is tested once instead of every cell of every row.
+        self.flush()
+        flags = bytearray(len(self))
+        for column in self.columns:
+            if isinstance(column, StringColumn):
+                codes = {code for code, value in enumerate(column.values) if value and text in value}
+                if codes:
+                    flags = bytearray(map(max, flags, map(codes.__contains__, column.codes)))
+            else:
+                for row, value in column.text.items():
+                    if text in value:
+                        flags[row] = 1
+        return flags
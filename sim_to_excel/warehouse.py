@@ -0,0 +1,154 @@
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+from sim_to_excel.parse_cache import PARSER_VERSION, file_sha256
+from sim_to_excel.table import StringColumn
+
+# Name columns that get an index in every report table, so lookups by system / zone / space (meter, equipment)
+# are fast
+INDEXED_COLUMNS = {"system", "system_name", "zone", "zone_name", "space_name", "meter", "equipment"}
+
+SQL_TYPES = {"str": "TEXT", "float": "REAL", "float_or_blank": "REAL", "int": "INTEGER", "int_or_blank": "INTEGER"}
+
+RUNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    doe_version TEXT,
+    ingested_at TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    UNIQUE (path, sha256)
+);
+CREATE INDEX IF NOT EXISTS ix_runs_sha256 ON runs (sha256);
+"""
+
+
+def sql_name(name):
+    # "Cooling Energy \n(MBTU)" -> "cooling_energy_mbtu", "SV-A Zones" -> "sv_a_zones", "100+" -> "100_plus"
+    return re.sub(r"[^0-9a-z]+", "_", name.replace("+", " plus ").lower()).strip("_") or "column"
+
+
+def column_names(names):
+    columns = []
+    seen = {}
+    for name in map(sql_name, names):
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        columns.append(f"{name}_{count + 1}" if count else name)
+    return columns
+
+
+def table_columns(table):
+    # (column, SQL type) for each column of a report table. A numeric column that kept text (a "******"
+    # overflow, a label) is followed by a "<column>_text" TEXT column holding it; the number is NULL there.
+    columns = []
+    for column, column_type, cells in zip(column_names(table.names), table.types, table.columns):
+        columns.append((column, SQL_TYPES[column_type]))
+        if getattr(cells, "text", None):
+            columns.append((column + "_text", "TEXT"))
+    return columns
+
+
+def quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class Warehouse:
+    # SQLite database of parsed SIM runs: a runs table plus one table per report table ("ss_r",
+    # "sv_a_zones", ...) whose rows carry the run_id. Each file is ingested in a single transaction with
+    # one executemany per table, so a failed file leaves nothing behind.
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(RUNS_SCHEMA)
+        self.known_tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def find_run(self, path, sha256):
+        row = self.connection.execute("SELECT run_id FROM runs WHERE path = ? AND sha256 = ?",
+                                      (os.path.abspath(path), sha256)).fetchone()
+        return row[0] if row else None
+
+    def ensure_table(self, name, table):
+        # Creates the report table on first use and adds any columns a newer parser (or a run with text in a
+        # numeric column) introduced. Returns the table's column names.
+        typed_columns = table_columns(table)
+        columns = [column for column, _ in typed_columns]
+        if set(columns) <= set(self.known_tables.get(name, ())):
+            return columns
+
+        column_sql = [f"{quote(column)} {sql_type}" for column, sql_type in typed_columns]
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(name)} ("
+            f"run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE, "
+            f"row INTEGER NOT NULL, {', '.join(column_sql)})")
+        existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({quote(name)})")}
+        for column, definition in zip(columns, column_sql):
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE {quote(name)} ADD COLUMN {definition}")
+
+        self.connection.execute(f"CREATE INDEX IF NOT EXISTS {quote('ix_' + name + '_run')} ON {quote(name)} (run_id)")
+        for column in columns:
+            if column in INDEXED_COLUMNS:
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {quote('ix_' + name + '_' + column)} "
+                                        f"ON {quote(name)} ({quote(column)})")
+        self.known_tables[name] = list(dict.fromkeys([*self.known_tables.get(name, ()), *columns]))
+        return columns
+
+    def ingest(self, reader, sha256=None, replace=False):
+        # Stores every parsed table of a SIMFileReader and returns the new run_id. A file already ingested
+        # with the same content is skipped (its existing run_id is returned) unless replace is True.
+        path = os.path.abspath(reader.file_path)
+        sha256 = sha256 or file_sha256(path)
+        existing = self.find_run(path, sha256)
+        if existing is not None and not replace:
+            return existing
+
+        try:
+            with self.connection:
+                if existing is not None:
+                    self.connection.execute("DELETE FROM runs WHERE run_id = ?", (existing,))
+                run_id = self.connection.execute(
+                    "INSERT INTO runs (path, file_name, sha256, doe_version, ingested_at, parser_version) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, os.path.basename(path), sha256, (reader.doe_version or "").strip() or None,
+                     datetime.now(timezone.utc).isoformat(timespec="seconds"), PARSER_VERSION)).lastrowid
+
+                for _, name, table in reader.tables():
+                    name = sql_name(name)
+                    table.flush()
+                    columns = self.ensure_table(name, table)
+                    # Whole columns at a time: blanks and NaN / inf are NULL, and the text of a numeric column
+                    # goes to its "_text" column
+                    cells = []
+                    for column in table.columns:
+                        if isinstance(column, StringColumn):
+                            cells.append(column.cells(None))
+                        else:
+                            cells.append(column.cells(None, text=False))
+                            if column.text:
+                                cells.append(map(column.text.get, range(len(table))))
+                    placeholders = ", ".join("?" * (len(columns) + 2))
+                    self.connection.executemany(
+                        f"INSERT INTO {quote(name)} (run_id, row, {', '.join(map(quote, columns))}) "
+                        f"VALUES ({placeholders})",
+                        zip([run_id] * len(table), range(len(table)), *cells))
+        except BaseException:
+            # The rollback also undid this file's CREATE / ALTER TABLEs: forget what ensure_table cached
+            self.known_tables.clear()
+            raise
+        return run_id
@@ -0,0 +1,162 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from sim_to_excel.parse_cache import file_sha256
+from sim_to_excel.SIMtoExcel import SIMFileReader, convert_file
+
+
+def scan(directory, recursive=False):
+    # {path: (size, mtime_ns)} of the .SIM files in directory; files that vanish mid-scan are left out
+    snapshot = {}
+    directories = [directory]
+    while directories:
+        try:
+            entries = list(os.scandir(directories.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if recursive:
+                        directories.append(entry.path)
+                elif entry.name.upper().endswith(".SIM"):
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+    return snapshot
+
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", flush=True)
+
+
+class Watcher:
+    # Converts the .SIM files of a directory as they appear or change. The directory is polled every
+    # `interval` seconds (a stat per file, so it works the same on network shares and on Windows, where
+    # eQUEST runs); a file is converted once its size and mtime have not changed for `settle` seconds,
+    # i.e. the simulation has finished writing it. At most `jobs` conversions run at once, in worker
+    # processes, each through convert_file() with conversion_args; further ready files wait their turn.
+    # A re-save with the same content (same SHA-256 as the last conversion of that path) is skipped,
+    # and a failing file is reported and left alone until it changes again.
+    def __init__(self, directory, jobs=1, interval=1.0, settle=2.0, recursive=False, out_dir=None,
+                 conversion_args=()):
+        self.directory = directory
+        self.jobs = max(1, jobs)
+        self.interval = interval
+        self.settle = settle
+        self.recursive = recursive
+        self.out_dir = out_dir
+        # convert_file() arguments after out_dir: reports, cache_dir, cache_max_mb, streaming, ...
+        self.conversion_args = tuple(conversion_args)
+        self.seen = {}          # path: (signature, monotonic time it was first seen with that signature)
+        self.done = {}          # path: signature last converted, skipped or failed
+        self.hashes = {}        # path: SHA-256 of the content last converted
+        self.pending = {}       # path: signature, settled and waiting for a worker
+        self.running = {}       # future: (path, signature, sha256)
+        self.converted = self.skipped = self.failed = 0
+        # Set when a worker process died: the pool is replaced once its other conversions have failed too
+        self.broken = False
+
+    def start(self):
+        # Files already present count as done when their workbook is newer than they are
+        now = time.monotonic()
+        for path, signature in scan(self.directory, self.recursive).items():
+            self.seen[path] = signature, now
+            try:
+                if os.stat(self.workbook_path(path)).st_mtime_ns >= signature[1]:
+                    self.done[path] = signature
+            except OSError:
+                pass
+
+    def workbook_path(self, path):
+        return SIMFileReader(path, out_dir=self.out_dir).wb_name
+
+    def poll(self):
+        # One scan: notes changes, queues the files that have settled
+        now = time.monotonic()
+        snapshot = scan(self.directory, self.recursive)
+        for path in self.seen.keys() - snapshot.keys():
+            del self.seen[path]
+            self.pending.pop(path, None)
+        for path, signature in snapshot.items():
+            previous = self.seen.get(path)
+            if previous is None or previous[0] != signature:
+                self.seen[path] = signature, now
+                self.pending.pop(path, None)
+            elif now - previous[1] >= self.settle and self.done.get(path) != signature:
+                self.pending[path] = signature
+
+    def submit(self, executor):
+        busy = {path for path, _, _ in self.running.values()}
+        for path in [path for path in self.pending if path not in busy]:
+            if len(self.running) >= self.jobs:
+                break
+            signature = self.pending.pop(path)
+            if self.done.get(path) == signature:
+                # Queued again while its conversion was still running
+                continue
+            try:
+                sha256 = file_sha256(path)
+            except OSError as e:
+                self.report_failure(path, signature, e)
+                continue
+            if self.hashes.get(path) == sha256:
+                self.done[path] = signature
+                self.skipped += 1
+                log(f"same   {path} (content unchanged)")
+                continue
+            log(f"start  {path}")
+            future = executor.submit(convert_file, path, self.out_dir, *self.conversion_args)
+            self.running[future] = path, signature, sha256
+
+    def collect(self, futures):
+        for future in futures:
+            path, signature, sha256 = self.running.pop(future)
+            try:
+                wb_name = future.result()
+            except Exception as e:
+                self.broken = self.broken or isinstance(e, BrokenProcessPool)
+                self.report_failure(path, signature, e)
+            else:
+                self.done[path] = signature
+                self.hashes[path] = sha256
+                self.converted += 1
+                log(f"ok     {path} -> {wb_name}")
+
+    def report_failure(self, path, signature, error):
+        self.done[path] = signature
+        self.hashes.pop(path, None)
+        self.failed += 1
+        log(f"FAILED {path}: {type(error).__name__}: {error}")
+
+    def idle(self):
+        # Nothing running, queued or still settling
+        return not self.running and not self.pending and all(
+            self.done.get(path) == signature for path, (signature, _) in self.seen.items())
+
+    def run(self, once=False):
+        # Polls until interrupted; with once, returns as soon as every file present has been handled
+        self.start()
+        executor = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            while True:
+                self.poll()
+                if self.broken and not self.running:
+                    # A worker died (killed, out of memory); its conversion counted as failed
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self.jobs)
+                    self.broken = False
+                if not self.broken:
+                    self.submit(executor)
+                if once and self.idle():
+                    return
+                if self.running:
+                    finished, _ = wait(self.running, timeout=self.interval, return_when=FIRST_COMPLETED)
+                    self.collect(finished)
+                else:
+                    time.sleep(self.interval)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from sim_to_excel.SIMtoExcel import SIMFileReader
+
+# sample.SIM: `python -m benchmarks.sim_generator sample.SIM --systems 2 --zones 2 --plant-meters --hourly-variables 3`
+# with its hourly report cut down to the first two days (48 rows)
+SAMPLE_SIM = Path(__file__).parent / "data" / "sample.SIM"
+
+
+@pytest.fixture
+def sample_sim(tmp_path):
+    # A copy per test, so workbooks, caches and edited variants land in the test's own directory
+    return Path(shutil.copy(SAMPLE_SIM, tmp_path / "sample.SIM"))
+
+
+@pytest.fixture(scope="session")
+def sample_reader():
+    # Parsed once for the whole session; tests only read from it
+    reader = SIMFileReader(str(SAMPLE_SIM))
+    reader.read_file()
+    reader.parse_contents()
+    return reader
+
+
+@pytest.fixture
+def misplaced_sim(tmp_path):
+    # The sample with its first LS-B page repeated after the PLANT reports, where a streaming run has
+    # long written LS-B
+    lines = SAMPLE_SIM.read_text("iso-8859-1").splitlines(keepends=True)
+    path = tmp_path / "misplaced.SIM"
+    path.write_text("".join(lines + lines[52:84]), "iso-8859-1")
+    return path
+
+
+def table_cells(reader):
+    # {table name: (column names, rows)} with blanks, NaN and inf as None, so tables compare with ==
+    return {name: (table.names, list(table.rows(None))) for _, name, table in reader.tables()}
+
+
+def xlsx_parts(path, skip=("docProps/core.xml",)):
+    # The parts of a workbook but its creation time, for comparing two workbooks byte for byte
+    import zipfile
+
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist() if name not in skip}
+
+
+def xlsx_sheets(path):
+    # {sheet name: (rows, merged ranges)} with each row as (number, hidden, [(cell, value, formula)]), shared
+    # and inline strings alike given as their text, so workbooks written in either string mode compare with ==
+    import zipfile
+    from xml.etree import ElementTree
+
+    ns = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+    relationship_id = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+    with zipfile.ZipFile(path) as archive:
+        def xml(name):
+            return ElementTree.fromstring(archive.read(name))
+
+        shared = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            shared = ["".join(t.text or "" for t in si.iterfind(".//x:t", ns)) for si in xml("xl/sharedStrings.xml")]
+        targets = {rel.get("Id"): rel.get("Target") for rel in xml("xl/_rels/workbook.xml.rels")}
+        sheets = {}
+        for sheet in xml("xl/workbook.xml").iterfind("x:sheets/x:sheet", ns):
+            worksheet = xml("xl/" + targets[sheet.get(relationship_id)])
+            rows = []
+            for row in worksheet.iterfind("x:sheetData/x:row", ns):
+                cells = []
+                for cell in row:
+                    value, formula = cell.findtext("x:v", None, ns), cell.findtext("x:f", None, ns)
+                    if cell.get("t") == "s":
+                        value = shared[int(value)]
+                    elif cell.get("t") == "inlineStr":
+                        value = "".join(t.text or "" for t in cell.iterfind(".//x:t", ns))
+                    cells.append((cell.get("r"), value, formula))
+                rows.append((row.get("r"), row.get("hidden"), cells))
+            merges = [merge.get("ref") for merge in worksheet.iterfind("x:mergeCells/x:mergeCell", ns)]
+            sheets[sheet.get("name")] = (rows, merges)
+    return sheets
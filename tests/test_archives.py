@@ -0,0 +1,70 @@
+import bz2
+import gzip
+import lzma
+import zipfile
+
+import pytest
+
+from conftest import table_cells
+from sim_to_excel.archives import expand_sim_path, is_plain_file, open_text, sim_location, split_member
+from sim_to_excel.parse_cache import file_sha256
+from sim_to_excel.SIMtoExcel import parse_file
+
+COMPRESSORS = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+
+@pytest.fixture
+def runs_zip(sample_sim, tmp_path):
+    # Two runs in folders, a non-SIM member and a directory entry
+    path = tmp_path / "runs.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("Baseline/", "")
+        archive.write(sample_sim, "Baseline/run.SIM")
+        archive.write(sample_sim, "Proposed/run.sim")
+        archive.writestr("Proposed/notes.txt", "not a SIM file")
+    return path
+
+
+def test_split_member():
+    assert split_member("runs.zip::Proposed/run.SIM") == ("runs.zip", "Proposed/run.SIM")
+    assert split_member("runs.zip::") == ("runs.zip", "")
+    assert split_member("run.SIM") == ("run.SIM", None)
+
+
+def test_sim_location():
+    assert sim_location("runs/run.SIM.gz") == ("runs", "run.SIM")
+    assert sim_location("runs/run.SIM") == ("runs", "run.SIM")
+    assert sim_location("runs/project.zip::Proposed/run.SIM") == ("runs", "run.SIM")
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+def test_compressed_file_parses_like_the_plain_one(suffix, sample_sim, sample_reader, tmp_path):
+    path = tmp_path / f"sample.SIM{suffix}"
+    path.write_bytes(COMPRESSORS[suffix](sample_sim.read_bytes()))
+    assert not is_plain_file(str(path))
+
+    with open_text(str(path)) as f, open_text(str(sample_sim)) as plain:
+        assert f.read() == plain.read()
+    assert table_cells(parse_file(str(path))) == table_cells(sample_reader)
+
+
+def test_zip_member_parses_like_the_plain_file(runs_zip, sample_sim, sample_reader):
+    member = f"{runs_zip}::Proposed/run.sim"
+    assert not is_plain_file(member)
+    assert table_cells(parse_file(member)) == table_cells(sample_reader)
+    # A member is hashed by its content, as the plain file is
+    assert file_sha256(member) == file_sha256(str(sample_sim))
+
+
+def test_expand_sim_path(runs_zip, sample_sim):
+    # Every SIM member of an archive, in archive order, whatever the case of the suffix
+    assert expand_sim_path(str(runs_zip)) == [f"{runs_zip}::Baseline/run.SIM", f"{runs_zip}::Proposed/run.sim"]
+    assert expand_sim_path(f"{runs_zip}::Proposed/*") == [f"{runs_zip}::Proposed/run.sim"]
+    assert expand_sim_path(f"{runs_zip}::Proposed/run.sim") == [f"{runs_zip}::Proposed/run.sim"]
+    assert expand_sim_path(str(sample_sim)) == [str(sample_sim)]
+
+    # A missing or broken archive is left for the conversion to report
+    missing = f"{runs_zip.parent / 'missing.zip'}::*.SIM"
+    assert expand_sim_path(missing) == [missing]
+    broken = f"{sample_sim}::*.SIM"
+    assert expand_sim_path(broken) == [broken]
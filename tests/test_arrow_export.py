@@ -0,0 +1,85 @@
+import math
+
+import pytest
+
+from sim_to_excel.arrow_export import field_names, table_to_arrow, write_tables
+from sim_to_excel.SIMtoExcel import SIMFileReader, parse_file
+from sim_to_excel.table import Table
+
+
+@pytest.fixture
+def pa():
+    return pytest.importorskip("pyarrow")
+
+
+def arrow_rows(arrow_table):
+    # Rows of an Arrow table as tuples, like Table.rows(None): empty text and NaN as None, and the "<name> text"
+    # fields merged back into their numeric columns
+    columns = {}
+    for name, column in zip(arrow_table.column_names, arrow_table.columns):
+        cells = [None if cell == "" or isinstance(cell, float) and not math.isfinite(cell) else cell
+                 for cell in column.to_pylist()]
+        if name.endswith(" text") and name[:-5] in columns:
+            columns[name[:-5]] = [number if text is None else text for number, text in zip(columns[name[:-5]], cells)]
+        else:
+            columns[name] = cells
+    return list(zip(*columns.values()))
+
+
+def test_field_names():
+    assert field_names(["U-Value", "U-Value", "Cooling Energy \n(MBTU)"]) == [
+        ("U-Value", None), ("U-Value.1", None), ("Cooling Energy (MBTU)", "MBTU")]
+
+
+def test_every_table_reads_back_equal(pa, sample_reader):
+    for report, name, table in sample_reader.tables():
+        arrow_table = table_to_arrow(table, {"report": report})
+        assert arrow_table.num_rows == len(table)
+        assert arrow_rows(arrow_table) == [tuple(row) + (None,) * (len(table.names) - len(row))
+                                           for row in table.rows(None)], name
+        assert arrow_table.schema.metadata == {b"report": report.encode()}
+
+
+def test_column_types(pa, sample_reader):
+    arrow_table = table_to_arrow(sample_reader.ss_a_data)
+    assert arrow_table.schema.field("System").type == pa.dictionary(pa.uint32(), pa.string())
+    assert arrow_table.schema.field("Cooling Energy (MBTU)").type == pa.float64()
+    assert arrow_table.schema.field("Cooling Energy (MBTU)").metadata == {b"units": b"MBTU"}
+    assert arrow_table.schema.field("Peak Cooling Day").type == pa.int64()
+
+
+def test_text_in_a_numeric_column_gets_a_string_field(pa):
+    table = Table([("Name", "str"), ("Power \n(kW)", "float"), ("Hours", "int"), ("Load", "float_or_blank")])
+    table.extend([["A", "******", "12", "******"], ["B", "1.5", "NONE", ""], ["C", "", "", "2"]])
+    arrow_table = table_to_arrow(table)
+    assert arrow_table.column_names == ["Name", "Power (kW)", "Power (kW) text", "Hours", "Hours text", "Load"]
+    assert arrow_table.to_pydict() == {
+        "Name": ["A", "B", "C"],
+        "Power (kW)": [None, 1.5, None], "Power (kW) text": ["******", None, None],
+        "Hours": [12, None, None], "Hours text": [None, "NONE", None],
+        "Load": [None, None, 2.0],
+    }
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_write_tables(pa, sample_sim, export_format):
+    reader = parse_file(str(sample_sim), ["SS-R", "PV-A", "HOURLY"])
+    paths = write_tables(reader, export_format=export_format)
+    names = sorted(path.rsplit(" - ", 1)[1] for path in paths)
+    assert names == sorted(f"{name}.{export_format}" for name in
+                           ["SS-R", "PV-A Loops", "PV-A Pumps", "PV-A Equip"]
+                           + [f"Hourly {name}" for name in reader.hourly_data])
+
+    path = next(path for path in paths if path.endswith(f"SS-R.{export_format}"))
+    if export_format == "parquet":
+        import pyarrow.parquet as pq
+        arrow_table = pq.read_table(path)
+    else:
+        arrow_table = pa.ipc.open_file(path).read_all()
+    assert arrow_rows(arrow_table) == list(reader.ss_r_data.rows(None))
+    assert arrow_table.schema.metadata[b"table"] == b"SS-R"
+
+
+def test_unknown_format(sample_sim):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        write_tables(SIMFileReader(str(sample_sim)), export_format="xlsx")
@@ -0,0 +1,139 @@
+import math
+import zipfile
+
+import pytest
+
+from sim_to_excel.compare import TableDiff, compare_files, compare_readers, diff_path, run_labels, sheet_title
+from sim_to_excel.SIMtoExcel import SIMFileReader, parse_file
+from sim_to_excel.table import Table
+
+
+@pytest.fixture
+def proposed_sim(sample_sim):
+    # The sample with one BEPU number and the first system's type changed
+    text = sample_sim.read_text(encoding="iso-8859-1")
+    text = text.replace(" 47294.", " 47394.", 1).replace("          PSZ 1.000", "          VAV 1.000", 1)
+    path = sample_sim.with_name("proposed.SIM")
+    path.write_text(text, encoding="iso-8859-1", newline="")
+    return path
+
+
+def diffs_by_name(diffs):
+    return {diff.name: diff for diff in diffs}
+
+
+def column(diff, name):
+    return next(column for column in diff.columns if column.name == name)
+
+
+def table(rows, columns=(("System", "str"), ("Type", "str"), ("Energy", "float"))):
+    result = Table(list(columns))
+    result.extend(rows)
+    return result
+
+
+def test_identical_runs_have_no_differences(sample_sim):
+    reader = parse_file(str(sample_sim))
+    for diff in compare_readers([reader, parse_file(str(sample_sim))]):
+        assert diff.changed_cells(1) == 0 and diff.missing(1) == 0 and diff.added(1) == 0, diff.name
+        assert diff.report_status(1) is None
+        assert not any(diff.changed_rows())
+
+
+def test_changed_number_and_type(sample_sim, proposed_sim):
+    diffs = diffs_by_name(compare_readers([parse_file(str(sample_sim)), parse_file(str(proposed_sim))]))
+
+    bepu = diffs["BEPU"]
+    assert bepu.key_names == ["Meter"]
+    assert bepu.changed_cells(1) == 1
+    lights = column(bepu, "Lights")
+    assert list(lights.changed[0]) == [1, 0]
+    assert lights.deltas[0][0] == pytest.approx(100.0)
+    assert lights.percents[0][0] == pytest.approx(100.0 / 47294.0)
+
+    # Type is a value, not part of the row's identity: the system's row still pairs up and shows the change
+    systems = diffs["SV-A Systems"]
+    assert systems.key_names == ["System Name"]
+    assert systems.missing(1) == 0 and systems.added(1) == 0
+    assert systems.changed_cells(1) == 1
+    assert column(systems, "Type").cells == [["PSZ", "PSZ"], ["VAV", "PSZ"]]
+    assert sum(diff.changed_cells(1) for diff in diffs.values()) == 2
+
+
+def test_tolerance(sample_sim, proposed_sim):
+    readers = [parse_file(str(sample_sim)), parse_file(str(proposed_sim))]
+    assert diffs_by_name(compare_readers(readers, ["BEPU"], tolerance=100.0))["BEPU"].changed_cells(1) == 0
+    assert diffs_by_name(compare_readers(readers, ["BEPU"], tolerance=99.0))["BEPU"].changed_cells(1) == 1
+
+
+def test_report_only_the_proposed_run_has_counts_as_added(sample_sim):
+    reports = [report for report in SIMFileReader.parsing_methods if report not in ("PS-E", "HOURLY")]
+    baseline = parse_file(str(sample_sim), reports)
+    proposed = parse_file(str(sample_sim))
+
+    ps_e = diffs_by_name(compare_readers([baseline, proposed]))["PS-E"]
+    assert ps_e.present == [False, True]
+    assert ps_e.report_status(1) == "added"
+    assert ps_e.added(1) == len(proposed.ps_e_data[0]) and ps_e.missing(1) == 0
+    # Against a missing baseline every filled cell is a change
+    assert ps_e.changed_cells(1) > 0
+
+    missing = diffs_by_name(compare_readers([proposed, baseline]))["PS-E"]
+    assert missing.report_status(1) == "missing"
+    assert missing.missing(1) == len(proposed.ps_e_data[0]) and missing.added(1) == 0
+
+
+def test_rows_pair_by_identity_columns():
+    baseline = table([("SYS-1", "PSZ", "1"), ("SYS-2", "PSZ", "2"), ("SYS-2", "PSZ", "3")])
+    proposed = table([("SYS-3", "PSZ", "9"), ("SYS-2", "PVAV", "2"), ("SYS-2", "PSZ", "4")])
+    diff = TableDiff("Systems", [baseline, proposed])
+
+    assert diff.key_names == ["System"]
+    # Repeated names pair in order; rows only a proposed run has come after the baseline's
+    assert diff.key_cells() == [["SYS-1", "SYS-2", "SYS-2", "SYS-3"]]
+    assert list(diff.index[1]) == [-1, 1, 2, 0]
+    assert diff.missing(1) == 1 and diff.added(1) == 1
+    energy = column(diff, "Energy")
+    assert list(energy.changed[0]) == [1, 0, 1, 1]
+    assert energy.deltas[0][2] == 1.0 and math.isnan(energy.deltas[0][0])
+    assert list(column(diff, "Type").changed[0]) == [1, 1, 0, 1]
+    assert list(diff.changed_rows()) == [1, 1, 1, 1]
+
+
+def test_several_proposed_runs():
+    baseline = table([("SYS-1", "PSZ", "1")])
+    diff = TableDiff("Systems", [baseline, table([("SYS-1", "PSZ", "1")]), None, table([("SYS-1", "PSZ", "2")])])
+    # A run without the table differs in every cell of the baseline's rows
+    assert [diff.changed_cells(run) for run in (1, 2, 3)] == [0, 2, 1]
+    assert [diff.report_status(run) for run in (1, 2, 3)] == [None, "missing", None]
+    assert diff.missing(2) == 1
+
+
+def test_labels_paths_and_sheet_titles(tmp_path):
+    class Run:
+        def __init__(self, file_name):
+            self.file_name = file_name
+
+    assert run_labels([Run("a"), Run("b"), Run("a")]) == ["a (1)", "b", "a (2)"]
+    assert diff_path(str(tmp_path / "base.SIM")) == str(tmp_path / "base - Compare.xlsx")
+    names = {"Summary"}
+    assert sheet_title("Summary", names) == "Summary (2)"
+    assert len(sheet_title("X" * 40, names)) == 31
+
+
+def sheet_names(path):
+    with zipfile.ZipFile(path) as archive:
+        workbook = archive.read("xl/workbook.xml").decode()
+    return [part.split('"')[0] for part in workbook.split('<sheet name="')[1:]]
+
+
+def test_compare_files_writes_the_diff_workbook(sample_sim, proposed_sim):
+    path = compare_files([str(sample_sim), str(proposed_sim)])
+    assert path == diff_path(str(sample_sim))
+    names = sheet_names(path)
+    assert names[0] == "Summary"
+    assert {"BEPU", "SV-A Systems", "LS-B"} <= set(names)
+
+    changed_only = compare_files([str(sample_sim), str(proposed_sim)], path=str(sample_sim.with_name("changed.xlsx")),
+                                 changed_only=True)
+    assert sheet_names(changed_only) == ["Summary", "BEPU", "SV-A Systems"]
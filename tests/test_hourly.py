@@ -0,0 +1,113 @@
+import math
+import pickle
+import zipfile
+
+import pytest
+import xlsxwriter
+
+from sim_to_excel.formats import FormatRegistry
+from sim_to_excel.hourly import HourlyBlock, HourlyColumn, parse_hourly_lines, sheet_name, write_hourly_sheets
+
+HEADER = [
+    "           GLOBAL    GLOBAL     SYS-1",
+    "         --------  --------  --------",
+    " MMDDHH  DRY-BULB  WET-BULB   COOLING",
+    "             TEMP      TEMP      LOAD",
+    "              (F)       (F)    (KBTU)",
+    "              (4)       (5)       (6)",
+    "",
+]
+ROWS = [
+    "  1 1 1     116.2      28.8     120.0",
+    "  1 1 2      99.3      10.2      96.0",
+]
+COLUMNS = [HourlyColumn("GLOBAL DRY-BULB TEMP", "F", 4), HourlyColumn("GLOBAL WET-BULB TEMP", "F", 5),
+           HourlyColumn("SYS-1 COOLING LOAD", "KBTU", 6)]
+
+
+def parse(header, rows):
+    return parse_hourly_lines("Report", header + rows)
+
+
+def values(block):
+    return [[None if math.isnan(value) else value for value in block.row(row)] for row in range(len(block))]
+
+
+def test_columns_and_rows():
+    block = parse(HEADER, ROWS)
+    assert block.columns == COLUMNS
+    assert block.labels()[2] == "SYS-1 COOLING LOAD (KBTU)"
+    assert values(block) == [[116.2, 28.8, 120.0], [99.3, 10.2, 96.0]]
+    assert (block.months[1], block.days[1], block.hours[1]) == (1, 1, 2)
+
+
+@pytest.mark.parametrize("first_row, expected", [
+    # An overflowed value or two values run together must not change the number of columns
+    ("  1 1 1    ******      28.8     120.0", [None, 28.8, 120.0]),
+    ("  1 1 1     116.2-1234567.8     120.0", [116.2, -1234567.8, 120.0]),
+    ("  1 1 1     116.2      28.8", [116.2, 28.8, None]),
+])
+def test_first_row_does_not_set_the_layout(first_row, expected):
+    block = parse(HEADER, [first_row] + ROWS[1:])
+    assert block.columns == COLUMNS
+    assert values(block) == [expected, [99.3, 10.2, 96.0]]
+
+
+def test_header_without_dash_underline():
+    block = parse([line for line in HEADER if "---" not in line], ["  1 1 1    ******      28.8     120.0"])
+    assert block.columns == COLUMNS
+    assert values(block) == [[None, 28.8, 120.0]]
+
+
+def test_page_without_headings_falls_back_to_the_first_row():
+    block = parse([], ROWS)
+    assert [column.name for column in block.columns] == ["Variable 1", "Variable 2", "Variable 3"]
+    assert values(block)[1] == [99.3, 10.2, 96.0]
+
+
+def test_later_pages_add_rows_to_the_block():
+    block = parse_hourly_lines("Report", ["PAGE 2 HEADINGS"] + HEADER + ["  1 2 1       1.0       2.0       3.0"],
+                               parse(HEADER, ROWS))
+    assert len(block) == 3
+    assert values(block)[2] == [1.0, 2.0, 3.0]
+
+
+def test_block_grows_past_its_capacity_and_pickles_its_rows_only():
+    block = HourlyBlock("Report", COLUMNS, capacity=2)
+    for hour in range(1, 6):
+        block.append(1, 1, hour, parse(HEADER, ROWS).row(0))
+    assert len(block) == 5 and block.capacity == 8
+    assert block.matrix().shape == (5, 3)
+    assert list(block.column(0)) == [116.2] * 5
+
+    copy = pickle.loads(pickle.dumps(block))
+    assert copy.capacity == 5 and len(copy.values) == 15
+    assert copy.matrix().tolist() == block.matrix().tolist()
+
+
+def test_sample_file_hourly_report(sample_reader):
+    [block] = sample_reader.hourly_blocks()
+    assert block.name == "Hourly Report 1"
+    assert block.columns == COLUMNS
+    assert len(block) == 48
+    assert (block.months[47], block.days[47], block.hours[47]) == (1, 2, 24)
+    assert sample_reader.hourly_blocks(["BEPU"]) == []
+
+
+def test_sheet_names():
+    assert sheet_name("Zone: 1/2") == "Hourly Zone_ 1_2"
+    assert sheet_name("A" * 40, 2) == "Hourly " + "A" * 20 + " (2)"
+
+
+def test_long_blocks_continue_on_further_sheets(tmp_path):
+    block = HourlyBlock("Report", COLUMNS)
+    for hour in range(1, 25):
+        block.append(1, 1, hour, parse(HEADER, ROWS).row(1))
+    workbook = xlsxwriter.Workbook(str(tmp_path / "hourly.xlsx"))
+    worksheets = write_hourly_sheets(workbook, FormatRegistry(workbook), block, max_rows=11)
+    workbook.close()
+
+    # 10 data rows per sheet under the repeated header
+    assert [worksheet.name for worksheet in worksheets] == ["Hourly Report", "Hourly Report (2)", "Hourly Report (3)"]
+    with zipfile.ZipFile(tmp_path / "hourly.xlsx") as archive:
+        assert '<dimension ref="A1:F5"/>' in archive.read("xl/worksheets/sheet3.xml").decode()
@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import table_cells, xlsx_parts
+from sim_to_excel.SIMtoExcel import HOURLY_REPORT, SIMFileReader, convert_file
+
+
+def parsed(path, **kwargs):
+    jobs = kwargs.pop("jobs", None)
+    reader = SIMFileReader(str(path), **kwargs)
+    reader.read_file(jobs)
+    if jobs is None:
+        reader.parse_contents()
+    return reader
+
+
+def test_read_file_jobs_parses_like_the_serial_read(sample_sim):
+    serial = parsed(sample_sim)
+    parallel = parsed(sample_sim, jobs=2)
+
+    assert table_cells(parallel) == table_cells(serial)
+    assert [block.matrix().tolist() for block in parallel.hourly_blocks()] == \
+        [block.matrix().tolist() for block in serial.hourly_blocks()]
+    # The collected lines are dropped once parsed
+    assert parallel.report_contents == {}
+    assert parallel.stats.reports["LS-B"].rows == serial.stats.reports["LS-B"].rows == len(serial.ls_b_data)
+
+
+def test_hourly_reports_are_parsed_while_collecting(sample_sim):
+    # Their blocks are fed page by page as the file is read instead of being collected for the workers
+    reader = SIMFileReader(str(sample_sim))
+    reader.chunk_lines = 1
+    blocks = []
+    parse_hourly = reader.parse_hourly
+
+    def parse_part(lines):
+        parse_hourly(lines)
+        blocks.append(dict(reader.hourly_data))
+
+    reader.parse_hourly = parse_part
+    reader.read_lines(reader.file_lines(), collect=True)
+
+    assert HOURLY_REPORT not in reader.report_contents and "LS-B" in reader.report_contents
+    # One part per page, all added to the same block
+    assert len(blocks) == 2 and blocks[0]["Hourly Report 1"] is blocks[1]["Hourly Report 1"]
+    assert len(reader.hourly_data["Hourly Report 1"]) == 48
+
+
+def test_read_file_jobs_keeps_contents_when_asked(sample_sim):
+    reader = parsed(sample_sim, jobs=2, keep_contents=True)
+    assert "BEPU" in reader.report_contents
+    assert len(reader.bepu_data) == 2
+
+
+def test_read_file_jobs_with_index_and_report_subset(sample_sim):
+    reader = parsed(sample_sim, jobs=2, use_index=True, reports=["SS-R", "BEPU"])
+    assert {report for report, _, _ in reader.tables()} == {"SS-R", "BEPU"}
+    assert len(reader.ss_r_data) == 4
+
+
+def test_parse_contents_jobs_with_keep_contents(sample_sim):
+    reader = SIMFileReader(str(sample_sim), keep_contents=True)
+    reader.read_file()
+    reader.parse_contents(jobs=2)
+    assert table_cells(reader) == table_cells(parsed(sample_sim))
+
+
+def test_parse_contents_jobs_after_reading_raises(sample_sim):
+    # Without keep_contents every report was parsed while reading: there are no lines left to spread out
+    reader = parsed(sample_sim)
+    with pytest.raises(ValueError, match="read_file"):
+        reader.parse_contents(jobs=2)
+
+
+def test_convert_file_parse_jobs_writes_the_same_workbook(sample_sim, tmp_path):
+    for name in ("serial", "parallel"):
+        (tmp_path / name).mkdir()
+    serial = convert_file(str(sample_sim), out_dir=str(tmp_path / "serial"))
+    parallel = convert_file(str(sample_sim), out_dir=str(tmp_path / "parallel"), parse_jobs=2)
+    assert xlsx_parts(parallel) == xlsx_parts(serial)
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import table_cells
+from sim_to_excel import parse_cache
+from sim_to_excel.parse_cache import ENTRY_SUFFIX, CacheLock, ParseCache
+from sim_to_excel.SIMtoExcel import SIMFileReader, parse_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "cache"))
+
+
+def entries(cache):
+    return sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(ENTRY_SUFFIX))
+
+
+def test_warm_run_loads_the_parsed_tables(cache, sample_sim, sample_reader, monkeypatch):
+    parse_file(str(sample_sim), cache_dir=cache.cache_dir)
+    assert len(entries(cache)) == 1
+
+    # The second run never reads the file
+    monkeypatch.setattr(SIMFileReader, "read_file", None)
+    warm = parse_file(str(sample_sim), cache_dir=cache.cache_dir)
+    assert warm.doe_version == sample_reader.doe_version
+    assert table_cells(warm) == table_cells(sample_reader)
+
+
+def test_key_changes_with_the_file_and_the_parser(cache, sample_sim, monkeypatch):
+    reader = SIMFileReader(str(sample_sim))
+    key = cache.key(reader)
+    assert cache.key(SIMFileReader(str(sample_sim))) == key
+    assert cache.key(SIMFileReader(str(sample_sim), reports=["LS-B"])) != key
+
+    stat = os.stat(sample_sim)
+    os.utime(sample_sim, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    touched = cache.key(reader)
+    assert touched != key
+
+    with open(sample_sim, "a", encoding="iso-8859-1") as f:
+        f.write("\n")
+    grown = cache.key(reader)
+    assert grown not in (key, touched)
+
+    monkeypatch.setattr(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1)
+    assert cache.key(reader) not in (key, touched, grown)
+
+
+def test_stale_entry_is_not_loaded(cache, sample_sim):
+    reader = parse_file(str(sample_sim), cache_dir=cache.cache_dir)
+    stat = os.stat(sample_sim)
+    os.utime(sample_sim, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not cache.load(SIMFileReader(str(sample_sim)))
+
+    # The new entry sits next to the old one until eviction makes room
+    cache.store(reader)
+    assert len(entries(cache)) == 2
+
+
+def test_corrupt_entry_is_discarded(cache, sample_sim):
+    reader = SIMFileReader(str(sample_sim))
+    with open(cache.entry_path(cache.key(reader)), "wb") as f:
+        f.write(b"not a cache entry")
+    assert not cache.load(reader)
+    assert entries(cache) == []
+
+
+def test_least_recently_used_entries_are_evicted(cache, sample_sim, tmp_path):
+    readers = []
+    for index, name in enumerate(["a", "b", "c"]):
+        path = tmp_path / f"{name}.SIM"
+        path.write_bytes(sample_sim.read_bytes())
+        # Same content, so entries of the same size, but a different mtime and so a different key
+        os.utime(path, ns=(0, (index + 1) * 1_000_000_000))
+        readers.append(parse_file(str(path)))
+    a, b, c = readers
+
+    cache.store(a)
+    cache.store(b)
+    size = os.path.getsize(cache.entry_path(cache.key(a)))
+    os.utime(cache.entry_path(cache.key(a)), ns=(0, 1_000_000_000))
+    os.utime(cache.entry_path(cache.key(b)), ns=(0, 2_000_000_000))
+    # Room for two entries; loading a makes it the most recently used, so b goes when c comes in
+    cache.max_bytes = 2 * size + size // 2
+    assert cache.load(SIMFileReader(a.file_path))
+    cache.store(c)
+
+    assert entries(cache) == sorted(os.path.basename(cache.entry_path(cache.key(reader))) for reader in (a, c))
+    assert not cache.load(SIMFileReader(b.file_path))
+
+    # An entry bigger than the whole cache does not stay either
+    cache.max_bytes = size // 2
+    cache.store(b)
+    assert entries(cache) == []
+
+
+def test_concurrent_stores_and_loads(cache, sample_sim, sample_reader):
+    reader = parse_file(str(sample_sim))
+    key = cache.key(reader)
+
+    def store_and_load(_):
+        cache.store(reader, key)
+        loaded = SIMFileReader(str(sample_sim))
+        # Entries are replaced whole under the lock, so every load finds a complete one
+        return cache.load(loaded, key), loaded
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(store_and_load, range(32)))
+
+    assert all(found for found, _ in results)
+    assert all(table_cells(loaded) == table_cells(sample_reader) for _, loaded in results[::8])
+    # No temporary files are left behind
+    assert sorted(os.listdir(cache.cache_dir)) == sorted(["cache.lock", os.path.basename(cache.entry_path(key))])
+
+
+def test_cache_lock_is_exclusive(tmp_path):
+    lock_path = str(tmp_path / "cache.lock")
+    inside = []
+    overlaps = []
+
+    def hold():
+        # Every CacheLock opens the file anew, as a separate process would
+        with CacheLock(lock_path):
+            inside.append(1)
+            overlaps.append(len(inside))
+            time.sleep(0.01)
+            inside.pop()
+
+    threads = [threading.Thread(target=hold) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1] * 6
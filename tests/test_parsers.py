@@ -0,0 +1,100 @@
+import pytest
+
+from conftest import table_cells
+from sim_to_excel.SIMtoExcel import HOURLY_REPORT, SIMFileReader
+
+# Rows each table of tests/data/sample.SIM parses into
+TABLE_ROWS = {
+    "BEPU": 2, "LS-B": 52, "LV-B": 8, "LV-D": 8, "LV-D Summary": 3, "PS-C": 9, "PS-E": 78, "PS-E Peaks": 169,
+    "PS-F": 52, "PS-F Peaks": 338, "PS-H": 162, "PV-A Loops": 3, "PV-A Pumps": 3, "PV-A Equip.": 2, "SS-A": 28,
+    "SS-F": 48, "SS-G": 28, "SS-H": 28, "SS-L": 30, "SS-R": 4, "SV-A Systems": 2, "SV-A Fans": 4, "SV-A Zones": 4,
+    "SV-A DOAS": 0,
+}
+
+
+def tables(reader):
+    return {name: table for _, name, table in reader.tables()}
+
+
+@pytest.mark.parametrize("name", TABLE_ROWS)
+def test_every_table_is_parsed(sample_reader, name):
+    assert len(tables(sample_reader)[name]) == TABLE_ROWS[name]
+
+
+def test_doe_version(sample_reader):
+    assert sample_reader.doe_version.strip() == "DOE-2.2"
+
+
+@pytest.mark.parametrize("name, first_row", [
+    ("BEPU", ("EM1  ELECTRICITY", "KWH", 47294.0, 46020.0)),
+    ("LS-B", ("SPC-1", "WALL CONDUCTION", 14.833, 0.165)),
+    ("LV-B", ("FLOOR-1", "SPC-1", 1.0, "INT")),
+    ("LV-D", ("SPC-1", "SPC-1-NORTH-WALL", 0.443, 174.4)),
+    ("PS-C", ("CHILLER 1", "SUM", 710.211, 503.957)),
+    ("SS-A", ("SYS-1 (PSZ)", "JAN", 44.72, 6)),
+    ("SS-F", ("ZN-1-1", "JAN", -4.155, 6.112)),
+    ("SS-H", ("SYS-1 (PSZ)", "JAN", 594.0, 15.845)),
+    ("SS-L", ("SYS-1 (PSZ)", "JAN", 301.1, 456.1)),
+    ("SS-R", ("SYS-1 (PSZ)", "ZN-1-1", 97, 381)),
+    ("SV-A Systems", ("SYS-1 (PSZ)", "PSZ", 1.0, 1148.6)),
+    ("SV-A Zones", ("SYS-1 (PSZ)", "ZN-1-1", 822.2, 0.0)),
+])
+def test_first_rows(sample_reader, name, first_row):
+    row = tables(sample_reader)[name].row(0)
+    assert tuple(row[:len(first_row)]) == first_row
+
+
+def test_cells_have_their_column_types(sample_reader):
+    ss_r = sample_reader.ss_r_data
+    assert ss_r.types[:3] == ["str", "str", "int_or_blank"]
+    assert all(type(cell) is int for cell in ss_r.row(0)[2:])
+
+
+def test_pv_a_text_columns(sample_reader):
+    # Every pump runs ONE-SPEED, and the equipment's "Capacity" column holds the name of its loop
+    pv_a = tables(sample_reader)
+    pumps, equipment = pv_a["PV-A Pumps"], pv_a["PV-A Equip."]
+    assert pumps.types[pumps.names.index("Capacity Control")] == "str"
+    assert {row[pumps.names.index("Capacity Control")] for row in pumps.rows()} == {"ONE-SPEED"}
+    assert pumps.row(0)[pumps.names.index("Power \n(kW)")] == 14.303
+    assert equipment.types[equipment.names.index("Capacity \n(MMBtu/h)")] == "str"
+    assert [row[equipment.names.index("Capacity \n(MMBtu/h)")] for row in equipment.rows()] == ["CHW LOOP", "HW LOOP"]
+
+
+def test_reports_limits_what_is_parsed(sample_sim):
+    reader = SIMFileReader(str(sample_sim), reports=["ss-r", "BEPU"])
+    reader.read_file()
+    assert {report for report, _, _ in reader.tables()} == {"BEPU", "SS-R"}
+    assert reader.ls_b_data is None
+
+
+def scanned_reports(reader):
+    with open(reader.file_path, encoding="iso-8859-1") as f:
+        return [report for report, _ in reader.scan_reports(f)]
+
+
+def test_only_reports_with_a_parser_are_buffered(sample_sim):
+    # ES-D has no parser (and the sample has no SS-B): its lines are dropped while scanning unless the reader
+    # keeps every report
+    assert set(scanned_reports(SIMFileReader(str(sample_sim)))) == set(SIMFileReader.parsing_methods) - {"SS-B"}
+    reader = SIMFileReader(str(sample_sim), keep_contents=True)
+    reader.read_file()
+    assert "ES-D" in reader.report_contents
+
+
+def test_long_runs_are_parsed_in_parts(sample_reader, sample_sim):
+    # With chunk_lines = 1 every page of a chunked report is a part of its own; the others stay whole
+    reader = SIMFileReader(str(sample_sim))
+    reader.chunk_lines = 1
+    parts = scanned_reports(reader)
+    assert parts.count("LS-B") == 4 and parts.count(HOURLY_REPORT) == 2 and parts.count("SS-L") == 1
+
+    reader.read_file()
+    assert table_cells(reader) == table_cells(sample_reader)
+    assert {name: block.matrix().tolist() for name, block in reader.hourly_data.items()} == \
+        {name: block.matrix().tolist() for name, block in sample_reader.hourly_data.items()}
+
+
+def test_unknown_report_is_rejected(sample_sim):
+    with pytest.raises(ValueError, match="Unknown report"):
+        SIMFileReader(str(sample_sim), reports=["XX-Z"])
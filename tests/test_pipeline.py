@@ -0,0 +1,58 @@
+import os
+import threading
+
+import pytest
+
+from conftest import xlsx_parts
+from sim_to_excel.SIMtoExcel import SIMFileReader, convert_file
+
+
+def test_pipeline_writes_the_streamed_workbook(sample_sim, tmp_path):
+    (tmp_path / "streamed").mkdir()
+    (tmp_path / "pipeline").mkdir()
+    streamed = convert_file(str(sample_sim), out_dir=str(tmp_path / "streamed"), streaming=True)
+    # A small queue keeps the reader waiting on the parser, and the parser on the writer
+    reader = SIMFileReader(str(sample_sim), out_dir=str(tmp_path / "pipeline"))
+    reader.pipeline_to_excel(queue_size=1)
+    assert xlsx_parts(reader.wb_name) == xlsx_parts(streamed)
+
+
+def stage_threads():
+    return [thread for thread in threading.enumerate() if thread.name in ("sim-read", "sim-parse")]
+
+
+def fail(*args):
+    raise OSError("stage failed")
+
+
+def failing_lines(lines):
+    # The file breaks off after its first reports
+    for _ in range(200):
+        yield next(lines)
+    fail()
+
+
+@pytest.mark.parametrize("stage", ["read", "parse", "write"])
+def test_failing_stage_stops_the_pipeline(stage, sample_sim, tmp_path, monkeypatch):
+    reader = SIMFileReader(str(sample_sim), out_dir=str(tmp_path))
+    if stage == "read":
+        file_lines = reader.file_lines
+        monkeypatch.setattr(reader, "file_lines", lambda: failing_lines(file_lines()))
+    elif stage == "parse":
+        monkeypatch.setattr(reader, "parse_ss_g", fail)
+    else:
+        monkeypatch.setattr(reader, "write_ss_a", fail)
+
+    with pytest.raises(OSError, match="stage failed"):
+        reader.pipeline_to_excel(queue_size=1)
+    # The other stages are stopped and the half-written workbook is removed
+    assert stage_threads() == []
+    assert os.listdir(tmp_path) == ["sample.SIM"]
+
+
+def test_report_after_its_section_stops_the_pipeline(misplaced_sim, tmp_path):
+    reader = SIMFileReader(str(misplaced_sim), out_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="LS-B appears again after its section ended"):
+        reader.pipeline_to_excel()
+    assert stage_threads() == []
+    assert not os.path.exists(reader.wb_name)
@@ -0,0 +1,103 @@
+from sim_to_excel.columns import END_USES, dash_spans, field_spans, layout_rows
+
+PS_H_PAGE = [
+    "                CAPACITY      FLOW      LOOP",
+    "               (MBTU/HR) (GAL/MIN)",
+    "               --------- --------- ---------",
+    "PROPERTIES       111.026     351.3        5.",
+    "",
+    "                    LOAD      ELEC      PEAK",
+    "                               USE    DAY/HR",
+    "                  (MBTU)     (KWH)",
+    "               --------- --------- ---------",
+    "JAN              414.678    ******      2/16",
+    "TOTAL            319.259     4333.     24/ 1",
+]
+
+
+def rows(table):
+    return list(table.rows())
+
+
+def test_dash_spans_and_fields():
+    assert dash_spans("   ---  ----") == [(3, 6), (8, 12)]
+    assert dash_spans("   ---") is None
+    assert dash_spans("  TOTAL ---  ---") is None
+    assert field_spans([(3, 6), (8, 12)]) == [(0, 6), (6, 12)]
+
+
+def test_layout_rows_reads_fields_under_their_headings():
+    result = list(layout_rows(PS_H_PAGE))
+    assert result[0][:2] == ("", "PROPERTIES")
+    assert result[0][2] == [("CAPACITY", "MBTU/HR", None), ("FLOW", "GAL/MIN", None), ("LOOP", None, None)]
+    assert result[0][3] == ["111.026", "351.3", "5."]
+    # Overflow markers and day/hour cells stay text, without the space DOE-2 prints inside the date
+    assert result[1] == ("JAN", "", [("LOAD", "MBTU", None), ("ELEC USE", "KWH", None), ("PEAK DAY/HR", None, None)],
+                         ["414.678", "******", "2/16"])
+    assert result[2][0] == "TOTAL" and result[2][3][2] == "24/1"
+
+
+def test_layout_rows_carries_the_month_over():
+    lines = [
+        f"{'LIGHTS':>20}{'TOTAL':>10}",
+        f"{'-' * 10:>20} {'-' * 9}",
+        f"{'JAN   KWH':<14}{'10.':>6}{'20.':>10}",
+        f"{'      MAX KW':<14}{'1.5':>6}{'2.5':>10}",
+    ]
+    assert [(month, label, cells) for month, label, _, cells in layout_rows(lines)] == [
+        ("JAN", "KWH", ["10.", "20."]), ("JAN", "MAX KW", ["1.5", "2.5"])]
+
+
+def test_ps_e_rows(sample_reader):
+    table = sample_reader.ps_e_data[0]
+    assert table.names[3:] == END_USES
+    data = rows(table)
+    assert {row[0] for row in data} == {"Electric Meters", "Fuel Meters"}
+    assert data[0][:5] == ("Electric Meters", "JAN", "KWH", 7976.0, 2565.0)
+    assert data[2][:5] == ("Electric Meters", "JAN", "PEAK ENDUSE", 5246.2, 4555.9)
+    assert [row[2] for row in data if row[0] == "Electric Meters" and row[1] == "YR"] == \
+        ["KWH", "MAX KW", "PEAK ENDUSE", "PEAK PCT"]
+
+
+def test_ps_e_peak_times_are_numbers(sample_reader):
+    # The DAY/HR rows ("19/ 9") become one row per end use with an int day and hour
+    table = sample_reader.ps_e_data[1]
+    assert table.types[-2:] == ["int", "int"]
+    data = rows(table)
+    assert data[:2] == [("Electric Meters", "JAN", "DAY/HR", "Lights", 19, 9),
+                        ("Electric Meters", "JAN", "DAY/HR", "Task Lights", 4, 12)]
+    assert all(type(row[4]) is int and type(row[5]) is int for row in data)
+
+
+def test_ps_f_rows(sample_reader):
+    data = rows(sample_reader.ps_f_data[0])
+    assert sorted({row[0] for row in data}) == ["EM1", "FM1"]
+    assert data[0][:4] == ("EM1", "JAN", "KWH", 5141.0)
+    # One row per month and item, the year's with the month YR
+    assert sum(row[1] == "YR" for row in data) == 4
+    assert rows(sample_reader.ps_f_data[1])[0] == ("EM1", "JAN", "DAY/HR", "Lights", 16, 6)
+
+
+def test_ps_h_rows(sample_reader):
+    data = rows(sample_reader.ps_h_data)
+    assert data[:4] == [
+        ("CHILLER 1", "", "PROPERTIES", "CAPACITY", "MBTU/HR", 111.026, "", ""),
+        ("CHILLER 1", "", "PROPERTIES", "FLOW", "GAL/MIN", 351.3, "", ""),
+        ("CHILLER 1", "", "PROPERTIES", "LOOP", "", 5.0, "", ""),
+        ("CHILLER 1", "JAN", "", "LOAD", "MBTU", 414.678, "", ""),
+    ]
+    # A peak's day/hour goes to the Peak Day and Peak Hour columns, not Value
+    assert ("CHILLER 1", "JAN", "", "PEAK DAY/HR", "", "", 2, 16) in data
+    assert {row[0] for row in data} == {"CHILLER 1", "BOILER 1"}
+
+
+def test_plant_sheets_follow_ps_c(sample_sim):
+    import zipfile
+
+    from sim_to_excel.SIMtoExcel import convert_file
+
+    with zipfile.ZipFile(convert_file(str(sample_sim))) as archive:
+        workbook = archive.read("xl/workbook.xml").decode()
+    names = [part.split('"')[0] for part in workbook.split('<sheet name="')[1:]]
+    assert names[names.index("PS-C") + 1:names.index("PS-C") + 6] == ["PS-E", "PS-E Peaks", "PS-F", "PS-F Peaks",
+                                                                     "PS-H"]
@@ -0,0 +1,87 @@
+import zipfile
+
+import xlsxwriter
+
+from sim_to_excel.formats import FormatRegistry
+from sim_to_excel.sheets import SheetSpec, write_table
+from sim_to_excel.table import Table
+
+NUMBER, TEXT = "number format", "text format"
+
+
+class RecordingWorksheet:
+    # Stands in for an xlsxwriter worksheet: records what each public writer was given
+    def __init__(self):
+        self.cells = {}
+        self.hidden = []
+
+    def write_string(self, row, col, string, cell_format=None):
+        self.cells[row, col] = ("string", string, cell_format)
+        return 0
+
+    def write_number(self, row, col, number, cell_format=None):
+        self.cells[row, col] = ("number", number, cell_format)
+        return 0
+
+    def write_blank(self, row, col, blank, cell_format=None):
+        self.cells[row, col] = ("blank", blank, cell_format)
+        return 0
+
+    def set_row(self, row, options=None):
+        if options.get("hidden"):
+            self.hidden.append(row)
+
+
+def sample_table():
+    table = Table([("Name", "str"), ("Value", "float"), ("Hours", "int")])
+    table.extend([("A", "1.5", "2"), ("", "******", ""), ("TOTAL",)])
+    return table
+
+
+def test_cells_go_to_the_typed_writers():
+    worksheet = RecordingWorksheet()
+    assert write_table(worksheet, sample_table(), 1) == 4
+    assert worksheet.cells == {
+        (1, 0): ("string", "A", None), (1, 1): ("number", 1.5, None), (1, 2): ("number", 2, None),
+        # Kept overflow text is written as text; blanks without a format are not written at all
+        (2, 1): ("string", "******", None),
+        (3, 0): ("string", "TOTAL", None),
+    }
+
+
+def test_formats_and_formatted_blanks():
+    worksheet = RecordingWorksheet()
+    write_table(worksheet, sample_table(), 0, blank="", number_format=NUMBER, text_format=TEXT)
+    assert worksheet.cells[0, 1] == ("number", 1.5, NUMBER)
+    assert worksheet.cells[1, 0] == ("string", "", TEXT)
+    assert worksheet.cells[1, 1] == ("string", "******", TEXT)
+    assert worksheet.cells[1, 2] == ("blank", "", TEXT)
+    # Short rows stop at their own width
+    assert (2, 1) not in worksheet.cells
+
+
+def test_select_hidden_and_extra_cells():
+    worksheet = RecordingWorksheet()
+    extra_rows = []
+    end_row = write_table(worksheet, sample_table(), 5, select=[1, 0, 1], hidden=[0, 1],
+                          write_extra=lambda worksheet, row: extra_rows.append(row))
+    assert end_row == 7
+    assert worksheet.cells[5, 0] == ("string", "A", None)
+    assert worksheet.cells[6, 0] == ("string", "TOTAL", None)
+    assert worksheet.hidden == [6]
+    assert extra_rows == [5, 6]
+
+
+def test_sheet_spec_writes_header_filter_and_frozen_pane(tmp_path):
+    path = tmp_path / "sheet.xlsx"
+    workbook = xlsxwriter.Workbook(str(path))
+    spec = SheetSpec("Sample", widths=[(0, 0, 20)], number_format="number", autofilter=True, freeze_header=True)
+    worksheet = spec.write(workbook, FormatRegistry(workbook), sample_table())
+    assert worksheet.name == "Sample"
+    workbook.close()
+
+    with zipfile.ZipFile(path) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+    assert '<autoFilter ref="A1:C4"/>' in sheet
+    assert 'ySplit="1"' in sheet
+    assert '<col min="1" max="1" width="20.7109375"' in sheet
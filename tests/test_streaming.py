@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from conftest import xlsx_parts, xlsx_sheets
+from sim_to_excel.SIMtoExcel import SIMFileReader, convert_file
+
+
+def test_streamed_workbook_has_the_default_sheets(sample_sim, tmp_path):
+    (tmp_path / "default").mkdir()
+    (tmp_path / "streamed").mkdir()
+    default = convert_file(str(sample_sim), out_dir=str(tmp_path / "default"))
+    streamed = convert_file(str(sample_sim), out_dir=str(tmp_path / "streamed"), streaming=True)
+
+    # Strings are written inline rather than shared, and the sheets come in the file's section order
+    assert "xl/sharedStrings.xml" in xlsx_parts(default) and "xl/sharedStrings.xml" not in xlsx_parts(streamed)
+    default_sheets, streamed_sheets = xlsx_sheets(default), xlsx_sheets(streamed)
+    assert list(streamed_sheets)[:3] == ["LS-B", "LV-B", "LV-D"]
+    assert list(streamed_sheets)[-2:] == ["Hourly Hourly Report 1", "Efficiency"]
+    assert streamed_sheets == default_sheets
+
+
+def test_streaming_drops_the_written_tables(sample_sim, sample_reader, tmp_path):
+    reader = SIMFileReader(str(sample_sim), out_dir=str(tmp_path))
+    reader.stream_to_excel()
+    assert all(getattr(reader, reader.data_attribute(report)) is None for report in reader.parsing_methods)
+    assert reader.stats.reports["LS-B"].rows == len(sample_reader.ls_b_data)
+
+
+def test_report_after_its_section_is_refused(misplaced_sim, tmp_path):
+    reader = SIMFileReader(str(misplaced_sim), out_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="LS-B appears again after its section ended"):
+        reader.stream_to_excel()
+    # The half-written workbook is removed
+    assert not os.path.exists(reader.wb_name)
+
+    # The default conversion reads the whole file first and takes it
+    assert os.path.exists(convert_file(str(misplaced_sim), out_dir=str(tmp_path)))
+
+
+def test_failed_write_removes_the_workbook(sample_sim, tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    reader = SIMFileReader(str(sample_sim), out_dir=str(tmp_path))
+    monkeypatch.setattr(reader, "write_bepu", fail)
+    with pytest.raises(OSError, match="disk full"):
+        reader.stream_to_excel()
+    assert os.listdir(tmp_path) == ["sample.SIM"]
@@ -0,0 +1,77 @@
+import math
+import pickle
+
+import pytest
+
+from sim_to_excel.table import FLUSH_ROWS, NumberColumn, StringColumn, Table, convert_numbers, numbers_or_blank
+
+
+def test_convert_numbers_keeps_text_by_position():
+    values, valid, text = convert_numbers(["1.5", "", "******", " 2", None, "nan"])
+    assert list(valid) == [1, 0, 0, 1, 0, 1]
+    assert values[0] == 1.5 and values[3] == 2.0
+    assert math.isnan(values[1]) and math.isnan(values[5])
+    assert text == {2: "******"}
+
+
+def test_convert_numbers_integer_without_text_rejects_fractions():
+    _, valid, text = convert_numbers(["3", "3.5", "x"], keep_text=False, integer=True)
+    assert list(valid) == [1, 0, 0]
+    assert text == {}
+
+
+def test_numbers_or_blank():
+    assert numbers_or_blank(["1", "******", ""]) == [1.0, "", ""]
+
+
+def test_table_types_its_columns():
+    table = Table([("Name", "str"), ("Value", "float"), ("Hours", "int"), ("Load", "float_or_blank")])
+    table.extend([("A", "1.5", "7", "2.0"), ("B", "******", "8.0", "******"), ("A", "", "", "")])
+
+    assert isinstance(table.columns[0], StringColumn) and isinstance(table.columns[1], NumberColumn)
+    assert list(table.rows()) == [("A", 1.5, 7, 2.0), ("B", "******", 8, ""), ("A", "", "", "")]
+    # Hours are ints, the overflow marker survives in a "float" column but not in a "float_or_blank" one
+    assert type(table.row(1)[2]) is int
+    assert table.columns[0].values == ["A", "B"]
+    assert table.column("Value").sum() == 1.5
+
+
+def test_rows_with_blank_replaces_empty_cells_and_nan():
+    table = Table([("Name", "str"), ("Value", "float")])
+    table.extend([(" ", "nan"), ("A", "******")])
+    assert list(table.rows(None)) == [(None, None), ("A", "******")]
+
+
+def test_short_rows_keep_their_width():
+    table = Table([("Floor", "str"), ("Space", "str"), ("Area", "float")], header=["Floor", "Space", "Area (SQFT)"])
+    table.extend([("F1", "S1", "10"), ("TOTAL",)])
+    assert list(table.rows()) == [("F1", "S1", 10.0), ("TOTAL",)]
+    assert table.header[2] == "Area (SQFT)"
+
+
+def test_too_wide_rows_are_rejected():
+    table = Table([("Name", "str")])
+    table.append(("A", "B"))
+    with pytest.raises(ValueError):
+        table.flush()
+
+
+def test_rows_are_flushed_in_batches():
+    table = Table([("Value", "int")])
+    table.extend((str(value),) for value in range(FLUSH_ROWS + 5))
+    assert len(table.pending) == 5
+    assert len(table) == FLUSH_ROWS + 5
+    assert table.row(FLUSH_ROWS + 4) == [FLUSH_ROWS + 4]
+
+
+def test_rows_containing():
+    table = Table([("System", "str"), ("Month", "float")])
+    table.extend([("SYS-1", "1"), ("SYS-1 TOTAL", "2"), ("SYS-2", "TOTAL")])
+    assert list(table.rows_containing("TOTAL")) == [0, 1, 1]
+
+
+def test_pickle_round_trip_flushes_pending_rows():
+    table = Table([("Name", "str"), ("Value", "float")])
+    table.extend([("A", "1"), ("B", "x")])
+    copy = pickle.loads(pickle.dumps(table))
+    assert list(copy.rows()) == [("A", 1.0), ("B", "x")]
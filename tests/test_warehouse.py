@@ -0,0 +1,99 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from sim_to_excel.parse_cache import PARSER_VERSION
+from sim_to_excel.SIMtoExcel import parse_file
+from sim_to_excel.warehouse import Warehouse, column_names, sql_name
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    with Warehouse(str(tmp_path / "runs.db")) as warehouse:
+        yield warehouse
+
+
+def count(warehouse, sql, *parameters):
+    return warehouse.connection.execute(sql, parameters).fetchone()[0]
+
+
+def test_sql_names():
+    assert sql_name("Cooling Energy \n(MBTU)") == "cooling_energy_mbtu"
+    assert sql_name("SV-A Zones") == "sv_a_zones"
+    assert sql_name("100+") == "100_plus"
+    assert column_names(["U-Value", "U-Value", "Area"]) == ["u_value", "u_value_2", "area"]
+
+
+def test_ingest_round_trip(warehouse, sample_sim):
+    reader = parse_file(str(sample_sim))
+    run_id = warehouse.ingest(reader)
+
+    path, doe_version, parser_version = warehouse.connection.execute(
+        "SELECT path, doe_version, parser_version FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    assert path == str(sample_sim.resolve()) and doe_version == "DOE-2.2" and parser_version == PARSER_VERSION
+    for _, name, table in reader.tables():
+        assert count(warehouse, f'SELECT COUNT(*) FROM "{sql_name(name)}" WHERE run_id = ?', run_id) == len(table)
+
+    # Numbers are numbers, blanks are NULL
+    assert warehouse.connection.execute(
+        "SELECT system_name, zone_name, max_heat_hours FROM ss_r WHERE run_id = ? ORDER BY row LIMIT 1",
+        (run_id,)).fetchone() == ("SYS-1 (PSZ)", "ZN-1-1", 97)
+    assert count(warehouse, "SELECT COUNT(*) FROM pv_a_pumps WHERE capacity_control = 'ONE-SPEED'") == 3
+    assert count(warehouse, "SELECT COUNT(*) FROM sqlite_master WHERE name = 'ix_ss_r_zone_name'") == 1
+
+
+def test_text_in_a_numeric_column_is_kept(warehouse, sample_sim, tmp_path):
+    warehouse.ingest(parse_file(str(sample_sim)))
+    # The first pump's power overflows its field in a second run
+    overflow = tmp_path / "overflow.SIM"
+    overflow.write_text(sample_sim.read_text("iso-8859-1").replace("ONE-SPEED      14.303", "ONE-SPEED      ******", 1),
+                        "iso-8859-1")
+    run_id = warehouse.ingest(parse_file(str(overflow)))
+
+    assert warehouse.connection.execute(
+        "SELECT power_kw, power_kw_text FROM pv_a_pumps WHERE run_id = ? ORDER BY row", (run_id,)).fetchall() == [
+        (None, "******"), (12.268, None), (8.9, None)]
+    # The first run was stored before the text column existed
+    assert count(warehouse, "SELECT COUNT(*) FROM pv_a_pumps WHERE power_kw_text IS NULL AND power_kw = 14.303") == 1
+
+
+def test_ingest_skips_or_replaces_a_known_file(warehouse, sample_sim):
+    reader = parse_file(str(sample_sim))
+    run_id = warehouse.ingest(reader)
+    assert warehouse.ingest(reader) == run_id
+    assert count(warehouse, "SELECT COUNT(*) FROM runs") == 1
+
+    # The old run and its rows are deleted before the file is loaded again
+    warehouse.ingest(reader, replace=True)
+    assert count(warehouse, "SELECT COUNT(*) FROM runs") == 1
+    assert count(warehouse, "SELECT COUNT(*) FROM bepu") == len(reader.bepu_data)
+
+
+def test_failed_ingest_leaves_nothing_behind(warehouse, sample_sim, tmp_path):
+    good = parse_file(str(sample_sim))
+    bad = parse_file(str(shutil.copy(sample_sim, tmp_path / "bad.SIM")))
+    tables = list(bad.tables())
+    # The first table goes in, creating its table, then the file fails half-way
+    bad.tables = lambda *args: iter([tables[0], ("XX", "broken", None)])
+    with pytest.raises(AttributeError):
+        warehouse.ingest(bad)
+
+    assert count(warehouse, "SELECT COUNT(*) FROM runs") == 0
+    with pytest.raises(sqlite3.OperationalError):
+        warehouse.connection.execute("SELECT COUNT(*) FROM bepu")
+
+    # The rollback also dropped the tables the failed file created; the next file must create them again
+    run_id = warehouse.ingest(good)
+    assert count(warehouse, "SELECT COUNT(*) FROM bepu WHERE run_id = ?", run_id) == len(good.bepu_data)
+    assert count(warehouse, "SELECT COUNT(*) FROM runs") == 1
+
+
+def test_reopened_database_adds_new_runs(tmp_path, sample_sim):
+    reader = parse_file(str(sample_sim))
+    with Warehouse(str(tmp_path / "runs.db")) as warehouse:
+        warehouse.ingest(reader)
+    other = parse_file(str(shutil.copy(sample_sim, tmp_path / "other.SIM")))
+    with Warehouse(str(tmp_path / "runs.db")) as warehouse:
+        warehouse.ingest(other)
+        assert count(warehouse, "SELECT COUNT(DISTINCT run_id) FROM ls_b") == 2
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+from sim_to_excel import watch
+from sim_to_excel.cli import main
+from sim_to_excel.SIMtoExcel import convert_file
+from sim_to_excel.watch import Watcher
+
+# The fake conversions below reach the workers by forking, with the test module already imported
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs the fork start method")
+
+
+@pytest.fixture
+def runs(sample_sim, tmp_path):
+    # The directory watched, holding the sample alone
+    directory = tmp_path / "runs"
+    directory.mkdir()
+    return directory, shutil.move(sample_sim, directory / "sample.SIM")
+
+
+def watcher(directory, **kwargs):
+    return Watcher(str(directory), interval=0.05, settle=0, **kwargs)
+
+
+def touch(path, seconds=10):
+    # Newer mtime, same content
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def convert_or_fail(path, *args):
+    # convert_file, but a file reading "fail" raises and one reading "die" kills its worker
+    with open(path) as f:
+        content = f.read(4)
+    if content == "fail":
+        raise ValueError("not a SIM file")
+    if content == "die":
+        os._exit(1)
+    return convert_file(path, *args)
+
+
+def test_once_converts_then_leaves_converted_files_alone(runs, capsys):
+    directory, _ = runs
+    assert main(["watch", str(directory), "--once", "--interval", "0.05", "--settle", "0"]) == 0
+    assert os.path.exists(directory / "sample - SIM.xlsx")
+    assert "Converted 1 file(s); 0 unchanged, 0 failed." in capsys.readouterr().out
+
+    # A new watcher finds the workbook newer than the file
+    assert main(["watch", str(directory), "--once", "--interval", "0.05", "--settle", "0"]) == 0
+    assert "Converted 0 file(s); 0 unchanged, 0 failed." in capsys.readouterr().out
+
+
+def test_file_is_converted_once_it_settles(runs, monkeypatch):
+    directory, sim = runs
+    now = [0.0]
+    monkeypatch.setattr(watch.time, "monotonic", lambda: now[0])
+    w = Watcher(str(directory), settle=2.0)
+    w.start()
+
+    w.poll()
+    assert w.pending == {}
+    # Still being written: every change starts the wait over
+    now[0] = 1.5
+    with open(sim, "a") as f:
+        f.write("\n")
+    w.poll()
+    now[0] = 3.0
+    w.poll()
+    assert w.pending == {}
+    now[0] = 3.5
+    w.poll()
+    assert list(w.pending) == [str(sim)]
+
+    # A file that goes away is forgotten
+    os.remove(sim)
+    w.poll()
+    assert w.pending == {} and w.seen == {}
+
+
+def test_resave_with_the_same_content_is_skipped(runs):
+    directory, sim = runs
+    w = watcher(directory)
+    w.run(once=True)
+    workbook = directory / "sample - SIM.xlsx"
+    written = os.stat(workbook).st_mtime_ns
+
+    touch(sim)
+    w.run(once=True)
+    assert (w.converted, w.skipped, w.failed) == (1, 1, 0)
+    assert os.stat(workbook).st_mtime_ns == written
+
+    # New content is converted again
+    with open(sim, "a") as f:
+        f.write("\n")
+    touch(sim, 20)
+    w.run(once=True)
+    assert (w.converted, w.skipped, w.failed) == (2, 1, 0)
+
+
+@needs_fork
+def test_failed_file_is_left_alone_until_it_changes(runs, monkeypatch):
+    directory, sim = runs
+    broken = directory / "broken.SIM"
+    broken.write_text("fail")
+    monkeypatch.setattr(watch, "convert_file", convert_or_fail)
+    w = watcher(directory)
+    w.run(once=True)
+    assert (w.converted, w.failed) == (1, 1)
+
+    w.run(once=True)
+    assert (w.converted, w.failed) == (1, 1)
+
+    shutil.copy(sim, broken)
+    touch(broken)
+    w.run(once=True)
+    assert (w.converted, w.failed) == (2, 1)
+    assert os.path.exists(directory / "broken - SIM.xlsx")
+
+
+@needs_fork
+def test_dead_worker_is_replaced(runs, monkeypatch):
+    directory, _ = runs
+    (directory / "dead.SIM").write_text("die")
+    monkeypatch.setattr(watch, "convert_file", convert_or_fail)
+    # One worker, so the sample never shares the pool the dead worker breaks
+    w = watcher(directory, jobs=1)
+    w.run(once=True)
+    assert (w.converted, w.failed) == (1, 1)
+    assert os.path.exists(directory / "sample - SIM.xlsx")
+    assert not w.broken